@@ -0,0 +1,101 @@
+""" bulk question upload: per-row ORM refresh vs chunked INSERT ... RETURNING
+
+    python -m scripts.bench_bulk_insert [--sizes 1000 10000 100000] [--methods orm core ingest]
+
+runs against DATABASE_URL. every run happens in its own transaction and
+is rolled back, so the database is left as it was. three paths are timed:
+
+    orm     what question_create_bulk did before: add_all, flush, then one
+            refresh per question
+    core    chunked executemany INSERT ... RETURNING (insert_question_rows)
+    ingest  insert_questions with dedup off, the full upload path, which
+            also computes and stores fingerprints
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import time
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal, create_tables, engine
+from src.models.questions import Category, Question
+from src.schemas.questions import QuestionCreate
+from src.services.question_ingest import insert_question_rows, insert_questions, question_row
+from src.utils.enums import DedupMode, DifficultyLevel
+from src.utils.iterables import chunked
+
+
+def payload(size: int) -> list:
+    levels = list(DifficultyLevel)
+    return [
+        QuestionCreate(
+            question_text=f'Benchmark question number {n} about topic {n % 97}?',
+            difficulty_level=levels[n % len(levels)],
+            correct_answer='A', option_a=f'a{n}', option_b=f'b{n}',
+            option_c=f'c{n}', option_d=f'd{n}')
+        for n in range(size)
+    ]
+
+
+async def orm_insert(db, category_id: int, questions: list) -> int:
+    rows = [Question(category_id=category_id, **question.model_dump()) for question in questions]
+    db.add_all(rows)
+    await db.flush()
+    for row in rows:
+        await db.refresh(row)
+    return len(rows)
+
+
+async def core_insert(db, category_id: int, questions: list) -> int:
+    inserted = 0
+    for chunk in chunked(questions, settings.BULK_INSERT_CHUNK_SIZE):
+        inserted += len(await insert_question_rows(
+            db, [question_row(category_id, question) for question in chunk]))
+    return inserted
+
+
+async def ingest_insert(db, category_id: int, questions: list) -> int:
+    inserted, _ = await insert_questions(db, category_id, questions, DedupMode.OFF)
+    return len(inserted)
+
+
+METHODS = {'orm': orm_insert, 'core': core_insert, 'ingest': ingest_insert}
+
+
+async def timed(method, size: int) -> float:
+    questions = payload(size)
+    async with SessionLocal() as db:
+        category = Category(name=f'bench-{time.time_ns()}', description='benchmark')
+        db.add(category)
+        await db.flush()
+        try:
+            started = time.perf_counter()
+            assert await method(db, category.id, questions) == size
+            return time.perf_counter() - started
+        finally:
+            await db.rollback()
+
+
+async def run(sizes: list, methods: list) -> None:
+    await create_tables()
+    try:
+        for size in sizes:
+            for name in methods:
+                elapsed = await timed(METHODS[name], size)
+                print(f'{name:6s} {size:7d} questions  {elapsed:8.3f}s  {size / elapsed:9.0f} rows/s')
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark bulk question inserts')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--methods', nargs='+', choices=list(METHODS), default=list(METHODS))
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.methods))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+""" difficulty calibration over synthetic answers
+
+    python -m scripts.bench_calibration [--questions 100000] [--answers 10000000]
+
+generates answers in memory (no database) from a simple ability model:
+each user answers correctly with a probability that grows with their
+ability and falls with the question's hardness. the answers are fed to
+CalibrationAccumulator in chunks of `--chunk-size`, as calibrate() does
+with rows streamed from question_history, then levels and category
+multipliers are computed. reports the folding rate, the time of the
+final pass and the accumulator's peak memory, which should not grow
+with `--answers`. the multipliers are computed a second time from the
+first result, as the next calibration run would, and the largest
+change between the two is reported; it should be below the
+tolerance.
+"""
+
+# Standard library imports
+import argparse
+import time
+import tracemalloc
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from src.core.config import settings
+from src.services.difficulty_calibration import (
+    MULTIPLIER_TOLERANCE, CalibrationAccumulator, category_multipliers, changed_multipliers,
+    difficulty_codes
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark difficulty calibration')
+    parser.add_argument('--questions', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--answers', type=int, default=10_000_000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--chunk-size', type=int, default=settings.CALIBRATION_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    slots = args.questions + 1
+    hardness = rng.normal(0, 1, slots)
+    skill = rng.normal(0, 1, args.users + 1)
+    categories = rng.integers(0, args.categories, slots)
+    # overall accuracy of each user, as load_abilities reads it from user_statistics
+    ability = 1 / (1 + np.exp(-skill))
+
+    tracemalloc.start()
+    accumulator = CalibrationAccumulator(slots, ability)
+    fold_seconds = 0.0
+    for start in range(0, args.answers, args.chunk_size):
+        size = min(args.chunk_size, args.answers - start)
+        question_ids = rng.integers(1, slots, size)
+        user_ids = rng.integers(1, args.users + 1, size)
+        correct = rng.random(size) < 1 / (1 + np.exp(hardness[question_ids] - skill[user_ids]))
+
+        started = time.perf_counter()
+        accumulator.add(question_ids, user_ids, correct)
+        fold_seconds += time.perf_counter() - started
+
+    started = time.perf_counter()
+    rates = accumulator.rates()
+    discrimination = accumulator.discrimination()
+    calibrated = (accumulator.answered > 0) & (accumulator.answered >= settings.CALIBRATION_MIN_ANSWERS)
+    calibrated &= ~(discrimination < settings.CALIBRATION_MIN_DISCRIMINATION)
+    levels = difficulty_codes(rates, settings.CALIBRATION_EASY_RATE, settings.CALIBRATION_HARD_RATE)
+    sample = (categories[calibrated], accumulator.correct[calibrated], accumulator.answered[calibrated])
+    # every category starts at 1.0
+    multipliers = category_multipliers(*sample, {})
+    final_seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    again = category_multipliers(*sample, multipliers)
+
+    print(f'{args.answers:,} answers, {args.questions:,} questions, {args.users:,} users')
+    print(f'fold      {fold_seconds:8.2f}s  {args.answers / fold_seconds:14,.0f} answers/s')
+    print(f'finalize  {final_seconds * 1000:8.1f}ms  ({int(calibrated.sum()):,} calibrated,'
+          f' {len(multipliers)} categories, level counts {np.bincount(levels[calibrated]).tolist()})')
+    print(f'peak traced memory {peak / 2 ** 20:.1f} MiB')
+    if multipliers:
+        weights = np.bincount(sample[0], weights=sample[2])
+        mean = sum(value * weights[category] for category, value in multipliers.items()) / weights.sum()
+        drift = max(abs(again[category] / value - 1) for category, value in multipliers.items())
+        print(f'multipliers {min(multipliers.values()):.3f}-{max(multipliers.values()):.3f},'
+              f' weighted mean {mean:.4f}; second run: largest change {drift:.2%}'
+              f' (tolerance {MULTIPLIER_TOLERANCE:.1%}),'
+              f' {len(changed_multipliers(again, multipliers))} categories rewritten')
+    if calibrated.sum() > 1:
+        # questions made harder should have come out with lower rates
+        correlation = np.corrcoef(rates[calibrated], hardness[calibrated])[0, 1]
+        print(f'rate / hardness correlation {correlation:.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+""" synthetic question bank shared by the benchmark scripts
+
+the benchmarks seed it inside a transaction they roll back afterwards, so
+they can point at any DATABASE_URL without leaving rows behind.
+"""
+
+# Standard library imports
+import random
+import time
+from typing import List
+
+# Third-party imports
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.models.questions import Category, Question
+from src.utils.enums import DifficultyLevel
+from src.utils.iterables import chunked
+
+
+# 5000 made up words; question text draws from them with a skewed
+# distribution so some search terms are common and most are rare
+VOCABULARY = [f'{prefix}{n}' for prefix in ('ka', 'lo', 'mi', 'ne', 'su') for n in range(1000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def question_rows(category_ids: List[int], count: int, seed: int = 0):
+    rng = random.Random(seed)
+    levels = list(DifficultyLevel)
+    for n in range(count):
+        words = rng.choices(VOCABULARY, WEIGHTS, k=8)
+        yield {
+            'category_id': category_ids[n % len(category_ids)],
+            'question_text': ' '.join(words) + '?',
+            'difficulty_level': levels[n % len(levels)],
+            'correct_answer': 'A',
+            'option_a': words[0], 'option_b': words[1],
+            'option_c': words[2], 'option_d': words[3],
+            'is_active': True,
+        }
+
+
+async def seed_questions(
+        db: AsyncSession, count: int, categories: int = 10,
+        chunk_size: int = 10000) -> List[int]:
+    """ insert `count` questions spread over new categories without
+        committing, returns the category ids
+    """
+    started = time.perf_counter()
+    category_ids = []
+    for n in range(categories):
+        category = Category(name=f'bench-{time.time_ns()}-{n}', description='benchmark')
+        db.add(category)
+        await db.flush()
+        category_ids.append(category.id)
+
+    for rows in chunked(question_rows(category_ids, count), chunk_size):
+        await db.execute(insert(Question), rows)
+    print(f'seeded {count} questions in {time.perf_counter() - started:.1f}s')
+    return category_ids
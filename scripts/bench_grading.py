@@ -0,0 +1,85 @@
+""" answer grading throughput of the vectorized answer key
+
+    python -m scripts.bench_grading [--questions 100000] [--answers 1000000]
+
+builds a synthetic question bank snapshot in memory (no database) and
+grades `--answers` random answers in batches of each `--batch-sizes`
+value. two figures are reported per batch size: AnswerKey.grade alone,
+and the /quiz/grade request path from validated AnswerSubmission objects
+(array encoding and grading, without http and json parsing).
+"""
+
+# Standard library imports
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from src.schemas.questions import AnswerSubmission
+from src.services.grading import AnswerKey, encode_answers
+from src.services.question_snapshot import QuestionBankSnapshot
+from src.utils.enums import AnswerOption, DifficultyLevel
+
+
+def synthetic_snapshot(questions: int, categories: int = 50) -> QuestionBankSnapshot:
+    rng = random.Random(0)
+    levels = list(DifficultyLevel)
+    rows = (
+        SimpleNamespace(
+            id=question_id, category_id=question_id % categories, question_text=f'q{question_id}',
+            difficulty_level=levels[question_id % len(levels)],
+            correct_answer=rng.choice('ABCD'),
+            option_a='a', option_b='b', option_c='c', option_d='d')
+        for question_id in range(1, questions + 1)
+    )
+    multipliers = {category: 1.0 + category / categories for category in range(categories)}
+    return QuestionBankSnapshot.from_rows(rows, multipliers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark batch answer grading')
+    parser.add_argument('--questions', type=int, default=100_000)
+    parser.add_argument('--answers', type=int, default=1_000_000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 1000, 1_000_000])
+    args = parser.parse_args()
+
+    key = AnswerKey(synthetic_snapshot(args.questions))
+    rng = np.random.default_rng(0)
+    # a few unknown ids so the miss path is exercised too
+    question_ids = rng.integers(1, int(args.questions * 1.01), args.answers, dtype=np.int32)
+    answers = rng.integers(0, 4, args.answers, dtype=np.uint8)
+    options = list(AnswerOption)
+
+    for batch_size in args.batch_sizes:
+        batch_size = min(batch_size, args.answers)
+        started = time.perf_counter()
+        for start in range(0, args.answers, batch_size):
+            key.grade(question_ids[start:start + batch_size], answers[start:start + batch_size])
+        grade_rate = args.answers / (time.perf_counter() - started)
+
+        # request path over a sample of batches, built outside the timer
+        batches = min(args.answers // batch_size, max(1, 100_000 // batch_size))
+        submissions = [
+            [
+                AnswerSubmission(question_id=int(question_id), answer=options[answer])
+                for question_id, answer in zip(
+                    question_ids[n * batch_size:(n + 1) * batch_size],
+                    answers[n * batch_size:(n + 1) * batch_size])
+            ] for n in range(batches)
+        ]
+        started = time.perf_counter()
+        for batch in submissions:
+            ids = np.fromiter((s.question_id for s in batch), dtype=np.int32, count=len(batch))
+            key.grade(ids, encode_answers([s.answer for s in batch]))
+        request_rate = batches * batch_size / (time.perf_counter() - started)
+
+        print(f'batch {batch_size:8d}  grade {grade_rate:14,.0f} answers/s'
+              f'  request path {request_rate:12,.0f} answers/s')
+
+
+if __name__ == '__main__':
+    main()
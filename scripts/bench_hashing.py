@@ -0,0 +1,65 @@
+""" login throughput of the bcrypt process pool by worker count
+
+    python -m scripts.bench_hashing [--rounds 12] [--logins 200]
+
+runs `--logins` concurrent verify_password calls through a HashingService
+with 1, 2, 4 ... up to os.cpu_count() workers and prints logins per second.
+throughput should grow roughly linearly until the worker count reaches the
+number of physical cores.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import os
+import time
+
+# Third-party imports
+from passlib.context import CryptContext
+
+# Local imports
+from src.utils.hash_password import HashingService
+
+
+def worker_counts(limit: int) -> list:
+    counts, count = [], 1
+    while count < limit:
+        counts.append(count)
+        count *= 2
+    return counts + [limit]
+
+
+async def run(workers: int, logins: int, password: str, hashed: str) -> float:
+    service = HashingService(workers=workers, max_pending=logins)
+    try:
+        # start the worker processes outside the timed section
+        await asyncio.gather(*(service.verify(password, hashed) for _ in range(workers)))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(service.verify(password, hashed) for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+    finally:
+        service.shutdown()
+    assert all(results)
+    return logins / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark bcrypt login throughput')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost of the stored hash')
+    parser.add_argument('--logins', type=int, default=200, help='concurrent logins per run')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    password = 'correct horse battery staple'
+    hashed = CryptContext(schemes=['bcrypt'], bcrypt__rounds=args.rounds).hash(password)
+
+    print(f'bcrypt rounds={args.rounds} logins={args.logins}')
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        rate = asyncio.run(run(workers, args.logins, password, hashed))
+        baseline = baseline or rate
+        print(f'workers={workers:3d}  {rate:8.1f} logins/s  x{rate / baseline:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+""" leaderboard rank lookups on the skip list board
+
+    python -m scripts.bench_leaderboard [--users 1000000] [--repeat 10000]
+
+builds a Board of `--users` random scores in memory (no database), then
+times rank() and top() at random positions, add() for score updates,
+and a rank computed by scanning every score, which is what a board
+without an index has to do (SELECT count(*) ... WHERE score > :score).
+"""
+
+# Standard library imports
+import argparse
+import random
+import statistics
+import time
+
+# Local imports
+from src.services.leaderboard import Board
+
+
+def report(name: str, timings: list) -> None:
+    timings = sorted(timings)
+    print(f'{name:28s} median {statistics.median(timings) * 1000:9.3f}ms'
+          f'  p99 {timings[int(len(timings) * 0.99)] * 1000:9.3f}ms  ({len(timings)} runs)')
+
+
+def timed(function, arguments) -> list:
+    timings = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark leaderboard rank lookups')
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=10_000)
+    parser.add_argument('--scan-repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    scores = {user_id: round(rng.uniform(0, 5000), 3) for user_id in range(1, args.users + 1)}
+
+    started = time.perf_counter()
+    board = Board(dict(scores))
+    print(f'board of {len(board)} users built in {time.perf_counter() - started:.2f}s')
+
+    users = [rng.randint(1, args.users) for _ in range(args.repeat)]
+    report('rank', timed(board.rank, users))
+    report('top 10, random offset', timed(
+        lambda offset: board.top(10, offset),
+        [rng.randrange(args.users) for _ in range(args.repeat)]))
+    report('top 10, first page', timed(lambda offset: board.top(10, offset), [0] * args.repeat))
+    report('add (score update)', timed(
+        lambda user_id: board.add(user_id, rng.uniform(0, 10)), users))
+
+    def scan_rank(user_id: int) -> int:
+        score = scores[user_id]
+        return 1 + sum(1 for other, value in scores.items()
+                       if value > score or (value == score and other < user_id))
+
+    report('rank by full scan', timed(scan_rank, users[:args.scan_repeat]))
+
+
+if __name__ == '__main__':
+    main()
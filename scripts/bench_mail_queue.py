@@ -0,0 +1,82 @@
+""" otp mail throughput against a local aiosmtpd server
+
+    python -m scripts.bench_mail_queue [--messages 10000] [--workers 1 2 4 8]
+
+needs aiosmtpd (pip install aiosmtpd). the script starts an smtp server on
+127.0.0.1 that only counts messages, then compares send_email, which opens
+a connection per message, with MailQueue at each worker count. settings
+are loaded from the environment and .env as usual; the EMAIL_* values are
+overridden to point at the local server.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import os
+import socket
+import time
+
+# Third-party imports
+from aiosmtpd.controller import Controller
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 OK'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark otp mail throughput')
+    parser.add_argument('--messages', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(EMAIL_HOST='127.0.0.1', EMAIL_PORT=str(port), EMAIL_USE_SSL='false')
+
+    # settings are read on import, after the overrides above
+    from src.services.mail_queue import MailQueue
+    from src.utils.email_send import send_email
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=port)
+    controller.start()
+    try:
+        started = time.perf_counter()
+        for n in range(args.messages):
+            assert send_email(f'user{n}@example.com', 123456)
+        rate = args.messages / (time.perf_counter() - started)
+        print(f'send_email           {rate:8.1f} mails/s')
+
+        for workers in args.workers:
+            queue = MailQueue(workers=workers, maxsize=args.messages, max_attempts=3, backoff=0.1)
+
+            async def run() -> float:
+                for n in range(args.messages):
+                    await queue.enqueue_otp(f'user{n}@example.com', 123456)
+                started = time.perf_counter()
+                queue.start()
+                await queue.stop(timeout=600)
+                return time.perf_counter() - started
+
+            elapsed = asyncio.run(run())
+            stats = queue.stats()
+            print(f'mail_queue workers={workers:2d} {stats["sent"] / elapsed:8.1f} mails/s'
+                  f'  failed={stats["failed"]} retried={stats["retried"]}')
+    finally:
+        controller.stop()
+    print(f'server received {handler.received}')
+
+
+if __name__ == '__main__':
+    main()
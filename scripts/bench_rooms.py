@@ -0,0 +1,215 @@
+""" load generator for multiplayer quiz rooms over the websocket route
+
+    python -m scripts.bench_rooms [--rooms 200] [--players 20] [--questions 5]
+
+serves the app with uvicorn inside this process and plays `--rooms`
+rooms of `--players` websocket clients each through
+/api/v1/rooms/{id}/ws, so every message takes the real path: session
+cookie, route, room, send queue and socket. every player answers each
+question after a random delay; one player per room never reads its
+socket (`--slow 0` to disable), to show a slow client being dropped
+or, while the socket buffers still absorb its messages, not stalling
+the room. game timings are shortened with the --*-time options.
+
+the players with their sessions and a small question bank are seeded
+into DATABASE_URL, which gets the tables if missing, and deleted at the
+end. reports the cost of one broadcast, the wall time of the games and
+what was delivered, and fails unless every room finished.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+# Third-party imports
+import httpx
+import uvicorn
+from sqlalchemy import delete, insert, select
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+# Local imports
+from src.main import app
+from src.core.config import settings
+from src.core.database import SessionLocal, create_tables, engine
+from src.models.analytics import UserStatistics
+from src.models.authentication import User, UserSession
+from src.models.questions import Category, Question
+from src.services.rooms import room_manager
+from src.utils.enums import AnswerOption, RoomStatus
+from scripts.bench_data import seed_questions
+
+PREFIX = '/api/v1'
+
+
+async def seed_players(prefix: str, count: int) -> list:
+    """ users with a live session each, returns their session tokens
+    """
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {'email': f'{prefix}-{n}@example.com', 'username': f'{prefix}-{n}',
+             'password': 'not-a-hash', 'is_active': True, 'is_verified': True}
+            for n in range(count)
+        ])
+        user_ids = (await db.scalars(
+            select(User.id).filter(User.username.like(f'{prefix}-%')).order_by(User.id))).all()
+        tokens = [f'{prefix}-session-{user_id}' for user_id in user_ids]
+        await db.execute(insert(UserSession), [
+            {'user_id': user_id, 'session_token': token, 'expires_at': expires_at}
+            for user_id, token in zip(user_ids, tokens)
+        ])
+        await db.commit()
+    return tokens
+
+
+async def clean_up(prefix: str, category_ids: list) -> None:
+    async with SessionLocal() as db:
+        user_ids = select(User.id).filter(User.username.like(f'{prefix}-%')).scalar_subquery()
+        await db.execute(delete(UserStatistics).where(UserStatistics.user_id.in_(user_ids)))
+        await db.execute(delete(UserSession).where(UserSession.user_id.in_(user_ids)))
+        await db.execute(delete(User).where(User.username.like(f'{prefix}-%')))
+        await db.execute(delete(Question).where(Question.category_id.in_(category_ids)))
+        await db.execute(delete(Category).where(Category.id.in_(category_ids)))
+        await db.commit()
+
+
+def cookie(token: str) -> dict:
+    return {'Cookie': f'session_id={token}'}
+
+
+async def play(socket, slow: bool, over: asyncio.Event, counters: dict) -> None:
+    """ answer every question until the game ends; a slow player only
+        waits for the end without reading
+    """
+    if slow:
+        await over.wait()
+        return
+
+    async def answer(delay: float) -> None:
+        await asyncio.sleep(delay)
+        await socket.send(json.dumps({'type': 'answer', 'answer': random.choice(list(AnswerOption)).value}))
+
+    answers = set()
+    try:
+        async for text in socket:
+            counters['delivered'] += 1
+            kind = json.loads(text)['type']
+            if kind == 'question':
+                task = asyncio.create_task(answer(random.uniform(0.01, 0.3)))
+                answers.add(task)
+                task.add_done_callback(answers.discard)
+            elif kind in ('finished', 'cancelled'):
+                counters[kind] += 1
+                break
+    except ConnectionClosed:
+        counters['closed'] += 1
+    finally:
+        over.set()
+
+
+async def run(args) -> None:
+    prefix = f'bench-{time.time_ns()}'
+    # src.main imported every model, so create_all makes all the tables
+    await create_tables()
+    async with SessionLocal() as db:
+        category_ids = await seed_questions(db, max(args.questions * 10, 100))
+        await db.commit()
+    tokens = await seed_players(prefix, args.rooms * args.players)
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=0, log_level='warning'))
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if serving.done():
+                serving.result()
+            await asyncio.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        base = f'127.0.0.1:{port}{PREFIX}'
+
+        rooms = []
+        async with httpx.AsyncClient(base_url=f'http://{base}') as client:
+            for number in range(args.rooms):
+                response = await client.post('/rooms', headers=cookie(tokens[number * args.players]), json={
+                    'question_count': args.questions, 'max_players': args.players,
+                    'category_id': category_ids[number % len(category_ids)]})
+                response.raise_for_status()
+                rooms.append(room_manager.get(response.json()['id']))
+
+        started = time.perf_counter()
+        sockets = []
+        for number, room in enumerate(rooms):
+            url = f'ws://{base}/rooms/{room.id}/ws'
+            members = tokens[number * args.players:(number + 1) * args.players]
+            # the host first, the room is theirs to start
+            sockets.append(await asyncio.gather(*(
+                connect(url, additional_headers=cookie(token), max_queue=4, close_timeout=1)
+                for token in members)))
+        # the handshake completes before the server adds the player
+        while any(len(room.connections) < args.players for room in rooms):
+            await asyncio.sleep(0.01)
+        connect_seconds = time.perf_counter() - started
+        connections = sum(len(room.connections) for room in rooms)
+
+        started = time.perf_counter()
+        for room in rooms:
+            room.broadcast({'type': 'ping', 'payload': 'y' * 200})
+        broadcast = time.perf_counter() - started
+
+        counters = {'delivered': 0, 'finished': 0, 'cancelled': 0, 'closed': 0}
+        started = time.perf_counter()
+        games = []
+        for members in sockets:
+            over = asyncio.Event()
+            await members[0].send(json.dumps({'type': 'start'}))
+            games += [
+                play(socket, args.slow and index == 1, over, counters)
+                for index, socket in enumerate(members)
+            ]
+        await asyncio.gather(*games)
+        wall = time.perf_counter() - started
+
+        await asyncio.gather(*(socket.close() for members in sockets for socket in members))
+    finally:
+        server.should_exit = True
+        await serving
+        await clean_up(prefix, category_ids)
+        await engine.dispose()
+
+    print(f'{args.rooms} rooms x {args.players} players = {connections} websocket connections'
+          f' opened in {connect_seconds:.2f}s')
+    print(f'one broadcast to every room: {broadcast * 1000:.1f} ms'
+          f' ({broadcast / connections * 1e6:.2f} us/connection)')
+    print(f'games of {args.questions} questions: {wall:.2f}s wall, {counters["delivered"]} messages'
+          f' delivered, {counters["finished"]} players saw the end, {counters["closed"]} were closed')
+    statuses = {status.value: sum(room.status == status for room in rooms) for status in RoomStatus}
+    print('final statuses', statuses, 'slow players dropped', sum(room.dropped for room in rooms))
+    if statuses[RoomStatus.FINISHED.value] != len(rooms):
+        raise SystemExit('not every room finished')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Play quiz rooms over websockets')
+    parser.add_argument('--rooms', type=int, default=200)
+    parser.add_argument('--players', type=int, default=20)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--slow', type=int, default=1, help='one player per room never reads (0 or 1)')
+    parser.add_argument('--start-time', type=float, default=0.1)
+    parser.add_argument('--question-time', type=float, default=2.0)
+    parser.add_argument('--reveal-time', type=float, default=0.1)
+    args = parser.parse_args()
+
+    settings.ROOM_START_DELAY = args.start_time
+    settings.ROOM_QUESTION_TIME = args.question_time
+    settings.ROOM_REVEAL_TIME = args.reveal_time
+    settings.ROOM_MAX_PLAYERS = max(settings.ROOM_MAX_PLAYERS, args.players)
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
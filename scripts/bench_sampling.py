@@ -0,0 +1,77 @@
+""" quiz question sampling: in-memory id index vs ORDER BY random()
+
+    python -m scripts.bench_sampling [--questions 1000000] [--k 10]
+
+seeds the question bank into DATABASE_URL inside a transaction that is
+rolled back at the end, loads a QuestionSampler from it, then times
+drawing k ids from the index against the SQL approach it replaces.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import statistics
+import time
+
+# Third-party imports
+from sqlalchemy import func, select
+
+# Local imports
+from src.core.database import SessionLocal, create_tables, engine
+from src.models.questions import Question
+from src.services.question_sampler import QuestionSampler
+from scripts.bench_data import seed_questions
+
+
+def report(name: str, timings: list) -> None:
+    timings = sorted(timings)
+    print(f'{name:28s} median {statistics.median(timings) * 1000:9.3f}ms'
+          f'  p99 {timings[int(len(timings) * 0.99)] * 1000:9.3f}ms  ({len(timings)} runs)')
+
+
+async def run(questions: int, k: int, repeat: int, sql_repeat: int) -> None:
+    await create_tables()
+    async with SessionLocal() as db:
+        try:
+            category_ids = await seed_questions(db, questions)
+
+            sampler = QuestionSampler()
+            started = time.perf_counter()
+            await sampler.load(db)
+            print(f'sampler load {time.perf_counter() - started:.2f}s for {len(sampler)} ids')
+
+            for name, category_id in (('index, any category', None), ('index, one category', category_ids[0])):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    assert len(sampler.sample(k, category_id)) == k
+                    timings.append(time.perf_counter() - started)
+                report(name, timings)
+
+            query = select(Question.id).filter(Question.is_active).order_by(func.random()).limit(k)
+            for name, statement in (
+                    ('ORDER BY random(), any', query),
+                    ('ORDER BY random(), one', query.filter(Question.category_id == category_ids[0]))):
+                timings = []
+                for _ in range(sql_repeat):
+                    started = time.perf_counter()
+                    assert len((await db.scalars(statement)).all()) == k
+                    timings.append(time.perf_counter() - started)
+                report(name, timings)
+        finally:
+            await db.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark question sampling')
+    parser.add_argument('--questions', type=int, default=1_000_000)
+    parser.add_argument('--k', type=int, default=10, help='questions per quiz')
+    parser.add_argument('--repeat', type=int, default=10000, help='index draws to time')
+    parser.add_argument('--sql-repeat', type=int, default=20, help='sql draws to time')
+    args = parser.parse_args()
+    asyncio.run(run(args.questions, args.k, args.repeat, args.sql_repeat))
+
+
+if __name__ == '__main__':
+    main()
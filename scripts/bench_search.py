@@ -0,0 +1,81 @@
+""" full-text question search latency vs LIKE '%term%'
+
+    python -m scripts.bench_search [--questions 1000000]
+
+seeds the synthetic bank from scripts/bench_data into DATABASE_URL inside a
+transaction that is rolled back at the end. search_questions is timed for
+words of different frequencies, a two word query and a category
+filtered query; each is compared with the LIKE scan it replaces. ranking
+needs every match, so very frequent words cost more than an unranked
+LIKE that stops at the limit.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import statistics
+import time
+
+# Third-party imports
+from sqlalchemy import select
+
+# Local imports
+from src.core.database import SessionLocal, create_tables, engine
+from src.models.questions import Question
+from src.services.question_search import search_questions
+from scripts.bench_data import VOCABULARY, seed_questions
+
+
+async def median_ms(call, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def run(questions: int, repeat: int, limit: int) -> None:
+    await create_tables()
+    async with SessionLocal() as db:
+        try:
+            category_ids = await seed_questions(db, questions)
+            cases = [
+                ('frequent word', VOCABULARY[10], None),
+                ('mid frequency word', VOCABULARY[500], None),
+                ('rare word', VOCABULARY[3000], None),
+                ('two words', f'{VOCABULARY[10]} {VOCABULARY[500]}', None),
+                ('frequent word, one category', VOCABULARY[10], category_ids[0]),
+            ]
+            for name, text, category_id in cases:
+                async def fts():
+                    return await search_questions(db, text, category_id, limit=limit)
+
+                async def like():
+                    query = select(Question.id)
+                    for term in text.split():
+                        query = query.filter(Question.question_text.like(f'%{term}%'))
+                    if category_id is not None:
+                        query = query.filter(Question.category_id == category_id)
+                    return (await db.scalars(query.limit(limit))).all()
+
+                hits = len(await fts())
+                print(f'{name:28s} {text!r:18s} hits={hits:3d}'
+                      f'  fts {await median_ms(fts, repeat):9.2f}ms'
+                      f'  like {await median_ms(like, repeat):9.2f}ms')
+        finally:
+            await db.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark question search')
+    parser.add_argument('--questions', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.questions, args.repeat, args.limit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+""" question bank snapshot vs ORM instances: memory, lookups, rebuild
+
+    python -m scripts.bench_snapshot [--questions 500000]
+
+seeds the synthetic bank from scripts/bench_data into DATABASE_URL and
+commits it, since the snapshot store reads through its own session; the
+seeded categories and questions are deleted again at the end. reports
+the traced memory of the snapshot and of the same questions as ORM
+objects, metadata lookup time for both, and how long the event loop
+stalls while the store rebuilds.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+
+# Third-party imports
+from sqlalchemy import delete, select
+
+# Local imports
+from src.core.database import SessionLocal, create_tables, engine
+from src.models.questions import Category, Question
+from src.services.catalog import question_metadata
+from src.services.question_snapshot import QuestionSnapshotStore
+from scripts.bench_data import seed_questions
+
+
+async def traced(load):
+    """ result of `load()` and the memory it still holds afterwards
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = await load()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+async def max_loop_lag(work) -> float:
+    """ longest gap between 1ms ticks of the event loop while `work` runs
+    """
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - started - 0.001)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await work()
+    finally:
+        done = True
+        await task
+    return lag
+
+
+def lookups_per_second(lookup, ids: list) -> float:
+    started = time.perf_counter()
+    for question_id in ids:
+        lookup(question_id)
+    return len(ids) / (time.perf_counter() - started)
+
+
+async def run(questions: int, lookups: int) -> None:
+    await create_tables()
+    async with SessionLocal() as db:
+        category_ids = await seed_questions(db, questions)
+        await db.commit()
+
+    try:
+        store = QuestionSnapshotStore(delay=0)
+        snapshot, snapshot_size = await traced(store.build)
+        started = time.perf_counter()
+        lag = await max_loop_lag(store.build)
+        print(f'snapshot  {len(snapshot):8d} questions  {snapshot_size / 2**20:8.1f} MiB'
+              f'  rebuild {time.perf_counter() - started:.2f}s, max loop stall {lag * 1000:.1f}ms')
+
+        async with SessionLocal() as db:
+            async def load_orm():
+                return {
+                    question.id: question for question in (await db.scalars(
+                        select(Question).filter(Question.category_id.in_(category_ids)))).all()
+                }
+            orm, orm_size = await traced(load_orm)
+            print(f'orm       {len(orm):8d} questions  {orm_size / 2**20:8.1f} MiB')
+
+            ids = random.Random(0).choices(list(orm), k=lookups)
+            print(f'lookup    snapshot {lookups_per_second(snapshot.get, ids):12.0f}/s'
+                  f'  orm {lookups_per_second(lambda question_id: question_metadata(orm[question_id]), ids):12.0f}/s')
+            del orm
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(Question).where(Question.category_id.in_(category_ids)))
+            await db.execute(delete(Category).where(Category.id.in_(category_ids)))
+            await db.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the question bank snapshot')
+    parser.add_argument('--questions', type=int, default=500_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.questions, args.lookups))
+
+
+if __name__ == '__main__':
+    main()
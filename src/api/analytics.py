@@ -0,0 +1,24 @@
+# Standard library imports
+from typing import Optional
+
+# Third-party imports
+from fastapi import APIRouter, Depends
+
+# Local imports
+from src.utils.get_current_user import get_current_user
+from src.utils.session_cache import CurrentUser
+from src.services.user_stats import user_stats
+
+
+router = APIRouter(prefix='/analytics', tags=['Analytics'])
+
+
+@router.get('/me')
+async def my_statistics(
+        category_id: Optional[int] = None,
+        user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ answered, correct, accuracy and streaks of the current user,
+        overall with a per-category breakdown or for one category
+    """
+
+    return await user_stats.get(user.id, category_id)
@@ -3,17 +3,26 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 # Third-party imports
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import (
     APIRouter, Depends, HTTPException, Response,
     Request
 )
 
 # Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
 from src.utils.db import get_db
-# from src.utils import send_email
+from src.services.mail_queue import mail_queue
 from src.utils.generate_otp import generate_otp
-from src.utils.hash_password import hash_password, verify_password
+from src.utils.hash_password import (
+    HashingBusyError, hash_password, verify_password
+)
+from src.utils.session_cache import CurrentUser, session_cache
+from src.utils.revocation import revocation_list
+from src.utils.session_token import create_session_token, decode_session_token
 from src.models.authentication import (
     User, EmailVerification,
     UserSession
@@ -25,10 +34,10 @@ router = APIRouter(prefix='/authentication', tags=['Authentication'])
 
 
 @router.post('/register', response_model=UserResponse)
-def register(user: UserRegister, db: Session = Depends(get_db)) -> UserResponse:
-    existing_user = db.query(User).filter(
+async def register(user: UserRegister, db: AsyncSession = Depends(get_db)) -> UserResponse:
+    existing_user = await db.scalar(select(User).filter(
         (User.email == user.email) | (User.username == user.username)
-    ).filter(User.is_verified).first()
+    ).filter(User.is_verified))
 
     if existing_user:
         if existing_user.email == user.email:
@@ -40,16 +49,15 @@ def register(user: UserRegister, db: Session = Depends(get_db)) -> UserResponse:
     otp = generate_otp()
     expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
 
-    ''' # block otp for sending in development
-    # send email
-    sent_email = send_email(user.email, otp)
-    if not sent_email:
-        raise HTTPException(status_code=404, detail='Invalid email')
-    '''
-    print(f'otp: {otp}')
+    # shed load before hashing when the mail backlog is already full
+    if mail_queue.full():
+        raise HTTPException(status_code=503, detail='Server busy, try again')
 
-    # hash password
-    hashed_password = hash_password(user.password)
+    # hash password in the hashing process pool
+    try:
+        hashed_password = await hash_password(user.password)
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail='Server busy, try again')
 
     try:
         # create new user
@@ -59,7 +67,7 @@ def register(user: UserRegister, db: Session = Depends(get_db)) -> UserResponse:
             password=hashed_password,
         )
         db.add(user_table)
-        db.flush()  # Get the ID without committing
+        await db.flush()  # Get the ID without committing
 
         email_verification_table = EmailVerification(
             user_id=user_table.id,
@@ -69,28 +77,34 @@ def register(user: UserRegister, db: Session = Depends(get_db)) -> UserResponse:
         db.add(email_verification_table)
 
         # commit both together
-        db.commit()
-        db.refresh(user_table)
+        await db.commit()
+        await db.refresh(user_table)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500, detail=f'Something went wrong {e}')
 
+    # send email through the mail queue workers once the otp is stored
+    await mail_queue.enqueue_otp(user.email, otp)
+
+    if settings.DEBUG:
+        print(f'otp: {otp}')
+
     return UserResponse.from_orm(user_table)
 
 
 @router.post('/verify-email')
-def verify_email(email: str, otp: int, db: Session = Depends(get_db)) -> dict:
-    user_table = db.query(User).filter(User.email == email).first()
+async def verify_email(email: str, otp: int, db: AsyncSession = Depends(get_db)) -> dict:
+    user_table = await db.scalar(select(User).filter(User.email == email))
     if not user_table:
         raise HTTPException(status_code=404, detail='User not found')
 
     if user_table.is_verified:
         return {'message': 'User already verified'}
 
-    email_verification_table = db.query(EmailVerification).filter(
+    email_verification_table = await db.scalar(select(EmailVerification).filter(
         EmailVerification.user_id == user_table.id
-    ).first()
+    ))
 
     # Check if verification record exists FIRST
     if not email_verification_table:
@@ -105,12 +119,12 @@ def verify_email(email: str, otp: int, db: Session = Depends(get_db)) -> dict:
         # cleanup expired otp
         email_verification_table.token = None
         email_verification_table.expires_at = None
-        db.commit()
+        await db.commit()
         raise HTTPException(status_code=400, detail='Otp Expired')
 
     if email_verification_table.token != otp:
         email_verification_table.attempts += 1
-        db.commit()
+        await db.commit()
 
         remaining = 5 - email_verification_table.attempts
         if remaining > 0:
@@ -119,7 +133,7 @@ def verify_email(email: str, otp: int, db: Session = Depends(get_db)) -> dict:
                 detail=f'Invalid Otp, {remaining} attempts remaining')
         else:
             email_verification_table.token = None
-            db.commit()
+            await db.commit()
             raise HTTPException(
                 status_code=429,
                 detail='Otp Expired, Please request a new otp')
@@ -130,45 +144,55 @@ def verify_email(email: str, otp: int, db: Session = Depends(get_db)) -> dict:
     email_verification_table.expires_at = None
     email_verification_table.is_used = True
     email_verification_table.verified_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
 
     return {'message': 'Email verified successfully'}
 
 
 @router.post('/login', response_model=LoginResponse)
-def login(
+async def login(
         user_credentials: UserLogin,
         response: Response,
-        db: Session = Depends(get_db)) -> LoginResponse:
+        db: AsyncSession = Depends(get_db)) -> LoginResponse:
 
-    user_table = db.query(User).filter(
+    user_table = await db.scalar(select(User).filter(
         User.username == user_credentials.username
-    ).filter(User.is_verified).first()
+    ).filter(User.is_verified))
 
     if not user_table:
         raise HTTPException(status_code=404, detail='User not found')
 
-    verified_password = verify_password(
-        user_credentials.password, user_table.password)
+    try:
+        verified_password = await verify_password(
+            user_credentials.password, user_table.password)
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail='Server busy, try again')
 
     if not verified_password:
         raise HTTPException(status_code=401, detail='Password not match')
 
     session_id = str(uuid.uuid4())
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
     new_session = UserSession(
         user_id=user_table.id,
         session_token=session_id,
         is_active=True,
-        created_at=datetime.utcnow(),
-        expires_at=datetime.utcnow() + timedelta(hours=24)
+        created_at=datetime.now(timezone.utc),
+        expires_at=expires_at
     )
 
     user_table.is_active = True
     db.add(new_session)
-    db.commit()
+    await db.commit()
+
+    # token mode hands out a signed token, the row is kept for revocation
+    cookie_value = session_id
+    if settings.SESSION_MODE == 'token':
+        cookie_value = create_session_token(
+            CurrentUser.from_model(user_table), session_id, expires_at)
 
     # response
-    response.set_cookie(key='session_id', value=session_id, httponly=True)
+    response.set_cookie(key='session_id', value=cookie_value, httponly=True)
 
     # Add password verification logic here
     return LoginResponse(
@@ -178,14 +202,21 @@ def login(
 
 
 @router.post('/logout')
-def logout(request: Request, response: Response, db: Session = Depends(get_db)):
+async def logout(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     session_id = request.cookies.get('session_id')
 
     response.delete_cookie('session_id')
     if not session_id:
         raise HTTPException(status_code=404, detail='No active session')
 
-    session = db.query(UserSession).filter(UserSession.session_token == session_id).first()
+    if settings.SESSION_MODE == 'token':
+        return await _revoke_session_token(session_id, db)
+
+    session_cache.invalidate(session_id)
+
+    session = await db.scalar(
+        select(UserSession).options(joinedload(UserSession.user))
+        .filter(UserSession.session_token == session_id))
     if not session:
         raise HTTPException(status_code=401, detail='Invalid session')
 
@@ -194,8 +225,8 @@ def logout(request: Request, response: Response, db: Session = Depends(get_db)):
     except AttributeError:
         username = 'Unknown user'
 
-    db.delete(session)
-    db.commit()
+    await db.delete(session)
+    await db.commit()
 
     return {
         'message': 'Logout successful',
@@ -203,16 +234,43 @@ def logout(request: Request, response: Response, db: Session = Depends(get_db)):
     }
 
 
+async def _revoke_session_token(token: str, db: AsyncSession) -> dict:
+    claims = decode_session_token(token, verify_exp=False)
+    if not claims:
+        raise HTTPException(status_code=401, detail='Invalid session')
+
+    session_id = claims['sid']
+    revocation_list.add(session_id)
+
+    # keep the row until it expires so the revocation survives restarts
+    await db.execute(
+        update(UserSession)
+        .filter(UserSession.session_token == session_id)
+        .values(is_active=False))
+    await db.commit()
+
+    return {
+        'message': 'Logout successful',
+        "username": claims.get('usr', 'Unknown user'),
+    }
+
+
 # Add a helper endpoint to check session status
 @router.get('/session-status')
-def session_status(request: Request, db: Session = Depends(get_db)):
+async def session_status(request: Request):
     session_id = request.cookies.get('session_id')
     if not session_id:
         return {"status": "no_session"}
 
-    session = db.query(UserSession).filter(
-        UserSession.session_token == session_id
-    ).first()
+    if settings.SESSION_MODE == 'token':
+        return await _token_session_status(session_id)
+
+    async with SessionLocal() as db:
+        session = await db.scalar(select(UserSession).options(
+            joinedload(UserSession.user)
+        ).filter(
+            UserSession.session_token == session_id
+        ))
 
     if not session:
         return {"status": "invalid_session"}
@@ -225,3 +283,18 @@ def session_status(request: Request, db: Session = Depends(get_db)):
         "user": session.user.username,
         "expires_at": session.expires_at
     }
+
+
+async def _token_session_status(token: str) -> dict:
+    claims = decode_session_token(token, verify_exp=False)
+    if not claims or await revocation_list.is_revoked(claims['sid']):
+        return {"status": "invalid_session"}
+
+    if claims['expires_at'] < datetime.now(timezone.utc):
+        return {"status": "expired_session"}
+
+    return {
+        "status": "valid_session",
+        "user": claims.get('usr'),
+        "expires_at": claims['expires_at']
+    }
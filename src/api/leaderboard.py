@@ -0,0 +1,64 @@
+# Standard library imports
+from typing import Optional
+
+# Third-party imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+# Local imports
+from src.utils.db import get_db
+from src.utils.get_current_user import get_current_user
+from src.models.authentication import User
+from src.utils.session_cache import CurrentUser
+from src.services.leaderboard import leaderboards
+
+
+router = APIRouter(prefix='/leaderboard', tags=['Leaderboard'])
+
+
+@router.get('')
+async def leaderboard(
+        category_id: Optional[int] = None,
+        limit: int = Query(default=20, ge=1, le=100),
+        offset: int = Query(default=0, ge=0),
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ top players overall or in one category
+    """
+
+    board = leaderboards.board(category_id)
+    entries = board.top(limit, offset) if board else []
+
+    if entries:
+        result = await db.execute(
+            select(User.id, User.username).filter(User.id.in_([e['user_id'] for e in entries])))
+        usernames = dict(result.all())
+        for entry in entries:
+            entry['username'] = usernames.get(entry['user_id'])
+
+    return {
+        'category_id': category_id,
+        'total': len(board) if board else 0,
+        'entries': entries
+    }
+
+
+@router.get('/me')
+async def leaderboard_me(
+        category_id: Optional[int] = None,
+        user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ rank and score of the current user
+    """
+
+    board = leaderboards.board(category_id)
+    ranked = board.rank(user.id) if board else None
+    if ranked is None:
+        raise HTTPException(status_code=404, detail='No completed quizzes yet')
+
+    rank, score = ranked
+    return {
+        'category_id': category_id,
+        'rank': rank,
+        'score': score,
+        'total': len(board)
+    }
@@ -0,0 +1,89 @@
+# Third-party imports
+from fastapi import APIRouter
+
+# Local imports
+from src.core.database import engine
+from src.core.pool_metrics import pool_metrics
+from src.services.mail_queue import mail_queue
+from src.services.activity_tracker import activity_tracker
+from src.utils.model_cache import model_cache
+from src.services.quiz_sessions import quiz_engine
+from src.services.leaderboard import leaderboards
+from src.services.user_stats import user_stats
+from src.services.rooms import room_manager
+from src.utils.session_cache import session_cache
+
+
+router = APIRouter(prefix='/metrics', tags=['Metrics'])
+
+
+@router.get('/session-cache')
+def session_cache_metrics() -> dict:
+    """ hit/miss counters of the in-process session cache
+    """
+
+    return session_cache.stats()
+
+
+@router.get('/database-pool')
+def database_pool_metrics() -> dict:
+    """ checked-out, idle and overflow connections plus wait/hold times
+    """
+
+    return pool_metrics.snapshot(engine.sync_engine)
+
+
+@router.get('/mail-queue')
+def mail_queue_metrics() -> dict:
+    """ queued, sent, retried and failed outbound mails
+    """
+
+    return mail_queue.stats()
+
+
+@router.get('/session-activity')
+def session_activity_metrics() -> dict:
+    """ pending and flushed session activity updates
+    """
+
+    return activity_tracker.stats()
+
+
+@router.get('/model-cache')
+def model_cache_metrics() -> dict:
+    """ hit rate and table versions of the category/question read cache
+    """
+
+    return model_cache.stats()
+
+
+@router.get('/quiz-sessions')
+def quiz_session_metrics() -> dict:
+    """ live sessions and writes waiting for the next flush
+    """
+
+    return quiz_engine.stats()
+
+
+@router.get('/leaderboards')
+def leaderboard_metrics() -> dict:
+    """ ranked users and number of category boards
+    """
+
+    return leaderboards.stats()
+
+
+@router.get('/user-stats')
+def user_stats_metrics() -> dict:
+    """ loaded users, counters waiting for the next flush
+    """
+
+    return user_stats.stats()
+
+
+@router.get('/rooms')
+async def room_metrics() -> dict:
+    """ open rooms by status, connections and slow clients dropped
+    """
+
+    return room_manager.stats()
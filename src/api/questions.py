@@ -1,27 +1,52 @@
 # Standard library imports
-from typing import List
+import os
+import shutil
+import asyncio
+import tempfile
+from typing import List, Optional
 # from datetime import datetime, timedelta, timezone
 
 # Third-party imports
 # from sqlalchemy import func
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter, Depends, File, HTTPException, Query, Request, Response,
+    UploadFile
+)
+from fastapi.responses import StreamingResponse
 
 # Local imports
+from src.core.config import settings
 from src.utils.db import get_db
 from src.models.questions import Category, Question
 from src.schemas.questions import CategoryCreate, QuestionCreate
+from src.services.category_ingest import upsert_categories
+from src.services.question_ingest import insert_questions
+from src.services.import_jobs import IMPORT_FORMATS, import_jobs
+from src.services.question_export import EXPORT_FORMATS, export_query, export_questions
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.services.catalog_watcher import bump_catalog_version, catalog_watcher
+from src.utils.enums import DedupMode, DifficultyLevel
+from src.utils.pagination import etag_matches, keyset_page, page_etag
+from src.utils.model_cache import model_cache
+from src.services.catalog import get_active_category
+from src.services.question_search import search_questions
+from src.services.question_dedup import store_fingerprints
+from src.utils.fingerprint import question_fingerprint
 
 
 router = APIRouter(prefix='/question', tags=['Question'])
 
 
 @router.post('/categories')
-def category_create(category_data: CategoryCreate, db: Session = Depends(get_db)) -> dict:
+async def category_create(category_data: CategoryCreate, db: AsyncSession = Depends(get_db)) -> dict:
     """ insert category in database, one by one
     """
 
-    category = db.query(Category).filter(Category.name == category_data.name).first()
+    category = await db.scalar(select(Category).filter(Category.name == category_data.name))
     if category:
         raise HTTPException(status_code=401, detail='Category already present')
 
@@ -33,8 +58,11 @@ def category_create(category_data: CategoryCreate, db: Session = Depends(get_db)
     )
 
     db.add(new_category)
-    db.commit()
-    db.refresh(new_category)
+    version = await bump_catalog_version(db)
+    await db.commit()
+    catalog_watcher.applied(version)
+    model_cache.bump('categories')
+    await db.refresh(new_category)
 
     # Response formation
     return {
@@ -51,8 +79,9 @@ def category_create(category_data: CategoryCreate, db: Session = Depends(get_db)
 
 
 @router.post('/categories/bulk')
-def category_create_bulk(categories_data: List[CategoryCreate], db: Session = Depends(get_db)):
-    """ insert bulk categories
+async def category_create_bulk(
+        categories_data: List[CategoryCreate], upsert: bool = False, db: AsyncSession = Depends(get_db)):
+    """ insert bulk categories, with upsert=true existing names are updated
     """
 
     if not categories_data:
@@ -62,16 +91,15 @@ def category_create_bulk(categories_data: List[CategoryCreate], db: Session = De
     if len(categories_data) != len(set(category_names)):
         raise HTTPException(status_code=400, detail='Duplicate category name is present in request')
 
-    existing_categories = db.query(Category).filter(Category.name.in_(category_names)).all()
+    if upsert:
+        return await _category_upsert_bulk(categories_data, db)
+
+    existing_categories = (await db.scalars(
+        select(Category).filter(Category.name.in_(category_names)))).all()
     if existing_categories:
         existing_names = [cat.name for cat in existing_categories]
         raise HTTPException(status_code=409, detail=f'Categories already exists: {', '.join(existing_names)}')
 
-    for category_data in categories_data:
-        category = db.query(Category).filter(Category.name == category_data.name).first()
-        if category:
-            raise HTTPException(status_code=401, detail='Category already present')
-
     new_category = [
         Category(
             name=category_data.name,
@@ -82,10 +110,18 @@ def category_create_bulk(categories_data: List[CategoryCreate], db: Session = De
     ]
 
     db.add_all(new_category)
-    db.commit()
+    try:
+        version = await bump_catalog_version(db)
+        await db.commit()
+    except IntegrityError:
+        # a concurrent upload created one of the names first
+        await db.rollback()
+        raise HTTPException(status_code=409, detail='Categories already exists')
+    catalog_watcher.applied(version)
+    model_cache.bump('categories')
 
     for category in new_category:
-        db.refresh(category)
+        await db.refresh(category)
 
     return {
         'message': f'Successfully created {len(new_category)} category',
@@ -102,12 +138,46 @@ def category_create_bulk(categories_data: List[CategoryCreate], db: Session = De
     }
 
 
+async def _category_upsert_bulk(categories_data: List[CategoryCreate], db: AsyncSession) -> dict:
+    categories = await upsert_categories(db, categories_data)
+    version = await bump_catalog_version(db)
+    await db.commit()
+    catalog_watcher.applied(version)
+    model_cache.bump('categories')
+    question_snapshot.schedule_rebuild()
+
+    # updated categories may have been activated or deactivated
+    updated_ids = [c['id'] for c in categories if not c['created']]
+    if updated_ids:
+        await question_sampler.load(db, updated_ids)
+
+    created = [c for c in categories if c['created']]
+    updated = [c for c in categories if not c['created']]
+    return {
+        'message': f'Successfully upserted {len(categories)} category',
+        'categories_created': len(created),
+        'categories_updated': len(updated),
+        'created': [c['name'] for c in created],
+        'updated': [c['name'] for c in updated],
+        'categories': [
+            {
+                'id': c['id'],
+                'name': c['name'],
+                'description': c['description'],
+                'difficulty_multiplier': c['difficulty_multiplier'],
+                'is_active': c['is_active'],
+                'created_at': c['created_at']
+            } for c in categories
+        ]
+    }
+
+
 @router.post('/categories/{category_id}/questions')
-def question_create(category_id: int, question_data: QuestionCreate, db: Session = Depends(get_db)) -> dict:
+async def question_create(category_id: int, question_data: QuestionCreate, db: AsyncSession = Depends(get_db)) -> dict:
     """ insert question based on category id, one by one
     """
 
-    category = db.query(Category).filter(Category.id == category_id, Category.is_active).first()
+    category = await get_active_category(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail='Category not found')
 
@@ -123,8 +193,25 @@ def question_create(category_id: int, question_data: QuestionCreate, db: Session
     )
 
     db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
+    await db.flush()
+    await store_fingerprints(db, [new_question.id], [
+        question_fingerprint(new_question.question_text, (
+            new_question.option_a, new_question.option_b,
+            new_question.option_c, new_question.option_d), settings.DEDUP_NEAR_DUPLICATES)
+    ])
+    version = await bump_catalog_version(db)
+    await db.commit()
+    catalog_watcher.applied(version)
+    model_cache.bump('questions')
+    await db.refresh(new_question)
+    question_snapshot.add_rows([{
+        column: getattr(new_question, column) for column in (
+            'id', 'category_id', 'question_text', 'difficulty_level', 'correct_answer',
+            'option_a', 'option_b', 'option_c', 'option_d', 'is_active')
+    }])
+
+    if new_question.is_active:
+        question_sampler.add(category_id, new_question.difficulty_level, (new_question.id,))
 
     return {
         'message': 'Question Added to category',
@@ -140,47 +227,268 @@ def question_create(category_id: int, question_data: QuestionCreate, db: Session
 
 
 @router.post('/categories/{category_id}/questions/bulk')
-def question_create_bulk(category_id: int, questions_data: List[QuestionCreate], db: Session = Depends(get_db)):
-    """ insert bulk questions
+async def question_create_bulk(
+        category_id: int, questions_data: List[QuestionCreate], dedup: DedupMode = DedupMode.FLAG,
+        near: bool = settings.DEDUP_NEAR_DUPLICATES, db: AsyncSession = Depends(get_db)):
+    """ insert bulk questions, duplicates of existing questions are
+        flagged (dedup=flag), skipped (dedup=reject) or not checked (dedup=off);
+        near=true also looks for near duplicates, otherwise only exact ones
     """
 
-    category = db.query(Category).filter(Category.id == category_id, Category.is_active).first()
+    category = await get_active_category(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail='Category not found')
 
-    new_questions = [
-        Question(
-            category_id=category_id,
-            question_text=question_data.question_text,
-            correct_answer=question_data.correct_answer,
-            option_a=question_data.option_a,
-            option_b=question_data.option_b,
-            option_c=question_data.option_c,
-            option_d=question_data.option_d,
-            is_active=question_data.is_active
-        ) for question_data in questions_data
-    ]
-
-    db.add_all(new_questions)
-    db.commit()
-
-    # Refresh to get id and timestamps
-    for question in new_questions:
-        db.refresh(question)
+    # ids and timestamps come back from INSERT ... RETURNING, no refresh needed
+    new_questions, duplicates = await insert_questions(db, category_id, questions_data, dedup, near)
+    version = await bump_catalog_version(db)
+    await db.commit()
+    catalog_watcher.applied(version)
+    model_cache.bump('questions')
+    question_snapshot.add_rows(new_questions)
+    question_sampler.add_rows(new_questions)
 
     return {
         'message': f'Successfully created {len(new_questions)} questions for category',
         'category_id': category_id,
         'category_name': category.name,
         'questions_created': len(new_questions),
+        'questions_rejected': len(duplicates) if dedup == DedupMode.REJECT else 0,
+        'duplicates': [
+            {
+                'index': d['position'],
+                'question_text': questions_data[d['position']].question_text,
+                'duplicate_of_question_id': d.get('question_id'),
+                'duplicate_of_index': d.get('batch_index'),
+                'match': d['match'],
+                'similarity': d['similarity']
+            } for d in duplicates
+        ],
+        'questions': [
+            {
+                'id': q['id'],
+                'question_text': q['question_text'],
+                'difficulty_level': q['difficulty_level'].value,
+                'correct_answer': q['correct_answer'],
+                'is_active': q['is_active'],
+                'created_at': q['created_at']
+            } for q in new_questions
+        ]
+    }
+
+
+@router.post('/categories/{category_id}/questions/import', status_code=202)
+async def question_import(
+        category_id: int, file: UploadFile = File(...), format: Optional[str] = None,
+        dedup: DedupMode = DedupMode.FLAG, near: bool = settings.DEDUP_NEAR_DUPLICATES,
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ import a csv or jsonl question file in the background,
+        poll /question/import-jobs/{job_id} for progress
+    """
+
+    file_format = format or os.path.splitext(file.filename or '')[1].lstrip('.').lower()
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f'Format must be one of: {', '.join(IMPORT_FORMATS)}')
+
+    category = await get_active_category(db, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail='Category not found')
+
+    # the upload is closed after the response, so keep our own copy
+    with tempfile.NamedTemporaryFile(suffix=f'.{file_format}', delete=False) as tmp:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, tmp)
+
+    job = import_jobs.start(category_id, tmp.name, file_format, dedup, near)
+    return {
+        'message': 'Import started',
+        'job_id': job.id,
+        'status': job.status
+    }
+
+
+@router.get('/import-jobs/{job_id}')
+async def question_import_status(job_id: str) -> dict:
+    """ progress and per-row errors of a question file import
+    """
+
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail='Import job not found')
+    return job.to_dict()
+
+
+@router.get('/export')
+async def question_export(
+        format: str = 'ndjson', category_id: Optional[int] = None,
+        difficulty_level: Optional[DifficultyLevel] = None, is_active: Optional[bool] = None,
+        gzip: bool = False) -> StreamingResponse:
+    """ stream the question bank as ndjson or csv, optionally gzipped
+    """
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f'Format must be one of: {', '.join(EXPORT_FORMATS)}')
+
+    media_type = 'application/x-ndjson' if format == 'ndjson' else 'text/csv'
+    filename = f'questions.{format}'
+    if gzip:
+        media_type = 'application/gzip'
+        filename += '.gz'
+
+    # the stream opens its own db session, request scoped ones are
+    # closed before the response body is sent
+    query = export_query(category_id, difficulty_level, is_active)
+    return StreamingResponse(
+        export_questions(query, format, gzip),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get('/categories')
+async def category_list(
+        request: Request, response: Response,
+        after_id: Optional[int] = None, limit: int = Query(default=50, ge=1, le=500),
+        is_active: Optional[bool] = None, db: AsyncSession = Depends(get_db)):
+    """ list categories page by page, pass next_after_id to get the next page
+    """
+
+    filters = []
+    if is_active is not None:
+        filters.append(Category.is_active == is_active)
+
+    cache_key = ('page', is_active, after_id, limit)
+    version = model_cache.version('categories')
+    cached = model_cache.get('categories', cache_key)
+    if cached:
+        etag, page = cached
+    else:
+        etag = await page_etag(db, Category, filters, after_id, limit, f'categories|{is_active}')
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    response.headers['ETag'] = etag
+    if cached:
+        return page
+
+    categories = (await db.scalars(keyset_page(Category, filters, after_id, limit))).all()
+    page = {
+        'categories': [
+            {
+                'id': c.id,
+                'name': c.name,
+                'description': c.description,
+                'difficulty_multiplier': c.difficulty_multiplier,
+                'is_active': c.is_active,
+                'created_at': c.created_at,
+                'updated_at': c.updated_at
+            } for c in categories
+        ],
+        'next_after_id': categories[-1].id if len(categories) == limit else None
+    }
+    model_cache.set('categories', cache_key, (etag, page), version)
+    return page
+
+
+@router.get('/questions')
+async def question_list(
+        request: Request, response: Response,
+        category_id: Optional[int] = None, difficulty_level: Optional[DifficultyLevel] = None,
+        is_active: Optional[bool] = None,
+        after_id: Optional[int] = None, limit: int = Query(default=50, ge=1, le=500),
+        db: AsyncSession = Depends(get_db)):
+    """ list questions page by page, pass next_after_id to get the next page
+    """
+
+    filters = []
+    if category_id is not None:
+        filters.append(Question.category_id == category_id)
+    if difficulty_level is not None:
+        filters.append(Question.difficulty_level == difficulty_level)
+    if is_active is not None:
+        filters.append(Question.is_active == is_active)
+
+    cache_key = ('page', category_id, difficulty_level, is_active, after_id, limit)
+    version = model_cache.version('questions')
+    cached = model_cache.get('questions', cache_key)
+    if cached:
+        etag, page = cached
+    else:
+        params = f'questions|{category_id}|{difficulty_level}|{is_active}'
+        etag = await page_etag(db, Question, filters, after_id, limit, params)
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    response.headers['ETag'] = etag
+    if cached:
+        return page
+
+    questions = (await db.scalars(keyset_page(Question, filters, after_id, limit))).all()
+    page = {
         'questions': [
             {
                 'id': q.id,
+                'category_id': q.category_id,
                 'question_text': q.question_text,
                 'difficulty_level': q.difficulty_level.value,
-                'correct_answer': q.correct_answer,
+                'option_a': q.option_a,
+                'option_b': q.option_b,
+                'option_c': q.option_c,
+                'option_d': q.option_d,
                 'is_active': q.is_active,
-                'created_at': q.created_at
-            } for q in new_questions
-        ]
+                'created_at': q.created_at,
+                'updated_at': q.updated_at
+            } for q in questions
+        ],
+        'next_after_id': questions[-1].id if len(questions) == limit else None
+    }
+    model_cache.set('questions', cache_key, (etag, page), version)
+    return page
+
+
+@router.get('/search')
+async def question_search(
+        q: str = Query(..., min_length=1, max_length=200), category_id: Optional[int] = None,
+        difficulty_level: Optional[DifficultyLevel] = None, is_active: Optional[bool] = None,
+        limit: int = Query(default=20, ge=1, le=100), db: AsyncSession = Depends(get_db)) -> dict:
+    """ full-text search over question text, best matches first
+    """
+
+    if not q.split():
+        raise HTTPException(status_code=400, detail='Search text is required')
+
+    questions = await search_questions(db, q, category_id, difficulty_level, is_active, limit)
+
+    return {
+        'query': q,
+        'questions': questions
+    }
+
+
+@router.get('/questions/{question_id}')
+async def question_detail(question_id: int, db: AsyncSession = Depends(get_db)) -> dict:
+    """ single question, active ones come from the in-memory snapshot
+    """
+
+    snapshot = question_snapshot.current
+    position = snapshot.position(question_id)
+    if position is not None:
+        return {
+            **snapshot.metadata(position),
+            'is_active': True
+        }
+
+    question = await db.get(Question, question_id)
+    if not question:
+        raise HTTPException(status_code=404, detail='Question not found')
+
+    return {
+        'id': question.id,
+        'category_id': question.category_id,
+        'question_text': question.question_text,
+        'difficulty_level': question.difficulty_level.value,
+        'option_a': question.option_a,
+        'option_b': question.option_b,
+        'option_c': question.option_c,
+        'option_d': question.option_d,
+        'is_active': question.is_active
     }
@@ -0,0 +1,136 @@
+# Standard library imports
+import json
+from typing import Optional
+
+# Third-party imports
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+)
+
+# Local imports
+from src.core.config import settings
+from src.utils.db import get_db
+from src.utils.enums import AnswerOption, RoomType
+from src.utils.get_current_user import authenticate, get_current_user
+from src.utils.session_cache import CurrentUser
+from src.services.catalog import get_questions_metadata
+from src.services.question_sampler import question_sampler
+from src.services.quiz_sessions import resolve_answer_key
+from src.services.rooms import Connection, Room, RoomError, room_manager
+from src.schemas.rooms import RoomCreate
+
+
+router = APIRouter(prefix='/rooms', tags=['Rooms'])
+
+# close codes for sockets without a valid session or room, sent after
+# accepting: a close before the handshake reaches the client as a 403
+UNAUTHORIZED = 4401
+NOT_FOUND = 4404
+
+
+@router.post('')
+async def room_create(
+        data: RoomCreate, user: CurrentUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ open a room, the creator is its host
+    """
+
+    if data.room_type not in (RoomType.USER_CREATED, RoomType.PRIVATE):
+        raise HTTPException(status_code=400, detail='Only user created or private rooms can be opened')
+
+    question_ids = question_sampler.sample(data.question_count, data.category_id, data.difficulty_level)
+    if not question_ids:
+        raise HTTPException(status_code=404, detail='No questions available')
+
+    room = room_manager.add(Room(
+        data.room_type, user.id, data.category_id,
+        await get_questions_metadata(db, question_ids),
+        await resolve_answer_key(db, question_ids),
+        min(data.max_players, settings.ROOM_MAX_PLAYERS)))
+
+    return {
+        **room.summary(),
+        'join_code': room.join_code
+    }
+
+
+@router.get('')
+async def room_list() -> dict:
+    """ public rooms still waiting for players
+    """
+
+    return {'rooms': [room.summary() for room in room_manager.open_rooms()]}
+
+
+@router.get('/{room_id}')
+async def room_detail(room_id: str) -> dict:
+    """ room status and current standings
+    """
+
+    room = room_manager.get(room_id)
+    if not room:
+        raise HTTPException(status_code=404, detail='Room not found')
+
+    return {
+        **room.summary(),
+        'standings': room.standings()
+    }
+
+
+@router.websocket('/{room_id}/ws')
+async def room_socket(websocket: WebSocket, room_id: str, code: Optional[str] = None):
+    """ play in a room
+
+    client messages: {"type": "start"} (host only), {"type": "answer",
+    "answer": "A"} and {"type": "leave"}. the server sends players,
+    starting, question, answered, reveal, finished, cancelled and error
+    messages.
+
+    the room must live on this worker, see RoomManager.
+    """
+
+    await websocket.accept()
+    try:
+        user = await authenticate(websocket.cookies.get('session_id'))
+    except HTTPException:
+        await websocket.close(code=UNAUTHORIZED)
+        return
+
+    room = room_manager.get(room_id)
+    if not room or (room.join_code and code != room.join_code):
+        await websocket.close(code=NOT_FOUND)
+        return
+
+    connection = Connection(user.id, websocket, settings.ROOM_SEND_QUEUE_SIZE)
+    try:
+        room.join(user.id, user.username, connection)
+    except RoomError as e:
+        await websocket.send_json({'type': 'error', 'detail': str(e)})
+        await websocket.close()
+        return
+
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                kind = message.get('type') if isinstance(message, dict) else None
+                if kind == 'answer':
+                    elapsed = room.answer(user.id, AnswerOption(message.get('answer')))
+                    connection.send_json({'type': 'answered', 'elapsed': round(elapsed, 3)})
+                elif kind == 'start':
+                    room_manager.start(room, user.id)
+                elif kind == 'leave':
+                    break
+                else:
+                    raise RoomError('Unknown message type')
+            except (RoomError, ValueError) as e:
+                connection.send_json({'type': 'error', 'detail': str(e)})
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the room closed the socket (slow consumer, game over)
+        pass
+    finally:
+        room.leave(user.id, connection)
+        room_manager.discard(room)
+        await connection.close()
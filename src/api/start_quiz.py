@@ -0,0 +1,237 @@
+# Standard library imports
+from typing import List, Optional
+
+# Third-party imports
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+# Local imports
+from src.utils.db import get_db
+from src.utils.enums import DifficultyLevel, SessionStatus, SessionType
+from src.utils.get_current_user import get_current_user
+from src.utils.session_cache import CurrentUser
+from src.models.user_data import QuizSession
+from src.services.catalog import get_questions_metadata
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.services.grading import answer_key, encode_answers, redeemed_tokens
+from src.services.daily_challenge import daily_challenge
+from src.services.quiz_sessions import (
+    InvalidTransition, LiveSession, QuizSessionError, SessionOwnedElsewhere, quiz_engine
+)
+from src.utils.grading_token import create_grading_token, decode_grading_token
+from src.schemas.questions import AnswerBatch, AnswerSubmission
+from src.schemas.user_data import QuizStart
+
+
+router = APIRouter(prefix='/quiz', tags=['Quiz'])
+
+
+def _draw_questions(
+        session_type: SessionType, category_id: Optional[int],
+        difficulty_level: Optional[DifficultyLevel], count: int) -> List[int]:
+    if session_type == SessionType.CATEGORY and category_id is None:
+        raise HTTPException(status_code=400, detail='category_id is required for category quiz')
+    if session_type == SessionType.DAILY_CHALLENGE:
+        question_ids = daily_challenge.current().question_ids
+        if not question_ids:
+            raise HTTPException(status_code=404, detail='No questions available')
+        return question_ids
+    if session_type == SessionType.RANDOM:
+        category_id = None
+
+    question_ids = question_sampler.sample(count, category_id, difficulty_level)
+    if not question_ids:
+        raise HTTPException(status_code=404, detail='No questions available')
+    return question_ids
+
+
+@router.get('/questions')
+async def quiz_questions(
+        session_type: SessionType = SessionType.RANDOM,
+        category_id: Optional[int] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        count: int = Query(default=10, ge=1, le=100),
+        user: CurrentUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ draw a random set of active questions for a quiz, the
+        grading_token lets the user grade their answers once
+    """
+
+    question_ids = _draw_questions(session_type, category_id, difficulty_level, count)
+    return {
+        'session_type': session_type.value,
+        'questions': await get_questions_metadata(db, question_ids),
+        'grading_token': create_grading_token(user.id, question_ids)
+    }
+
+
+@router.get('/daily')
+async def quiz_daily(db: AsyncSession = Depends(get_db)) -> dict:
+    """ today's challenge questions and targets, the same for every player
+    """
+
+    daily = daily_challenge.current()
+    return {
+        **daily.to_dict(),
+        'questions': await get_questions_metadata(db, daily.question_ids)
+    }
+
+
+@router.get('/daily/progress')
+async def quiz_daily_progress(user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ the current user's progress on today's challenges
+    """
+
+    progress = daily_challenge.progress(user.id)
+    return {
+        'day': daily_challenge.current().day.isoformat(),
+        'started': progress is not None or await daily_challenge.has_started(user.id),
+        'progress': progress.to_dict() if progress else None
+    }
+
+
+@router.post('/grade')
+async def quiz_grade(
+        batch: AnswerBatch, details: bool = False,
+        user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ grade a batch of answers against the answer key in one pass,
+        each correct answer scores its category difficulty_multiplier
+
+    only the questions served with the grading token count, answers to
+    others are not valid. a token is graded once.
+    """
+
+    claims = decode_grading_token(batch.token, user.id)
+    if claims is None:
+        raise HTTPException(status_code=403, detail='Invalid or expired grading token')
+    if not redeemed_tokens.redeem(claims['jti'], claims['expires_at']):
+        raise HTTPException(status_code=409, detail='These questions were already graded')
+
+    submissions = batch.answers
+    question_ids = np.fromiter(
+        (s.question_id for s in submissions), dtype=np.int32, count=len(submissions))
+    answers = encode_answers([s.answer for s in submissions])
+    # id 0 matches no question, so answers to unserved ones score nothing
+    served = np.isin(question_ids, np.array(claims['qid'], dtype=np.int32))
+    result = answer_key(question_snapshot.current).grade(np.where(served, question_ids, 0), answers)
+
+    response = {
+        'submitted': len(submissions),
+        'answered': result['answered'],
+        'correct': result['correct_count'],
+        'accuracy': result['correct_count'] / result['answered'] if result['answered'] else 0.0,
+        'score': result['score']
+    }
+    if details:
+        response['results'] = [
+            {'question_id': int(question_id), 'correct': bool(correct), 'valid': bool(valid)}
+            for question_id, correct, valid in zip(question_ids, result['correct'], result['valid'])
+        ]
+    return response
+
+
+@router.post('/sessions')
+async def quiz_session_start(
+        quiz: QuizStart, user: CurrentUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ start a quiz session, answers are submitted one at a time
+    """
+
+    question_ids = _draw_questions(
+        quiz.session_type, quiz.category_id, quiz.difficulty_level, quiz.question_count)
+    if quiz.session_type == SessionType.DAILY_CHALLENGE:
+        if not await daily_challenge.begin(db, user.id):
+            raise HTTPException(status_code=409, detail='Daily challenge already played today')
+
+    session = await quiz_engine.start(
+        db, user.id, quiz.session_type, quiz.category_id, question_ids)
+    # the daily play is only recorded with a started session
+    await db.commit()
+
+    return {
+        'session': session.to_dict(),
+        'questions': await get_questions_metadata(db, question_ids)
+    }
+
+
+async def _own_session(session_id: str, user: CurrentUser) -> LiveSession:
+    try:
+        session = await quiz_engine.get(session_id)
+    except SessionOwnedElsewhere as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not session or session.user_id != user.id:
+        raise HTTPException(status_code=404, detail='Quiz session not found')
+    return session
+
+
+@router.get('/sessions/{session_id}')
+async def quiz_session_detail(
+        session_id: str, user: CurrentUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)) -> dict:
+    """ live state of a session, finished ones are read from the database
+    """
+
+    try:
+        session = await quiz_engine.get(session_id)
+    except SessionOwnedElsewhere:
+        # another worker runs it, the database copy is at most one flush behind
+        session = None
+    if session and session.user_id == user.id:
+        return session.to_dict()
+
+    row = await db.get(QuizSession, session_id)
+    if not row or row.user_id != user.id:
+        raise HTTPException(status_code=404, detail='Quiz session not found')
+
+    return {
+        'id': row.id,
+        'user_id': row.user_id,
+        'session_type': row.session_type.value,
+        'category_id': row.category_id,
+        'status': row.status.value,
+        'question_ids': row.question_ids,
+        'answered_count': row.answered_count,
+        'correct_count': row.correct_count,
+        'score': row.score,
+        'started_at': row.started_at,
+        'last_activity_at': row.last_activity_at,
+        'completed_at': row.completed_at,
+        'remaining_question_ids': []
+    }
+
+
+@router.post('/sessions/{session_id}/answers')
+async def quiz_session_answer(
+        session_id: str, submission: AnswerSubmission,
+        user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ answer one question of a running session
+    """
+
+    session = await _own_session(session_id, user)
+    try:
+        result = await quiz_engine.answer(session, submission.question_id, submission.answer)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QuizSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        **result,
+        'session': session.to_dict()
+    }
+
+
+@router.post('/sessions/{session_id}/abandon')
+async def quiz_session_abandon(session_id: str, user: CurrentUser = Depends(get_current_user)) -> dict:
+    """ give up a running session
+    """
+
+    session = await _own_session(session_id, user)
+    try:
+        await quiz_engine.finish(session, SessionStatus.ABANDONED)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return session.to_dict()
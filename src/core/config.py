@@ -1,4 +1,5 @@
 # Standard library imports
+from typing import Literal
 from pydantic import EmailStr, SecretStr
 
 # Third-party imports
@@ -8,6 +9,11 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # === Database ===
     DATABASE_URL: SecretStr
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    DB_POOL_PRE_PING: bool = True
 
     # === Security ===
     SECRET_KEY: SecretStr
@@ -27,6 +33,85 @@ class Settings(BaseSettings):
     SENDER_PASSWORD: SecretStr
     EMAIL_HOST: SecretStr
     EMAIL_PORT: int
+    EMAIL_USE_SSL: bool = True
+    EMAIL_QUEUE_WORKERS: int = 2
+    EMAIL_QUEUE_SIZE: int = 10000
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BACKOFF: float = 1.0  # seconds, doubled on each retry
+
+    # === Bulk Import ===
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    IMPORT_JOBS_KEPT: int = 1000  # finished import jobs kept for polling
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor batch
+    DEDUP_SIMILARITY_THRESHOLD: float = 0.7  # minhash similarity of near duplicates
+    DEDUP_NEAR_DUPLICATES: bool = False  # default for near=, exact duplicates are always checked
+
+    # === Password Hashing ===
+    BCRYPT_ROUNDS: int = 12
+    HASH_WORKERS: int = 0  # 0 means one worker per cpu core
+    HASH_MAX_PENDING: int = 64
+
+    # === Expired Session Sweeper ===
+    SWEEPER_INTERVAL: int = 300  # seconds, 0 disables the sweeper
+    SWEEPER_BATCH_SIZE: int = 1000
+
+    # === Session Activity ===
+    ACTIVITY_FLUSH_INTERVAL: int = 30  # seconds between batched writes
+
+    # === Session Mode ===
+    # 'database' looks sessions up in user_sessions, 'token' issues signed
+    # tokens that are validated in-process
+    SESSION_MODE: Literal['database', 'token'] = 'database'
+    SESSION_TOKEN_ALGORITHM: str = 'HS256'
+    REVOCATION_BLOOM_BITS: int = 1 << 20
+    REVOCATION_BLOOM_HASHES: int = 7
+    REVOCATION_REFRESH_INTERVAL: int = 15  # seconds before other workers' logouts are enforced
+
+    # === Quiz Sessions ===
+    QUIZ_IDLE_TIMEOUT: int = 1800  # seconds without an answer before a session expires
+    QUIZ_FLUSH_INTERVAL: float = 5.0  # seconds between batched progress writes
+    QUIZ_SESSION_LEASE: int = 60  # seconds a worker's claim on a live session lasts unrenewed
+    QUIZ_GRADING_TOKEN_EXPIRE: int = 3600  # seconds a drawn question set can be graded
+
+    # === Daily Challenge ===
+    DAILY_CHALLENGE_QUESTIONS: int = 10
+    DAILY_ACCURACY_TARGET: float = 0.8  # share of correct answers
+    DAILY_STREAK_TARGET: int = 5
+    DAILY_SCORE_RATIO: float = 0.7  # share of the best possible score
+
+    # === User Statistics ===
+    STATS_FLUSH_INTERVAL: int = 10  # seconds between batched writes
+    STATS_CACHE_USERS: int = 100000  # users whose counters are kept in memory
+
+    # === Difficulty Calibration ===
+    CALIBRATION_CHUNK_SIZE: int = 50000  # answers read per round trip
+    CALIBRATION_MIN_ANSWERS: int = 30  # answers before a question is recalibrated
+    CALIBRATION_EASY_RATE: float = 0.75  # correct share at or above this is easy
+    CALIBRATION_HARD_RATE: float = 0.4  # correct share below this is hard
+    CALIBRATION_MIN_DISCRIMINATION: float = 0.0  # lower is flagged, not recalibrated
+    CATALOG_POLL_INTERVAL: float = 10.0  # seconds between checks for recalibrated questions
+
+    # === Leaderboards ===
+    LEADERBOARD_POLL_INTERVAL: float = 30.0  # seconds between checks for other workers' results
+
+    # === Quiz Rooms ===
+    ROOM_MAX_PLAYERS: int = 100
+    ROOM_SEND_QUEUE_SIZE: int = 32  # queued messages before a slow client is dropped
+    ROOM_START_DELAY: float = 3.0  # seconds between start and the first question
+    ROOM_QUESTION_TIME: float = 15.0  # seconds to answer a question
+    ROOM_REVEAL_TIME: float = 3.0  # seconds the answer is shown
+    ROOM_LOBBY_TIMEOUT: int = 600  # seconds an empty lobby is kept
+
+    # === Question Snapshot ===
+    SNAPSHOT_REBUILD_DELAY: float = 2.0  # seconds, coalesces rebuilds after writes
+
+    # === Model Cache ===
+    MODEL_CACHE_SIZE: int = 50000  # cached category/question reads
+    MODEL_CACHE_TTL: int = 30  # seconds, bounds staleness after a write on another worker
+
+    # === Session Cache ===
+    SESSION_CACHE_SIZE: int = 10000
+    SESSION_CACHE_TTL: int = 30  # seconds, bounds staleness after a logout on another worker
 
     class Config:
         env_file = '.env'
@@ -1,22 +1,58 @@
 # Third-party imports
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
 
 # Local imports
 from src.core.config import settings
+from src.core.pool_metrics import pool_metrics
 
 
-DATABASE_URL = settings.DATABASE_URL.get_secret_value()
-engine = create_engine(DATABASE_URL, echo=settings.DEBUG)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers used for each backend
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """ swap a sync driver url for its async equivalent,
+        e.g. postgresql:// -> postgresql+asyncpg://
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+def pool_options(database_url: str) -> dict:
+    """ pool settings from config, sqlite keeps the dialect default pool
+    """
+    if make_url(database_url).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+DATABASE_URL = to_async_url(settings.DATABASE_URL.get_secret_value())
+engine = create_async_engine(
+    DATABASE_URL, echo=settings.DEBUG, **pool_options(DATABASE_URL))
+pool_metrics.attach(engine.sync_engine)
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False)
 
 
 # Database connection test logic
-def test_connection():
+async def test_connection():
     try:
-        connection = engine.connect()
-        print('Database connection successful!')
-        connection.close()
+        async with engine.connect():
+            print('Database connection successful!')
     except Exception as e:
         print(f'Database connection failed: {e}')
 
@@ -25,11 +61,12 @@ class Base(DeclarativeBase):
     pass
 
 
-def create_tables():
+async def create_tables():
     """Create all database tables"""
     try:
-        # Base.metadata.drop_all(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as connection:
+            # await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
         print("Tables created successfully")
     except Exception as e:
         print(f'Error creating tables: {e}')
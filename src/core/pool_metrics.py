@@ -0,0 +1,86 @@
+# Standard library imports
+import time
+import threading
+
+# Third-party imports
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class PoolMetrics:
+    """ connection pool counters fed by SQLAlchemy pool events
+
+    wait time is recorded by the caller around connection acquisition,
+    hold time is measured between checkout and checkin events.
+    """
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checkout_at'] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop('checkout_at', None)
+        with self._lock:
+            self.checkins += 1
+            if checkout_at is not None:
+                held = time.perf_counter() - checkout_at
+                self.hold_total += held
+                self.hold_max = max(self.hold_max, held)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, engine: Engine) -> dict:
+        pool = engine.pool
+        with self._lock:
+            stats = {
+                'pool_class': type(pool).__name__,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'wait_avg_ms': (self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                'wait_max_ms': self.wait_max * 1000,
+                'hold_avg_ms': (self.hold_total / self.checkins * 1000) if self.checkins else 0.0,
+                'hold_max_ms': self.hold_max * 1000,
+            }
+
+        # only queue based pools report size/overflow
+        for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+            method = getattr(pool, name, None)
+            if method is not None:
+                stats[name] = method()
+        return stats
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,72 @@
+""" schema changes create_all can't apply to an existing database
+
+create_all only creates missing tables, so indexes added to existing
+tables, and the full-text index whose DDL runs only when the questions
+table is created, are created here at startup. every step checks first
+and is safe to run on each start.
+"""
+
+# Standard library imports
+import logging
+
+# Third-party imports
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+# Local imports
+from src.core.database import engine
+from src.models.questions import SQLITE_FTS_DDL, question_fts_index
+
+
+logger = logging.getLogger(__name__)
+
+
+def _has_unique(connection: Connection, table: str, columns: list) -> bool:
+    inspector = inspect(connection)
+    return any(
+        index['unique'] and index['column_names'] == columns
+        for index in inspector.get_indexes(table)
+    ) or any(
+        constraint['column_names'] == columns
+        for constraint in inspector.get_unique_constraints(table)
+    )
+
+
+def unique_category_names(connection: Connection) -> None:
+    """ the category upsert (ON CONFLICT (name)) needs a unique index,
+        refuses to start while duplicate names would prevent it
+    """
+    if _has_unique(connection, 'categories', ['name']):
+        return
+
+    duplicates = connection.execute(text(
+        'SELECT name FROM categories GROUP BY name HAVING count(*) > 1')).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f'Duplicate category names block the unique index on categories.name: {duplicates[:20]}')
+
+    connection.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS uq_categories_name ON categories (name)'))
+    logger.info('Created unique index on categories.name')
+
+
+def question_search_index(connection: Connection) -> None:
+    """ full-text index for question search on databases created
+        before it existed
+    """
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        question_fts_index.create(connection, checkfirst=True)
+    elif dialect == 'sqlite':
+        existed = inspect(connection).has_table('questions_fts')
+        for statement in SQLITE_FTS_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            # index the questions written before the triggers existed
+            connection.execute(text("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')"))
+            logger.info('Created and filled the questions_fts index')
+
+
+async def upgrade_schema() -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(unique_category_names)
+        await connection.run_sync(question_search_index)
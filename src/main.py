@@ -1,22 +1,87 @@
+# Standard library imports
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 # Third-party imports
 from fastapi import FastAPI
 
 # Local imports
 from src.core.config import settings
-from src.core.database import create_tables
+from src.core.database import create_tables, engine
+from src.core.schema_upgrades import upgrade_schema
+from src.utils.hash_password import hashing_service
+from src.services.mail_queue import mail_queue
+from src.services.activity_tracker import activity_tracker
+from src.services.session_sweeper import start_sweeper
+from src.utils.revocation import revocation_list
+from src.utils.upsert import check_upsert_support
+from src.services.question_search import check_search_support
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.services.catalog_watcher import catalog_watcher
+from src.services.quiz_sessions import quiz_engine
+from src.services.leaderboard import leaderboard_watcher, leaderboards
+from src.services.user_stats import user_stats
+from src.services.rooms import room_manager
 from src.api.authentication import router as authentication_router
 from src.api.questions import router as question_router
+from src.api.metrics import router as metrics_router
+from src.api.leaderboard import router as leaderboard_router
+from src.api.rooms import router as rooms_router
 # from src.api.user_data import router as user_data_router
-# from src.api.analytics import router as analytics_router
-# from src.api.start_quiz import router as start_random_quiz_router
+from src.api.analytics import router as analytics_router
+from src.api.start_quiz import router as start_random_quiz_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # refuse to start on a database without upserts or full-text search
+    check_upsert_support(engine.dialect.name)
+    check_search_support(engine.dialect.name)
+    await create_tables()
+    await upgrade_schema()
+    if settings.SESSION_MODE == 'token':
+        await revocation_list.rebuild()
+        revocation_list.start()
+    await question_sampler.build()
+    await question_snapshot.build()
+    await catalog_watcher.start()
+    await leaderboards.rebuild()
+    await leaderboard_watcher.start()
+    quiz_engine.start_background()
+    mail_queue.start()
+    activity_tracker.start()
+    user_stats.start()
+
+    background_tasks = []
+    if settings.SWEEPER_INTERVAL > 0:
+        background_tasks.append(start_sweeper())
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*background_tasks)
 
+    await room_manager.stop()
+    await quiz_engine.stop()
+    await user_stats.stop()
+    await catalog_watcher.stop()
+    await leaderboard_watcher.stop()
+    await question_snapshot.stop()
+    await mail_queue.stop(timeout=10)
+    await activity_tracker.stop()
+    await revocation_list.stop()
+    hashing_service.shutdown()
+    await engine.dispose()
 
-create_tables()
 
 app = FastAPI(
     title='Quiz Game API',
     description='Quiz Game Backend API',
-    version='0.0.1'
+    version='0.0.1',
+    lifespan=lifespan
 )
 
 
@@ -28,9 +93,12 @@ def root():
 # Include routers
 app.include_router(authentication_router, prefix='/api/v1')
 app.include_router(question_router, prefix='/api/v1')
+app.include_router(metrics_router, prefix='/api/v1')
 # app.include_router(user_data_router, prefix='/api/v1')
-# app.include_router(analytics_router, prefix='/api/v1')
-# app.include_router(start_random_quiz_router, prefix='/api/v1')
+app.include_router(analytics_router, prefix='/api/v1')
+app.include_router(start_random_quiz_router, prefix='/api/v1')
+app.include_router(leaderboard_router, prefix='/api/v1')
+app.include_router(rooms_router, prefix='/api/v1')
 
 if __name__ == '__main__':
     import uvicorn
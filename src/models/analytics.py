@@ -0,0 +1,57 @@
+# Standard library imports
+from datetime import date, datetime
+
+# Third-party imports
+from sqlalchemy import (
+    Integer, Boolean, Date, DateTime, String, Float, ForeignKey, func)
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Local imports
+from src.core.database import Base
+
+
+class QuestionHistory(Base):
+    __tablename__ = 'question_history'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('users.id', ondelete='CASCADE'), index=True)
+    session_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey('quiz_sessions.id', ondelete='CASCADE'), index=True)
+    question_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('questions.id', ondelete='CASCADE'), index=True)
+    answer: Mapped[str] = mapped_column(String(1), nullable=False)
+    is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    points: Mapped[float] = mapped_column(Float, default=0.0)
+    answered_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+
+
+class UserStatistics(Base):
+    """ running answer counters per user, category_id 0 holds the
+        totals over all categories
+    """
+    __tablename__ = 'user_statistics'
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    answered: Mapped[int] = mapped_column(Integer, default=0)
+    correct: Mapped[int] = mapped_column(Integer, default=0)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0)
+    best_streak: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+
+
+class DailyChallengePlay(Base):
+    """ one row per user and day, the primary key allows a single
+        daily challenge per day across all workers
+    """
+    __tablename__ = 'daily_challenge_plays'
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
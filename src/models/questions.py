@@ -4,8 +4,8 @@ from datetime import datetime
 
 # Third-party imports
 from sqlalchemy import (
-    Integer, Boolean, DateTime, String, func, Float, ForeignKey,
-    Enum as SQLEnum)
+    DDL, Integer, Index, Boolean, DateTime, String, event, func, Float,
+    ForeignKey, LargeBinary, literal_column, Enum as SQLEnum)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Local imports
@@ -19,7 +19,7 @@ class Category(Base):
     __tablename__ = 'categories'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    name: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False, unique=True, index=True)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     difficulty_multiplier: Mapped[float] = mapped_column(Float, default=1.0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -87,4 +87,67 @@ class Question(Base):
     #             f'category_id={self.category_id}, ' \
     #             f'difficulty={self.difficulty_level})>'
 '''
+
+
+class QuestionFingerprint(Base):
+    __tablename__ = 'question_fingerprints'
+
+    question_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('questions.id', ondelete='CASCADE'), primary_key=True)
+    exact_hash: Mapped[str] = mapped_column(String(40), nullable=False, unique=True, index=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class QuestionLshBand(Base):
+    __tablename__ = 'question_lsh_bands'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    band_key: Mapped[str] = mapped_column(String(18), nullable=False, index=True)
+    question_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('questions.id', ondelete='CASCADE'), index=True)
+
+
+class CatalogVersion(Base):
+    """ counters bumped by the writes behind the servers' in-memory
+        copies (question bank, leaderboards), which poll them to refresh
+    """
+    __tablename__ = 'catalog_versions'
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(), onupdate=func.now())
+
+
+# === Full-text search on question_text ===
+# Postgres: GIN index over the tsvector expression, queries must use the
+# same expression (question_tsvector) for the planner to pick it up.
+FTS_CONFIG = literal_column("'english'")
+question_tsvector = func.to_tsvector(FTS_CONFIG, Question.__table__.c.question_text)
+
+question_fts_index = Index(
+    'ix_questions_question_text_fts', question_tsvector,
+    postgresql_using='gin'
+).ddl_if(dialect='postgresql')
+
+# SQLite: external content FTS5 table kept in sync by triggers
+SQLITE_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+        question_text, content='questions', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+        INSERT INTO questions_fts(rowid, question_text) VALUES (new.id, new.question_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+        INSERT INTO questions_fts(questions_fts, rowid, question_text)
+        VALUES ('delete', old.id, old.question_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE OF question_text ON questions BEGIN
+        INSERT INTO questions_fts(questions_fts, rowid, question_text)
+        VALUES ('delete', old.id, old.question_text);
+        INSERT INTO questions_fts(rowid, question_text) VALUES (new.id, new.question_text);
+    END""",
+)
+for statement in SQLITE_FTS_DDL:
+    event.listen(Question.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
 # /
@@ -0,0 +1,40 @@
+# Standard library imports
+from typing import List, Optional
+from datetime import datetime
+
+# Third-party imports
+from sqlalchemy import (
+    Integer, DateTime, String, Float, ForeignKey, JSON, func,
+    Enum as SQLEnum)
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Local imports
+from src.core.database import Base
+from src.utils.enums import SessionStatus, SessionType
+
+
+class QuizSession(Base):
+    __tablename__ = 'quiz_sessions'
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('users.id', ondelete='CASCADE'), index=True)
+    session_type: Mapped[SessionType] = mapped_column(SQLEnum(SessionType), nullable=False)
+    category_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey('categories.id', ondelete='SET NULL'), nullable=True)
+    status: Mapped[SessionStatus] = mapped_column(
+        SQLEnum(SessionStatus), nullable=False, index=True)
+    question_ids: Mapped[List[int]] = mapped_column(JSON, nullable=False)
+    answered_count: Mapped[int] = mapped_column(Integer, default=0)
+    correct_count: Mapped[int] = mapped_column(Integer, default=0)
+    score: Mapped[float] = mapped_column(Float, default=0.0)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True)
+    # worker holding the session live in memory, and until when
+    owner: Mapped[Optional[str]] = mapped_column(String(32), nullable=True, index=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True)
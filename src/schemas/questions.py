@@ -1,9 +1,11 @@
 # Standard library imports
 # from typing import Optional
+from typing import List
 from pydantic import BaseModel, Field
 
 # Local imports
 from src.models.questions import DifficultyLevel
+from src.utils.enums import AnswerOption
 
 
 class CategoryCreate(BaseModel):
@@ -44,3 +46,14 @@ class QuestionCreate(BaseModel):
 #     option_c: Optional[str] = Field(None, min_length=1, max_length=50, description='Option C')
 #     option_d: Optional[str] = Field(None, min_length=1, max_length=50, description='Option D')
 #     is_active: Optional[bool] = Field(None, description='Whether the question is active')
+
+
+class AnswerSubmission(BaseModel):
+    # question ids are 32-bit integer columns, graded as int32 arrays
+    question_id: int = Field(..., gt=0, le=2**31 - 1, description='Question ID')
+    answer: AnswerOption = Field(..., description='Chosen option (A-D)')
+
+
+class AnswerBatch(BaseModel):
+    token: str = Field(..., description='grading_token returned with the questions')
+    answers: List[AnswerSubmission] = Field(..., min_length=1, description='Answers to grade')
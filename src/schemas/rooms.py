@@ -0,0 +1,14 @@
+# Standard library imports
+from typing import Optional
+from pydantic import BaseModel, Field
+
+# Local imports
+from src.utils.enums import DifficultyLevel, RoomType
+
+
+class RoomCreate(BaseModel):
+    room_type: RoomType = Field(default=RoomType.USER_CREATED, description='Public or private room')
+    category_id: Optional[int] = Field(None, description='Only draw questions of this category')
+    difficulty_level: Optional[DifficultyLevel] = Field(None, description='Only draw this difficulty')
+    question_count: int = Field(default=10, ge=1, le=50, description='Number of questions')
+    max_players: int = Field(default=20, ge=2, le=500, description='Players allowed to join')
@@ -0,0 +1,13 @@
+# Standard library imports
+from typing import Optional
+from pydantic import BaseModel, Field
+
+# Local imports
+from src.utils.enums import DifficultyLevel, SessionType
+
+
+class QuizStart(BaseModel):
+    session_type: SessionType = Field(default=SessionType.RANDOM, description='Quiz type')
+    category_id: Optional[int] = Field(None, description='Required for category quiz')
+    difficulty_level: Optional[DifficultyLevel] = Field(None, description='Only draw this difficulty')
+    question_count: int = Field(default=10, ge=1, le=100, description='Number of questions')
@@ -0,0 +1,89 @@
+# Standard library imports
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict
+
+# Third-party imports
+from sqlalchemy import bindparam, update
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.authentication import UserSession
+
+
+logger = logging.getLogger(__name__)
+
+user_sessions = UserSession.__table__
+
+# one UPDATE statement, executed once per batch with many parameter sets
+_touch_statement = (
+    update(user_sessions)
+    .where(user_sessions.c.session_token == bindparam('b_token'))
+    .values(last_activity_at=bindparam('b_seen_at'))
+)
+
+
+class ActivityTracker:
+    """ coalesces session activity in memory and writes it in batches
+
+    a session touched many times between flushes costs one row update.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.flushed = 0
+        self._pending: Dict[str, datetime] = {}
+        self._task = None
+
+    def touch(self, session_token: str) -> None:
+        self._pending[session_token] = datetime.now(timezone.utc)
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        # swap the buffer first so touches during the flush are kept
+        pending, self._pending = self._pending, {}
+        rows = [
+            {'b_token': token, 'b_seen_at': seen_at}
+            for token, seen_at in pending.items()
+        ]
+        try:
+            async with SessionLocal() as db:
+                await db.execute(_touch_statement, rows)
+                await db.commit()
+        except Exception:
+            # merge back for the next attempt, newer touches win
+            for token, seen_at in pending.items():
+                if self._pending.get(token, seen_at) <= seen_at:
+                    self._pending[token] = seen_at
+            raise
+
+        self.flushed += len(rows)
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception('Session activity flush failed')
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {'pending': len(self._pending), 'flushed': self.flushed}
+
+
+activity_tracker = ActivityTracker(interval=settings.ACTIVITY_FLUSH_INTERVAL)
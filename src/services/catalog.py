@@ -0,0 +1,75 @@
+# Standard library imports
+from typing import Iterable, List, NamedTuple, Optional
+
+# Third-party imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.models.questions import Category, Question
+from src.services.question_snapshot import question_snapshot
+from src.utils.model_cache import model_cache
+
+
+class CategoryInfo(NamedTuple):
+    id: int
+    name: str
+    description: str
+    difficulty_multiplier: float
+    is_active: bool
+
+
+async def get_active_category(db: AsyncSession, category_id: int) -> Optional[CategoryInfo]:
+    """ cached lookup of an active category, None if missing or inactive
+    """
+
+    async def load() -> Optional[CategoryInfo]:
+        category = await db.scalar(
+            select(Category).filter(Category.id == category_id, Category.is_active))
+        if not category:
+            return None
+        return CategoryInfo(
+            category.id, category.name, category.description,
+            category.difficulty_multiplier, category.is_active)
+
+    return await model_cache.get_or_load('categories', ('active', category_id), load)
+
+
+def question_metadata(question: Question) -> dict:
+    """ public fields of a question, without the answer
+    """
+    return {
+        'id': question.id,
+        'category_id': question.category_id,
+        'question_text': question.question_text,
+        'difficulty_level': question.difficulty_level.value,
+        'option_a': question.option_a,
+        'option_b': question.option_b,
+        'option_c': question.option_c,
+        'option_d': question.option_d,
+    }
+
+
+async def get_questions_metadata(db: AsyncSession, question_ids: Iterable[int]) -> List[dict]:
+    """ question metadata in the order of `question_ids`, served from the
+        question bank snapshot, then the model cache; only what neither
+        has (e.g. inserted since the last snapshot) is loaded, in one query
+    """
+    question_ids = list(question_ids)
+    version = model_cache.version('questions')
+    snapshot = question_snapshot.current
+
+    found = {}
+    for question_id in question_ids:
+        metadata = snapshot.get(question_id) or model_cache.get('questions', ('metadata', question_id))
+        if metadata is not None:
+            found[question_id] = metadata
+
+    missing = [question_id for question_id in question_ids if question_id not in found]
+    if missing:
+        questions = await db.scalars(select(Question).filter(Question.id.in_(missing)))
+        for question in questions:
+            found[question.id] = question_metadata(question)
+            model_cache.set('questions', ('metadata', question.id), found[question.id], version)
+
+    return [found[question_id] for question_id in question_ids if question_id in found]
@@ -0,0 +1,108 @@
+# Standard library imports
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+# Third-party imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.questions import CatalogVersion
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.utils.model_cache import model_cache
+from src.utils.upsert import dialect_insert
+
+
+logger = logging.getLogger(__name__)
+
+# the catalog_versions row covering questions and categories
+CATALOG = 'questions'
+
+
+async def bump_catalog_version(db: AsyncSession, name: str = CATALOG) -> int:
+    """ mark `name` as changed for every running server, part of the
+        caller's transaction; returns the new version
+    """
+    statement = dialect_insert(db, CatalogVersion).values(name=name, version=1)
+    return await db.scalar(statement.on_conflict_do_update(
+        index_elements=[CatalogVersion.name],
+        set_={'version': CatalogVersion.version + 1}
+    ).returning(CatalogVersion.version))
+
+
+class CatalogWatcher:
+    """ picks up changes to in-memory data written by other processes
+
+    every write behind the data bumps the version `name` in its
+    transaction. every `interval` seconds the watcher reads it and, when
+    it moved, calls `reload`, so a burst of writes on other workers costs
+    one reload per interval. the worker making a write updates its own
+    copies directly and reports the version with `applied`, so it
+    doesn't reload for its own change.
+    """
+
+    def __init__(self, name: str, interval: float, reload: Callable[[], Awaitable]):
+        self.name = name
+        self.interval = interval
+        self.reload = reload
+        self.version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def read_version(self) -> int:
+        async with SessionLocal() as db:
+            return await db.scalar(
+                select(CatalogVersion.version).filter(CatalogVersion.name == self.name)) or 0
+
+    async def check(self) -> bool:
+        """ reload when the version moved, returns whether it did
+        """
+        version = await self.read_version()
+        if version == self.version:
+            return False
+
+        await self.reload()
+        # only now, a failed reload is retried on the next check
+        self.version = version
+        return True
+
+    def applied(self, version: int) -> None:
+        """ this worker made the change that produced `version`; skip it
+            unless another worker's change came in between
+        """
+        if self.version is not None and version == self.version + 1:
+            self.version = version
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception('%s version check failed', self.name)
+
+    async def start(self) -> None:
+        # the caches were just built, only later changes count
+        self.version = await self.read_version()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+async def reload_question_bank() -> None:
+    """ reload the sampler, rebuild the snapshot and invalidate cached
+        reads of questions and categories
+    """
+    await question_sampler.build()
+    await question_snapshot.build()
+    model_cache.bump('categories', 'questions')
+
+
+catalog_watcher = CatalogWatcher(CATALOG, settings.CATALOG_POLL_INTERVAL, reload_question_bank)
@@ -0,0 +1,68 @@
+# Standard library imports
+from typing import Iterable, List
+
+# Third-party imports
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.models.questions import Category
+from src.schemas.questions import CategoryCreate
+from src.utils.iterables import chunked
+from src.utils.upsert import dialect_insert
+
+
+async def upsert_categories(
+        db: AsyncSession, categories: Iterable[CategoryCreate],
+        chunk_size: int = settings.BULK_INSERT_CHUNK_SIZE) -> List[dict]:
+    """ insert or update categories by name, one statement per chunk
+
+    each returned row has `created` set. postgres reports it from the row
+    itself (xmax is 0 only for rows this statement inserted); elsewhere
+    the names that already exist are selected first in the same
+    transaction.
+    """
+    postgres = db.bind.dialect.name == 'postgresql'
+    upserted = []
+    for chunk in chunked(categories, chunk_size):
+        existing = set()
+        if not postgres:
+            existing = set(await db.scalars(select(Category.name).filter(
+                Category.name.in_([category_data.name for category_data in chunk]))))
+
+        statement = dialect_insert(db, Category).values([
+            {
+                'name': category_data.name,
+                'description': category_data.description,
+                'difficulty_multiplier': category_data.difficulty_multiplier,
+                'is_active': category_data.is_active,
+            } for category_data in chunk
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[Category.name],
+            set_={
+                'description': statement.excluded.description,
+                'difficulty_multiplier': statement.excluded.difficulty_multiplier,
+                'is_active': statement.excluded.is_active,
+                'updated_at': func.now(),
+            }
+        ).returning(
+            Category.id, Category.name, Category.description,
+            Category.difficulty_multiplier, Category.is_active,
+            Category.created_at,
+            literal_column('(xmax = 0)' if postgres else 'NULL').label('inserted'))
+
+        result = await db.execute(statement)
+        upserted.extend(
+            {
+                'id': row.id,
+                'name': row.name,
+                'description': row.description,
+                'difficulty_multiplier': row.difficulty_multiplier,
+                'is_active': row.is_active,
+                'created_at': row.created_at,
+                'created': bool(row.inserted) if postgres else row.name not in existing,
+            } for row in result
+        )
+    return upserted
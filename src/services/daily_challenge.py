@@ -0,0 +1,188 @@
+# Standard library imports
+import math
+import random
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Set
+
+# Third-party imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.analytics import DailyChallengePlay
+from src.services.question_snapshot import question_snapshot
+from src.utils.enums import ChallengeType
+from src.utils.upsert import dialect_insert
+
+
+class DailySet:
+    """ the day's questions and challenge targets
+    """
+
+    __slots__ = ('day', 'question_ids', 'targets')
+
+    def __init__(self, day: date, question_ids: List[int], targets: Dict[ChallengeType, float]):
+        self.day = day
+        self.question_ids = question_ids
+        self.targets = targets
+
+    def to_dict(self) -> dict:
+        return {
+            'day': self.day.isoformat(),
+            'question_ids': self.question_ids,
+            'challenges': {
+                challenge.value: target for challenge, target in self.targets.items()
+            },
+        }
+
+
+class ChallengeProgress:
+    """ running counters of one user for the current day, each answer
+        updates them and checks every challenge in O(1)
+    """
+
+    __slots__ = ('answered', 'correct', 'score', 'streak', 'best_streak', 'completed')
+
+    def __init__(self):
+        self.answered = 0
+        self.correct = 0
+        self.score = 0.0
+        self.streak = 0
+        self.best_streak = 0
+        self.completed: Set[ChallengeType] = set()
+
+    def to_dict(self) -> dict:
+        return {
+            'answered': self.answered,
+            'correct': self.correct,
+            'score': self.score,
+            'streak': self.streak,
+            'best_streak': self.best_streak,
+            'completed': sorted(challenge.value for challenge in self.completed),
+        }
+
+
+class DailyChallenge:
+    """ date-seeded daily question set, drawn once and kept until the
+        UTC date rolls over
+
+    the draw is seeded with the date and picks positions in the sorted
+    ids of the question snapshot, so processes holding the same question
+    bank draw the same set. a day without questions is not kept, the
+    next call draws again. who played today is stored in the database;
+    the running progress lives with the worker holding the session and
+    is reset at rollover.
+    """
+
+    def __init__(self, question_count: int, accuracy_target: float,
+                 streak_target: int, score_ratio: float):
+        self.question_count = question_count
+        self.accuracy_target = accuracy_target
+        self.streak_target = streak_target
+        self.score_ratio = score_ratio
+        self._set: Optional[DailySet] = None
+        self._progress: Dict[int, ChallengeProgress] = {}
+        self._progress_day: Optional[date] = None
+
+    @staticmethod
+    def today() -> date:
+        return datetime.now(timezone.utc).date()
+
+    def current(self) -> DailySet:
+        day = self.today()
+        if self._progress_day != day:
+            self._progress_day = day
+            self._progress = {}
+        if self._set is None or self._set.day != day:
+            daily = self._generate(day)
+            if not daily.question_ids:
+                return daily
+            self._set = daily
+        return self._set
+
+    def _generate(self, day: date) -> DailySet:
+        snapshot = question_snapshot.current
+        rng = random.Random(f'daily-challenge:{day.isoformat()}')
+        positions = rng.sample(range(len(snapshot)), min(self.question_count, len(snapshot)))
+        question_ids = sorted(snapshot.ids[position] for position in positions)
+
+        # best possible score, from the category multiplier of each question
+        max_score = 0.0
+        for question_id in question_ids:
+            position = snapshot.position(question_id)
+            max_score += snapshot.category_multipliers.get(
+                snapshot.category_ids[position], 1.0) if position is not None else 1.0
+
+        count = len(question_ids)
+        return DailySet(day, question_ids, {
+            ChallengeType.QUESTIONS_ANSWERED: count,
+            ChallengeType.SCORE_TARGET: round(max_score * self.score_ratio, 2),
+            ChallengeType.ACCURACY_TARGET: self.accuracy_target,
+            ChallengeType.STREAK_TARGET: min(self.streak_target, count),
+            ChallengeType.PERFECT_QUIZ: count,
+        })
+
+    async def has_started(self, user_id: int) -> bool:
+        day = self.current().day
+        async with SessionLocal() as db:
+            played = await db.scalar(select(DailyChallengePlay.user_id).filter(
+                DailyChallengePlay.user_id == user_id, DailyChallengePlay.day == day))
+        return played is not None
+
+    async def begin(self, db: AsyncSession, user_id: int) -> bool:
+        """ record today's play in the caller's transaction, False if the
+            user already played today; the caller commits it once the
+            session started, so a failed start doesn't use up the day
+        """
+        statement = dialect_insert(db, DailyChallengePlay).values(
+            user_id=user_id, day=self.current().day
+        ).on_conflict_do_nothing().returning(DailyChallengePlay.user_id)
+        return await db.scalar(statement) is not None
+
+    def progress(self, user_id: int) -> Optional[ChallengeProgress]:
+        self.current()
+        return self._progress.get(user_id)
+
+    def record(self, user_id: int, day: date, is_correct: bool, points: float) -> List[ChallengeType]:
+        """ count one answer, returns the challenges it completed;
+            answers to a set from an earlier day are ignored
+        """
+        daily = self.current()
+        if day != daily.day:
+            return []
+
+        progress = self._progress.setdefault(user_id, ChallengeProgress())
+        progress.answered += 1
+        progress.correct += is_correct
+        progress.score += points
+        progress.streak = progress.streak + 1 if is_correct else 0
+        progress.best_streak = max(progress.best_streak, progress.streak)
+
+        targets = daily.targets
+        total = targets[ChallengeType.QUESTIONS_ANSWERED]
+        reached = {
+            ChallengeType.QUESTIONS_ANSWERED: progress.answered >= total,
+            ChallengeType.SCORE_TARGET: progress.score >= targets[ChallengeType.SCORE_TARGET],
+            ChallengeType.STREAK_TARGET: progress.best_streak >= targets[ChallengeType.STREAK_TARGET],
+            # accuracy and perfect are only decided once the set is done
+            ChallengeType.ACCURACY_TARGET: progress.answered >= total
+            and progress.correct >= math.ceil(total * targets[ChallengeType.ACCURACY_TARGET]),
+            ChallengeType.PERFECT_QUIZ: progress.answered >= total and progress.correct == progress.answered,
+        }
+
+        completed = [
+            challenge for challenge, done in reached.items()
+            if done and challenge not in progress.completed
+        ]
+        progress.completed.update(completed)
+        return completed
+
+
+daily_challenge = DailyChallenge(
+    question_count=settings.DAILY_CHALLENGE_QUESTIONS,
+    accuracy_target=settings.DAILY_ACCURACY_TARGET,
+    streak_target=settings.DAILY_STREAK_TARGET,
+    score_ratio=settings.DAILY_SCORE_RATIO,
+)
@@ -0,0 +1,282 @@
+""" recalibrate question difficulty from recorded answers
+
+    python -m src.services.difficulty_calibration [--dry-run]
+
+question_history is streamed in chunks and folded into per-question
+counters with np.bincount, so memory depends on the number of questions
+and users, not on the number of answers. a run that changes anything
+bumps the catalog version, running servers notice within
+CATALOG_POLL_INTERVAL seconds and reload their question caches.
+"""
+
+# Standard library imports
+import asyncio
+import argparse
+import time
+from typing import Dict, Optional
+
+# Third-party imports
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal, engine
+from src.models.analytics import QuestionHistory, UserStatistics
+from src.models.questions import Category, Question
+from src.services.catalog_watcher import bump_catalog_version
+from src.services.question_snapshot import DIFFICULTY_CODES, DIFFICULTY_LEVELS
+from src.services.user_stats import OVERALL
+from src.utils.enums import DifficultyLevel
+from src.utils.iterables import chunked
+
+
+# ids per UPDATE ... WHERE id IN (...)
+UPDATE_BATCH_SIZE = 5000
+
+# relative change below which a category multiplier is left as it is,
+# so rounding of the stored values doesn't cause writes on every run
+MULTIPLIER_TOLERANCE = 0.005
+
+categories_table = Category.__table__
+
+_multiplier_statement = (
+    update(categories_table)
+    .where(categories_table.c.id == bindparam('b_id'))
+    .values(difficulty_multiplier=bindparam('b_multiplier'))
+)
+
+
+class CalibrationAccumulator:
+    """ per-question sums over streamed answers
+
+    `ability` holds each user's overall accuracy indexed by user id (NaN
+    when unknown). discrimination is the point-biserial correlation
+    between answering a question correctly and the user's ability,
+    computed from running sums: only answers of users with a known
+    ability take part in it.
+    """
+
+    def __init__(self, question_slots: int, ability: np.ndarray):
+        self.ability = ability
+        self.answered = np.zeros(question_slots, dtype=np.int64)
+        self.correct = np.zeros(question_slots, dtype=np.int64)
+        self.rated = np.zeros(question_slots, dtype=np.int64)
+        self.rated_correct = np.zeros(question_slots, dtype=np.float64)
+        self.ability_sum = np.zeros(question_slots, dtype=np.float64)
+        self.ability_squares = np.zeros(question_slots, dtype=np.float64)
+        self.ability_correct = np.zeros(question_slots, dtype=np.float64)
+
+    def add(self, question_ids: np.ndarray, user_ids: np.ndarray, correct: np.ndarray) -> None:
+        slots = len(self.answered)
+        keep = (question_ids >= 0) & (question_ids < slots)
+        question_ids, user_ids, correct = question_ids[keep], user_ids[keep], correct[keep]
+        correct = correct.astype(np.float64)
+
+        self.answered += np.bincount(question_ids, minlength=slots)
+        self.correct += np.bincount(question_ids, weights=correct, minlength=slots).astype(np.int64)
+
+        ability = np.full(len(user_ids), np.nan)
+        known = user_ids < len(self.ability)
+        ability[known] = self.ability[user_ids[known]]
+        rated = ~np.isnan(ability)
+        question_ids, ability, correct = question_ids[rated], ability[rated], correct[rated]
+
+        self.rated += np.bincount(question_ids, minlength=slots)
+        self.rated_correct += np.bincount(question_ids, weights=correct, minlength=slots)
+        self.ability_sum += np.bincount(question_ids, weights=ability, minlength=slots)
+        self.ability_squares += np.bincount(question_ids, weights=ability * ability, minlength=slots)
+        self.ability_correct += np.bincount(question_ids, weights=ability * correct, minlength=slots)
+
+    def rates(self) -> np.ndarray:
+        """ share of correct answers per question, NaN when unanswered
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.answered > 0, self.correct / self.answered, np.nan)
+
+    def discrimination(self) -> np.ndarray:
+        """ point-biserial correlation per question, NaN when undefined
+        """
+        n, k = self.rated.astype(np.float64), self.rated_correct
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = k / n
+            mean_correct = self.ability_correct / k
+            mean_wrong = (self.ability_sum - self.ability_correct) / (n - k)
+            variance = self.ability_squares / n - (self.ability_sum / n) ** 2
+            result = (mean_correct - mean_wrong) / np.sqrt(variance) * np.sqrt(p * (1 - p))
+        # every answer right (or wrong) or every user equally able
+        result[(k == 0) | (k == n) | ~(variance > 1e-12)] = np.nan
+        return result
+
+
+def difficulty_codes(rates: np.ndarray, easy_rate: float, hard_rate: float) -> np.ndarray:
+    """ DIFFICULTY_CODES of each correctness rate
+    """
+    return np.select(
+        [rates >= easy_rate, rates < hard_rate],
+        [DIFFICULTY_CODES[DifficultyLevel.EASY], DIFFICULTY_CODES[DifficultyLevel.HARD]],
+        DIFFICULTY_CODES[DifficultyLevel.MEDIUM],
+    ).astype(np.uint8)
+
+
+def category_multipliers(
+        category_ids: np.ndarray, correct: np.ndarray, answered: np.ndarray,
+        current: Dict[int, float]) -> Dict[int, float]:
+    """ overall correctness rate over each category's rate, normalised
+        so the answer-weighted mean multiplier stays what it is today
+
+    the ratios alone average above 1 whenever the categories' rates
+    differ, so without the normalisation every run would raise all
+    multipliers. the result depends on `current` only through that mean,
+    a second run over the same answers gives the same values.
+    """
+    if not len(category_ids):
+        return {}
+
+    overall_rate = correct.sum() / answered.sum()
+    groups, inverse = np.unique(category_ids, return_inverse=True)
+    group_correct = np.bincount(inverse, weights=correct)
+    group_answered = np.bincount(inverse, weights=answered)
+    scale = np.average(
+        [current.get(int(category), 1.0) for category in groups], weights=group_answered)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = overall_rate / (group_correct / group_answered)
+    # a category nobody answered right counts as the hardest
+    ratios = np.clip(np.nan_to_num(ratios, posinf=10.0), 0.1, 10.0)
+    values = np.clip(scale * ratios / np.average(ratios, weights=group_answered), 0.1, 10.0)
+    return {int(category): round(float(value), 3) for category, value in zip(groups, values)}
+
+
+def changed_multipliers(new: Dict[int, float], current: Dict[int, float]) -> Dict[int, float]:
+    """ the multipliers of `new` that differ from `current` by more than
+        MULTIPLIER_TOLERANCE
+    """
+    return {
+        category_id: value for category_id, value in new.items()
+        if abs(value - current.get(category_id, 1.0)) > MULTIPLIER_TOLERANCE * current.get(category_id, 1.0)
+    }
+
+
+async def load_abilities(db: AsyncSession, chunk_size: int) -> np.ndarray:
+    """ overall accuracy of every user with statistics, indexed by user id
+    """
+    max_user = await db.scalar(select(func.max(UserStatistics.user_id))) or 0
+    ability = np.full(max_user + 1, np.nan)
+
+    result = await db.stream(select(
+        UserStatistics.user_id, UserStatistics.answered, UserStatistics.correct
+    ).filter(
+        UserStatistics.category_id == OVERALL, UserStatistics.answered > 0
+    ).execution_options(yield_per=chunk_size))
+    async for rows in result.partitions(chunk_size):
+        user_ids = np.fromiter((row.user_id for row in rows), dtype=np.int64, count=len(rows))
+        answered = np.fromiter((row.answered for row in rows), dtype=np.float64, count=len(rows))
+        correct = np.fromiter((row.correct for row in rows), dtype=np.float64, count=len(rows))
+        ability[user_ids] = correct / answered
+    return ability
+
+
+async def calibrate(
+        chunk_size: int = settings.CALIBRATION_CHUNK_SIZE,
+        min_answers: int = settings.CALIBRATION_MIN_ANSWERS,
+        dry_run: bool = False) -> dict:
+    """ recompute difficulty levels and category multipliers, returns a
+        summary of what changed
+    """
+    started = time.perf_counter()
+    async with SessionLocal() as db:
+        # current level and category of every question, as arrays by id
+        max_question = await db.scalar(select(func.max(Question.id))) or 0
+        levels = np.zeros(max_question + 1, dtype=np.uint8)
+        categories = np.full(max_question + 1, -1, dtype=np.int64)
+        result = await db.stream(select(
+            Question.id, Question.category_id, Question.difficulty_level
+        ).execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+            categories[ids] = [row.category_id for row in rows]
+            levels[ids] = [DIFFICULTY_CODES[row.difficulty_level] for row in rows]
+
+        accumulator = CalibrationAccumulator(max_question + 1, await load_abilities(db, chunk_size))
+        answers = 0
+        result = await db.stream(select(
+            QuestionHistory.question_id, QuestionHistory.user_id, QuestionHistory.is_correct
+        ).execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            accumulator.add(
+                np.fromiter((row.question_id for row in rows), dtype=np.int64, count=len(rows)),
+                np.fromiter((row.user_id for row in rows), dtype=np.int64, count=len(rows)),
+                np.fromiter((row.is_correct for row in rows), dtype=np.bool_, count=len(rows)))
+            answers += len(rows)
+
+        rates = accumulator.rates()
+        discrimination = accumulator.discrimination()
+
+        # questions with enough answers whose outcomes track ability;
+        # negative discrimination usually means a wrong answer key
+        calibrated = (
+            (accumulator.answered > 0) & (accumulator.answered >= min_answers) & (categories >= 0))
+        flagged = calibrated & (discrimination < settings.CALIBRATION_MIN_DISCRIMINATION)
+        calibrated &= ~flagged
+
+        new_levels = difficulty_codes(rates, settings.CALIBRATION_EASY_RATE, settings.CALIBRATION_HARD_RATE)
+        changed = calibrated & (new_levels != levels)
+        moves: Dict[DifficultyLevel, list] = {
+            level: np.flatnonzero(changed & (new_levels == code)).tolist()
+            for code, level in enumerate(DIFFICULTY_LEVELS)
+        }
+
+        current = dict((await db.execute(
+            select(Category.id, Category.difficulty_multiplier))).all())
+        multipliers = changed_multipliers(category_multipliers(
+            categories[calibrated], accumulator.correct[calibrated],
+            accumulator.answered[calibrated], current), current)
+
+        if not dry_run:
+            for level, ids in moves.items():
+                for batch in chunked(ids, UPDATE_BATCH_SIZE):
+                    await db.execute(
+                        update(Question).where(Question.id.in_(batch)).values(difficulty_level=level))
+            if multipliers:
+                await db.execute(_multiplier_statement, [
+                    {'b_id': category_id, 'b_multiplier': multiplier}
+                    for category_id, multiplier in multipliers.items()
+                ])
+            if changed.any() or multipliers:
+                await bump_catalog_version(db)
+            await db.commit()
+
+    return {
+        'answers': answers,
+        'questions_calibrated': int(calibrated.sum()),
+        'questions_flagged': np.flatnonzero(flagged).tolist(),
+        'levels_changed': {level.value: len(ids) for level, ids in moves.items()},
+        'category_multipliers': multipliers,
+        'dry_run': dry_run,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Recalibrate question difficulty from answers')
+    parser.add_argument('--dry-run', action='store_true', help='report changes without writing them')
+    parser.add_argument('--chunk-size', type=int, default=settings.CALIBRATION_CHUNK_SIZE)
+    parser.add_argument('--min-answers', type=int, default=settings.CALIBRATION_MIN_ANSWERS)
+    args = parser.parse_args(argv)
+
+    async def run() -> dict:
+        try:
+            return await calibrate(args.chunk_size, args.min_answers, args.dry_run)
+        finally:
+            await engine.dispose()
+
+    summary = asyncio.run(run())
+    flagged = summary.pop('questions_flagged')
+    for key, value in summary.items():
+        print(f'{key}: {value}')
+    print(f'questions_flagged: {len(flagged)} {flagged[:50]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# Standard library imports
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from src.services.question_snapshot import NO_ANSWER, QuestionBankSnapshot
+from src.utils.enums import AnswerOption
+
+
+ANSWER_CODES = {option: code for code, option in enumerate(AnswerOption)}
+
+
+class AnswerKey:
+    """ numpy arrays over a snapshot: sorted ids, correct option codes and
+        the category multiplier of every question
+
+    the arrays have spare capacity at the end, so a key for a snapshot
+    extended from this one only fills in the appended rows and shares
+    the arrays, growing them geometrically when they are full.
+    """
+
+    __slots__ = ('ids', 'answers', 'multipliers', '_columns', '_buffers', '_count')
+
+    def __init__(self, snapshot: QuestionBankSnapshot):
+        count = len(snapshot)
+        self._buffers = (
+            np.frombuffer(snapshot.ids, dtype=np.int32, count=count).copy(),
+            np.frombuffer(snapshot.answers, dtype=np.uint8, count=count).copy(),
+            # expand the per category multiplier to one value per question
+            _multipliers(snapshot, 0, count),
+        )
+        self._set(snapshot, count)
+
+    def _set(self, snapshot: QuestionBankSnapshot, count: int) -> None:
+        # the snapshot's ids column identifies the chain of extended snapshots
+        self._columns = (snapshot.ids, snapshot.category_multipliers)
+        self._count = count
+        self.ids, self.answers, self.multipliers = (buffer[:count] for buffer in self._buffers)
+
+    def extended(self, snapshot: QuestionBankSnapshot) -> 'AnswerKey':
+        """ key of `snapshot`, built from this one when `snapshot` only
+            appended rows to this key's snapshot
+        """
+        count = len(snapshot)
+        ids, multipliers = self._columns
+        if (ids is not snapshot.ids or multipliers is not snapshot.category_multipliers
+                or count < self._count):
+            return AnswerKey(snapshot)
+
+        key = AnswerKey.__new__(AnswerKey)
+        key._buffers = self._buffers
+        if count > len(self._buffers[0]):
+            key._buffers = tuple(
+                np.resize(buffer, max(count, 2 * len(buffer))) for buffer in self._buffers)
+        start = self._count
+        ids, answers, multipliers = key._buffers
+        ids[start:count] = np.frombuffer(snapshot.ids, dtype=np.int32, count=count)[start:]
+        answers[start:count] = np.frombuffer(snapshot.answers, dtype=np.uint8, count=count)[start:]
+        multipliers[start:count] = _multipliers(snapshot, start, count)
+        key._set(snapshot, count)
+        return key
+
+    def grade(self, question_ids: np.ndarray, answers: np.ndarray) -> dict:
+        """ grade parallel arrays of question ids and answer codes in one pass
+
+        unknown questions and questions without a gradable answer are
+        not counted as answered and score nothing. a question repeated in
+        the batch only counts with its first answer.
+        """
+        if not len(self.ids):
+            correct = valid = np.zeros(len(question_ids), dtype=bool)
+            points = np.zeros(len(question_ids), dtype=np.float64)
+        else:
+            first = np.zeros(len(question_ids), dtype=bool)
+            first[np.unique(question_ids, return_index=True)[1]] = True
+            positions = np.minimum(np.searchsorted(self.ids, question_ids), len(self.ids) - 1)
+            expected = np.where(self.ids[positions] == question_ids, self.answers[positions], NO_ANSWER)
+            valid = first & (expected != NO_ANSWER)
+            correct = valid & (expected == answers)
+            points = np.where(correct, self.multipliers[positions], 0.0)
+
+        return {
+            'correct': correct,
+            'valid': valid,
+            'points': points,
+            'score': float(points.sum()),
+            'answered': int(valid.sum()),
+            'correct_count': int(correct.sum()),
+        }
+
+
+def _multipliers(snapshot: QuestionBankSnapshot, start: int, stop: int) -> np.ndarray:
+    category_ids = np.frombuffer(snapshot.category_ids, dtype=np.int32, count=stop)[start:]
+    categories, inverse = np.unique(category_ids, return_inverse=True)
+    per_category = np.array(
+        [snapshot.category_multipliers.get(int(c), 1.0) for c in categories],
+        dtype=np.float64)
+    return per_category[inverse]
+
+
+_current: Optional[Tuple[QuestionBankSnapshot, AnswerKey]] = None
+
+
+def answer_key(snapshot: QuestionBankSnapshot) -> AnswerKey:
+    """ answer key of `snapshot`, made once per snapshot swap; appends
+        only add their rows to the previous key
+    """
+    global _current
+    if _current is None:
+        _current = (snapshot, AnswerKey(snapshot))
+    elif _current[0] is not snapshot:
+        _current = (snapshot, _current[1].extended(snapshot))
+    return _current[1]
+
+
+def encode_answers(answers: Sequence[AnswerOption]) -> np.ndarray:
+    return np.fromiter(
+        (ANSWER_CODES[answer] for answer in answers), dtype=np.uint8, count=len(answers))
+
+
+class RedeemedTokens:
+    """ ids of the grading tokens this worker already graded, each set
+        of served questions is graded once; kept until the token expires
+    """
+
+    def __init__(self):
+        self._expires: Dict[str, datetime] = {}
+
+    def redeem(self, token_id: str, expires_at: datetime) -> bool:
+        """ False when the token was graded before
+        """
+        now = datetime.now(timezone.utc)
+        # tokens share one lifetime, so the oldest entries expire first
+        while self._expires:
+            oldest = next(iter(self._expires))
+            if self._expires[oldest] > now:
+                break
+            del self._expires[oldest]
+
+        if token_id in self._expires:
+            return False
+        self._expires[token_id] = expires_at
+        return True
+
+
+redeemed_tokens = RedeemedTokens()
@@ -0,0 +1,193 @@
+# Standard library imports
+import asyncio
+import csv
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+# Third-party imports
+from pydantic import ValidationError
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.schemas.questions import QuestionCreate
+from src.services.question_ingest import ingest_question_rows, question_row
+from src.utils.enums import DedupMode
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.services.catalog_watcher import bump_catalog_version, catalog_watcher
+from src.utils.model_cache import model_cache
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+# per-row errors kept per job, the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass
+class ImportJob:
+    id: str
+    category_id: int
+    format: str
+    dedup: DedupMode = DedupMode.FLAG
+    near: bool = False
+    status: str = 'pending'
+    rows_processed: int = 0
+    rows_inserted: int = 0
+    rows_failed: int = 0
+    rows_duplicate: int = 0
+    errors: List[dict] = field(default_factory=list)
+    duplicates: List[dict] = field(default_factory=list)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def record_error(self, line: int, error: str) -> None:
+        self.rows_failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': error})
+
+    def record_duplicate(self, line: int, duplicate: dict) -> None:
+        self.rows_duplicate += 1
+        if self.dedup == DedupMode.REJECT:
+            self.record_error(line, f"Duplicate ({duplicate['match']}) of an existing question")
+        elif len(self.duplicates) < MAX_REPORTED_ERRORS:
+            self.duplicates.append({
+                'line': line,
+                'duplicate_of_question_id': duplicate.get('question_id'),
+                'match': duplicate['match'],
+                'similarity': duplicate['similarity'],
+            })
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'category_id': self.category_id,
+            'format': self.format,
+            'dedup': self.dedup.value,
+            'near': self.near,
+            'status': self.status,
+            'rows_processed': self.rows_processed,
+            'rows_inserted': self.rows_inserted,
+            'rows_failed': self.rows_failed,
+            'rows_duplicate': self.rows_duplicate,
+            'errors': self.errors,
+            'duplicates': self.duplicates,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+def _parse_rows(path: str, file_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """ yield (line, row, error) one line at a time, never the whole file
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                # empty cells fall back to the schema defaults
+                yield reader.line_num, {k: v for k, v in row.items() if v not in ('', None)}, None
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line), None
+                except json.JSONDecodeError as e:
+                    yield line_number, None, f'Invalid JSON: {e.msg}'
+
+
+def _next_chunk(rows: Iterator, job: ImportJob, chunk_size: int) -> Optional[Tuple[List[int], List[dict]]]:
+    """ validate rows until `chunk_size` are valid, None once the file is done,
+        returns the line numbers and rows of the chunk
+    """
+    lines, chunk = [], []
+    for line, row, error in rows:
+        job.rows_processed += 1
+        if error is None:
+            try:
+                chunk.append(question_row(job.category_id, QuestionCreate(**row)))
+                lines.append(line)
+            except (ValidationError, TypeError) as e:
+                error = str(e)
+        if error is not None:
+            job.record_error(line, error)
+
+        if len(chunk) >= chunk_size:
+            return lines, chunk
+    return (lines, chunk) if chunk else None
+
+
+class ImportJobRegistry:
+    """ in-process registry of file import jobs, pollable by job id
+    """
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, ImportJob] = OrderedDict()
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self._jobs.get(job_id)
+
+    def start(
+            self, category_id: int, path: str, file_format: str,
+            dedup: DedupMode = DedupMode.FLAG, near: bool = False) -> ImportJob:
+        job = ImportJob(
+            id=str(uuid.uuid4()), category_id=category_id, format=file_format, dedup=dedup, near=near)
+        self._jobs[job.id] = job
+        self._evict()
+        job.task = asyncio.create_task(self._run(job, path))
+        return job
+
+    def _evict(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ('completed', 'failed')
+        ]
+        while len(self._jobs) > self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+    async def _run(self, job: ImportJob, path: str) -> None:
+        job.status = 'running'
+        rows = _parse_rows(path, job.format)
+        try:
+            async with SessionLocal() as db:
+                while True:
+                    # parsing and validation run off the event loop
+                    chunk = await asyncio.to_thread(
+                        _next_chunk, rows, job, settings.BULK_INSERT_CHUNK_SIZE)
+                    if chunk is None:
+                        break
+
+                    lines, chunk_rows = chunk
+                    inserted, duplicates = await ingest_question_rows(db, chunk_rows, job.dedup, job.near)
+                    version = await bump_catalog_version(db)
+                    await db.commit()
+                    catalog_watcher.applied(version)
+                    model_cache.bump('questions')
+                    question_snapshot.add_rows(inserted)
+                    question_sampler.add_rows(inserted)
+                    job.rows_inserted += len(inserted)
+                    for duplicate in duplicates:
+                        job.record_duplicate(lines[duplicate['position']], duplicate)
+            job.status = 'completed'
+        except Exception as e:
+            logger.exception('Question import %s failed', job.id)
+            job.status = 'failed'
+            job.errors.append({'line': None, 'error': str(e)})
+        finally:
+            rows.close()
+            job.finished_at = datetime.now(timezone.utc)
+            os.remove(path)
+
+
+import_jobs = ImportJobRegistry(max_jobs=settings.IMPORT_JOBS_KEPT)
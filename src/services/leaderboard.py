@@ -0,0 +1,118 @@
+# Standard library imports
+from typing import Dict, List, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import func, select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.user_data import QuizSession
+from src.services.catalog_watcher import CatalogWatcher
+from src.utils.enums import SessionStatus
+from src.utils.skiplist import IndexableSkipList
+
+
+# catalog_versions row bumped with every completed quiz session written
+LEADERBOARDS = 'leaderboards'
+
+
+class Board:
+    """ total score per user, ranked through a skip list keyed by
+        (-score, user_id) so the best score comes first and ties are
+        broken by user id
+    """
+
+    __slots__ = ('scores', 'ranking')
+
+    def __init__(self, scores: Optional[Dict[int, float]] = None):
+        self.scores: Dict[int, float] = scores or {}
+        self.ranking = IndexableSkipList.from_sorted(
+            sorted((-score, user_id) for user_id, score in self.scores.items()))
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def add(self, user_id: int, points: float) -> float:
+        old = self.scores.get(user_id)
+        if old is not None:
+            self.ranking.remove((-old, user_id))
+        score = (old or 0.0) + points
+        self.scores[user_id] = score
+        self.ranking.insert((-score, user_id))
+        return score
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, float]]:
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return self.ranking.rank((-score, user_id)), score
+
+    def top(self, limit: int, offset: int = 0) -> List[dict]:
+        return [
+            {'rank': offset + index + 1, 'user_id': user_id, 'score': -score}
+            for index, (score, user_id) in enumerate(self.ranking.slice(offset, limit))
+        ]
+
+
+class Leaderboards:
+    """ global and per-category leaderboards kept in memory
+
+    completed quizzes add their score in O(log n); the boards are rebuilt
+    from quiz_sessions with one aggregate query at startup. the global
+    board counts every completed quiz, a category board the quizzes
+    played in that category.
+
+    every worker holds its own boards, writes of completed sessions bump
+    the LEADERBOARDS version and leaderboard_watcher rebuilds the boards
+    when another worker moved it.
+    """
+
+    def __init__(self):
+        self.overall = Board()
+        self.categories: Dict[int, Board] = {}
+
+    def board(self, category_id: Optional[int] = None) -> Optional[Board]:
+        if category_id is None:
+            return self.overall
+        return self.categories.get(category_id)
+
+    def record(self, user_id: int, category_id: Optional[int], score: float) -> None:
+        self.overall.add(user_id, score)
+        if category_id is not None:
+            self.categories.setdefault(category_id, Board()).add(user_id, score)
+
+    async def rebuild(self) -> int:
+        overall: Dict[int, float] = {}
+        categories: Dict[int, Dict[int, float]] = {}
+
+        query = select(
+            QuizSession.user_id, QuizSession.category_id, func.sum(QuizSession.score).label('score')
+        ).filter(
+            QuizSession.status == SessionStatus.COMPLETED
+        ).group_by(QuizSession.user_id, QuizSession.category_id)
+
+        async with SessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=10000))
+            async for row in result:
+                score = row.score or 0.0
+                overall[row.user_id] = overall.get(row.user_id, 0.0) + score
+                if row.category_id is not None:
+                    categories.setdefault(row.category_id, {})[row.user_id] = score
+
+        self.overall = Board(overall)
+        self.categories = {
+            category_id: Board(scores) for category_id, scores in categories.items()
+        }
+        return len(overall)
+
+    def stats(self) -> dict:
+        return {
+            'users': len(self.overall),
+            'category_boards': len(self.categories),
+        }
+
+
+leaderboards = Leaderboards()
+leaderboard_watcher = CatalogWatcher(
+    LEADERBOARDS, settings.LEADERBOARD_POLL_INTERVAL, leaderboards.rebuild)
@@ -0,0 +1,128 @@
+# Standard library imports
+import asyncio
+import logging
+import smtplib
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import List, Optional
+
+# Local imports
+from src.core.config import settings
+from src.utils.email_send import build_otp_message, open_smtp_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingMail:
+    message: EmailMessage
+    attempts: int = 0
+
+
+class MailQueue:
+    """ bounded in-process queue of outgoing mail
+
+    each worker keeps its own smtp connection open and reuses it across
+    messages; failed sends are retried with exponential backoff.
+    """
+
+    def __init__(self, workers: int, maxsize: int, max_attempts: int, backoff: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._tasks: List[asyncio.Task] = []
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    async def enqueue_otp(self, email_receiver: str, otp: int) -> None:
+        """ queue an otp email, waiting for room when the queue is full
+        """
+        await self._queue.put(OutgoingMail(build_otp_message(email_receiver, otp)))
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(n)) for n in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float) -> None:
+        """ give the workers `timeout` seconds to drain, then cancel them
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning('Mail queue stopped with %d messages pending', self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            'queued': self._queue.qsize(),
+            'workers': len(self._tasks),
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+        }
+
+    async def _worker(self, number: int) -> None:
+        smtp: Optional[smtplib.SMTP] = None
+        try:
+            while True:
+                mail = await self._queue.get()
+                try:
+                    smtp = await self._deliver(smtp, mail)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if smtp is not None:
+                await asyncio.to_thread(_close, smtp)
+
+    async def _deliver(self, smtp: Optional[smtplib.SMTP], mail: OutgoingMail) -> Optional[smtplib.SMTP]:
+        while True:
+            mail.attempts += 1
+            try:
+                if smtp is None:
+                    smtp = await asyncio.to_thread(open_smtp_connection)
+                await asyncio.to_thread(smtp.send_message, mail.message)
+                self.sent += 1
+                return smtp
+            except smtplib.SMTPRecipientsRefused:
+                # bad address, retrying won't help
+                self.failed += 1
+                logger.warning('Recipient refused: %s', mail.message['To'])
+                return smtp
+            except (smtplib.SMTPException, OSError) as e:
+                # drop the connection, the next attempt reconnects
+                if smtp is not None:
+                    await asyncio.to_thread(_close, smtp)
+                    smtp = None
+
+                if mail.attempts >= self.max_attempts:
+                    self.failed += 1
+                    logger.error('Giving up on mail to %s: %s', mail.message['To'], e)
+                    return smtp
+
+                self.retried += 1
+                await asyncio.sleep(self.backoff * 2 ** (mail.attempts - 1))
+
+
+def _close(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+mail_queue = MailQueue(
+    workers=settings.EMAIL_QUEUE_WORKERS,
+    maxsize=settings.EMAIL_QUEUE_SIZE,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    backoff=settings.EMAIL_RETRY_BACKOFF)
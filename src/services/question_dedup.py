@@ -0,0 +1,125 @@
+# Standard library imports
+from typing import Dict, List, Optional, Set
+
+# Third-party imports
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.models.questions import QuestionFingerprint, QuestionLshBand
+from src.utils.iterables import chunked
+from src.utils.upsert import dialect_insert
+from src.utils.fingerprint import (
+    Fingerprint, question_fingerprint, signature_from_bytes, similarity
+)
+
+
+# keeps IN (...) lists under the driver bind parameter limits
+IN_CLAUSE_SIZE = 5000
+# rows per multi-row INSERT, 3 bind parameters each
+VALUES_BATCH_SIZE = 2000
+
+
+def row_fingerprint(row: dict, near: bool = True) -> Fingerprint:
+    return question_fingerprint(
+        row['question_text'],
+        (row['option_a'], row['option_b'], row['option_c'], row['option_d']), near)
+
+
+async def _select_in(db: AsyncSession, columns, key_column, keys: list) -> list:
+    rows = []
+    for keys_chunk in chunked(keys, IN_CLAUSE_SIZE):
+        rows.extend(await db.execute(select(*columns).filter(key_column.in_(keys_chunk))))
+    return rows
+
+
+async def find_duplicates(
+        db: AsyncSession, fingerprints: List[Fingerprint],
+        threshold: float = settings.DEDUP_SIMILARITY_THRESHOLD) -> List[Optional[dict]]:
+    """ best existing match for each fingerprint, or None
+
+    exact hashes are looked up directly; near duplicates only come from
+    questions sharing at least one LSH band, so the cost per row doesn't
+    depend on the size of the bank. fingerprints without a signature are
+    only matched exactly. earlier rows of the same batch count as
+    existing, shown as {'batch_index': i}.
+    """
+    matches: List[Optional[dict]] = [None] * len(fingerprints)
+
+    exact_rows = await _select_in(
+        db, (QuestionFingerprint.exact_hash, QuestionFingerprint.question_id),
+        QuestionFingerprint.exact_hash, list({fp.exact_hash for fp in fingerprints}))
+    exact = {row.exact_hash: row.question_id for row in exact_rows}
+
+    band_rows = await _select_in(
+        db, (QuestionLshBand.band_key, QuestionLshBand.question_id),
+        QuestionLshBand.band_key, list({key for fp in fingerprints for key in fp.band_keys()}))
+    bands: Dict[str, set] = {}
+    for row in band_rows:
+        bands.setdefault(row.band_key, set()).add(row.question_id)
+
+    candidate_ids = list({question_id for ids in bands.values() for question_id in ids})
+    signature_rows = await _select_in(
+        db, (QuestionFingerprint.question_id, QuestionFingerprint.signature),
+        QuestionFingerprint.question_id, candidate_ids)
+    signatures = {row.question_id: signature_from_bytes(row.signature) for row in signature_rows}
+
+    batch_exact: Dict[str, int] = {}
+    batch_bands: Dict[str, List[int]] = {}
+    for index, fp in enumerate(fingerprints):
+        keys = fp.band_keys()
+        if fp.exact_hash in exact:
+            matches[index] = {'question_id': exact[fp.exact_hash], 'match': 'exact', 'similarity': 1.0}
+        elif fp.exact_hash in batch_exact:
+            matches[index] = {'batch_index': batch_exact[fp.exact_hash], 'match': 'exact', 'similarity': 1.0}
+        else:
+            best = None
+            for question_id in {qid for key in keys for qid in bands.get(key, ())}:
+                score = similarity(fp.signature, signatures[question_id]) if question_id in signatures else 0.0
+                if score >= threshold and (best is None or score > best['similarity']):
+                    best = {'question_id': question_id, 'match': 'near', 'similarity': score}
+            for other in {i for key in keys for i in batch_bands.get(key, ())}:
+                score = similarity(fp.signature, fingerprints[other].signature)
+                if score >= threshold and (best is None or score > best['similarity']):
+                    best = {'batch_index': other, 'match': 'near', 'similarity': score}
+            matches[index] = best
+
+        batch_exact.setdefault(fp.exact_hash, index)
+        for key in keys:
+            batch_bands.setdefault(key, []).append(index)
+
+    return matches
+
+
+async def store_fingerprints(
+        db: AsyncSession, question_ids: List[int], fingerprints: List[Fingerprint]) -> Set[int]:
+    """ add inserted questions to the persistent fingerprint index,
+        returns the ids stored
+
+    exact_hash is unique: a question whose hash is already indexed (an
+    exact duplicate kept by dedup=flag, or one a concurrent import
+    inserted first) is left out, and lookups find the first one.
+    """
+    stored: Set[int] = set()
+    pairs = list(zip(question_ids, fingerprints))
+    for batch in chunked(pairs, VALUES_BATCH_SIZE):
+        statement = dialect_insert(db, QuestionFingerprint).values([
+            {
+                'question_id': question_id,
+                'exact_hash': fp.exact_hash,
+                'signature': fp.signature.tobytes(),
+            } for question_id, fp in batch
+        ]).on_conflict_do_nothing(
+            index_elements=[QuestionFingerprint.exact_hash]
+        ).returning(QuestionFingerprint.question_id)
+        stored.update(await db.scalars(statement))
+
+    bands = [
+        {'band_key': key, 'question_id': question_id}
+        for question_id, fp in pairs if question_id in stored
+        for key in fp.band_keys()
+    ]
+    if bands:
+        await db.execute(insert(QuestionLshBand), bands)
+    return stored
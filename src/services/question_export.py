@@ -0,0 +1,97 @@
+# Standard library imports
+import io
+import csv
+import json
+import zlib
+from typing import AsyncIterator, Optional
+
+# Third-party imports
+from sqlalchemy import select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.questions import Category, Question
+from src.utils.enums import DifficultyLevel
+
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+EXPORT_COLUMNS = (
+    'id', 'category_id', 'category_name', 'question_text', 'difficulty_level',
+    'correct_answer', 'option_a', 'option_b', 'option_c', 'option_d',
+    'is_active', 'created_at', 'updated_at',
+)
+
+
+def export_query(
+        category_id: Optional[int], difficulty_level: Optional[DifficultyLevel],
+        is_active: Optional[bool]):
+    query = select(
+        Question.id, Question.category_id, Category.name.label('category_name'),
+        Question.question_text, Question.difficulty_level, Question.correct_answer,
+        Question.option_a, Question.option_b, Question.option_c, Question.option_d,
+        Question.is_active, Question.created_at, Question.updated_at,
+    ).join(Category, Question.category_id == Category.id).order_by(Question.id)
+
+    if category_id is not None:
+        query = query.filter(Question.category_id == category_id)
+    if difficulty_level is not None:
+        query = query.filter(Question.difficulty_level == difficulty_level)
+    if is_active is not None:
+        query = query.filter(Question.is_active == is_active)
+    return query
+
+
+def _row_values(row) -> dict:
+    values = row._asdict()
+    values['difficulty_level'] = row.difficulty_level.value
+    values['created_at'] = row.created_at.isoformat() if row.created_at else None
+    values['updated_at'] = row.updated_at.isoformat() if row.updated_at else None
+    return values
+
+
+async def _export_text(query, file_format: str) -> AsyncIterator[str]:
+    """ yield the export one fetched batch at a time
+
+    rows are read through a server-side cursor with yield_per, so only
+    one batch is ever held in memory.
+    """
+    buffer = io.StringIO()
+    writer = None
+    if file_format == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+
+    async with SessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            for row in partition:
+                if writer:
+                    writer.writerow(_row_values(row))
+                else:
+                    buffer.write(json.dumps(_row_values(row)))
+                    buffer.write('\n')
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def export_questions(query, file_format: str, compress: bool) -> AsyncIterator[bytes]:
+    """ encoded export stream, gzipped on the fly when `compress` is set
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31 = gzip container
+    async for text in _export_text(query, file_format):
+        data = text.encode('utf-8')
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,108 @@
+# Standard library imports
+import asyncio
+from typing import Iterable, List, Tuple
+
+# Third-party imports
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.models.questions import Question
+from src.schemas.questions import QuestionCreate
+from src.services.question_dedup import find_duplicates, row_fingerprint, store_fingerprints
+from src.utils.enums import DedupMode
+from src.utils.iterables import chunked
+
+
+def question_row(category_id: int, question_data: QuestionCreate) -> dict:
+    return {
+        'category_id': category_id,
+        'question_text': question_data.question_text,
+        'difficulty_level': question_data.difficulty_level,
+        'correct_answer': question_data.correct_answer,
+        'option_a': question_data.option_a,
+        'option_b': question_data.option_b,
+        'option_c': question_data.option_c,
+        'option_d': question_data.option_d,
+        'is_active': question_data.is_active,
+    }
+
+
+async def insert_question_rows(db: AsyncSession, rows: List[dict]) -> List[dict]:
+    """ insert one chunk with a single INSERT ... RETURNING,
+        returns the rows with their generated id and created_at
+    """
+    statement = insert(Question).returning(
+        Question.id, Question.created_at, sort_by_parameter_order=True)
+    result = await db.execute(statement, rows)
+
+    return [
+        {**row, 'id': inserted.id, 'created_at': inserted.created_at}
+        for row, inserted in zip(rows, result)
+    ]
+
+
+async def ingest_question_rows(
+        db: AsyncSession, rows: List[dict], dedup: DedupMode = DedupMode.FLAG,
+        near: bool = settings.DEDUP_NEAR_DUPLICATES) -> Tuple[List[dict], List[dict]]:
+    """ fingerprint, check for duplicates and insert one chunk
+
+    returns the inserted rows and the duplicates found, each duplicate
+    carrying its `position` in `rows`. with DedupMode.REJECT duplicates
+    are left out of the insert; every inserted row is fingerprinted so
+    later imports can match against it. exact duplicates are always
+    looked for, near duplicates (minhash and lsh bands) only with `near`.
+    """
+    if near:
+        # minhash is cpu bound, keep it off the event loop
+        fingerprints = await asyncio.to_thread(lambda: [row_fingerprint(row) for row in rows])
+    else:
+        fingerprints = [row_fingerprint(row, near=False) for row in rows]
+
+    positions = list(range(len(rows)))
+    duplicates = []
+    if dedup != DedupMode.OFF:
+        matches = await find_duplicates(db, fingerprints)
+        duplicates = [
+            {'position': position, **match}
+            for position, match in enumerate(matches) if match
+        ]
+        if dedup == DedupMode.REJECT:
+            positions = [position for position, match in enumerate(matches) if match is None]
+            rows = [rows[position] for position in positions]
+            fingerprints = [fingerprints[position] for position in positions]
+
+    inserted = await insert_question_rows(db, rows) if rows else []
+    stored = await store_fingerprints(db, [row['id'] for row in inserted], fingerprints)
+
+    if dedup == DedupMode.REJECT and len(stored) < len(inserted):
+        # a concurrent import stored the same exact hash first
+        lost = [index for index, row in enumerate(inserted) if row['id'] not in stored]
+        await db.execute(delete(Question).where(Question.id.in_([inserted[index]['id'] for index in lost])))
+        duplicates.extend(
+            {'position': positions[index], 'match': 'exact', 'similarity': 1.0} for index in lost)
+        inserted = [row for row in inserted if row['id'] in stored]
+    return inserted, duplicates
+
+
+async def insert_questions(
+        db: AsyncSession, category_id: int, questions: Iterable[QuestionCreate],
+        dedup: DedupMode = DedupMode.FLAG, near: bool = settings.DEDUP_NEAR_DUPLICATES,
+        chunk_size: int = settings.BULK_INSERT_CHUNK_SIZE) -> Tuple[List[dict], List[dict]]:
+    """ insert questions in chunks of `chunk_size` without committing,
+        duplicate positions are relative to `questions`
+    """
+    inserted, duplicates = [], []
+    offset = 0
+    for chunk in chunked(questions, chunk_size):
+        rows = [question_row(category_id, question_data) for question_data in chunk]
+        chunk_inserted, chunk_duplicates = await ingest_question_rows(db, rows, dedup, near)
+        inserted.extend(chunk_inserted)
+        for duplicate in chunk_duplicates:
+            duplicate['position'] += offset
+            if 'batch_index' in duplicate:
+                duplicate['batch_index'] += offset
+        duplicates.extend(chunk_duplicates)
+        offset += len(rows)
+    return inserted, duplicates
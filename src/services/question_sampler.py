@@ -0,0 +1,109 @@
+# Standard library imports
+import random
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.database import SessionLocal
+from src.models.questions import Category, Question
+from src.utils.enums import DifficultyLevel
+
+
+BucketKey = Tuple[int, DifficultyLevel]
+
+
+class QuestionSampler:
+    """ active question ids bucketed by (category_id, difficulty_level)
+
+    drawing k questions picks k positions from the matching buckets with
+    random.sample over a range, which is O(k) regardless of bank size,
+    instead of ORDER BY random() over the whole table.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[BucketKey, array] = {}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._buckets.values())
+
+    def add(self, category_id: int, difficulty_level: DifficultyLevel, question_ids: Iterable[int]) -> None:
+        bucket = self._buckets.setdefault((category_id, difficulty_level), array('i'))
+        bucket.extend(question_ids)
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        """ index freshly inserted question rows that are active
+        """
+        for row in rows:
+            if row['is_active']:
+                self.add(row['category_id'], row['difficulty_level'], (row['id'],))
+
+    def remove_categories(self, category_ids: Iterable[int]) -> None:
+        category_ids = set(category_ids)
+        for key in [key for key in self._buckets if key[0] in category_ids]:
+            del self._buckets[key]
+
+    def _matching(self, category_id: Optional[int], difficulty_level: Optional[DifficultyLevel]) -> List[array]:
+        return [
+            ids for (bucket_category, bucket_difficulty), ids in self._buckets.items()
+            if ids
+            and (category_id is None or bucket_category == category_id)
+            and (difficulty_level is None or bucket_difficulty == difficulty_level)
+        ]
+
+    def count(self, category_id: Optional[int] = None, difficulty_level: Optional[DifficultyLevel] = None) -> int:
+        return sum(len(ids) for ids in self._matching(category_id, difficulty_level))
+
+    def sample(
+            self, k: int, category_id: Optional[int] = None,
+            difficulty_level: Optional[DifficultyLevel] = None,
+            rng: Optional[random.Random] = None) -> List[int]:
+        """ k distinct question ids, fewer if not enough questions match
+        """
+        buckets = self._matching(category_id, difficulty_level)
+        bounds = list(accumulate(len(ids) for ids in buckets))
+        total = bounds[-1] if bounds else 0
+
+        picked = []
+        for position in (rng or random).sample(range(total), min(k, total)):
+            index = bisect_right(bounds, position)
+            offset = position - (bounds[index - 1] if index else 0)
+            picked.append(buckets[index][offset])
+        return picked
+
+    async def load(self, db: AsyncSession, category_ids: Optional[Iterable[int]] = None) -> int:
+        """ (re)load active questions, all of them or only `category_ids`
+        """
+        query = select(
+            Question.id, Question.category_id, Question.difficulty_level
+        ).join(Category, Question.category_id == Category.id).filter(
+            Question.is_active, Category.is_active
+        ).order_by(Question.id)
+
+        buckets: Dict[BucketKey, array] = {}
+        if category_ids is not None:
+            category_ids = list(category_ids)
+            query = query.filter(Question.category_id.in_(category_ids))
+
+        result = await db.stream(query.execution_options(yield_per=10000))
+        async for row in result:
+            buckets.setdefault((row.category_id, row.difficulty_level), array('i')).append(row.id)
+
+        if category_ids is None:
+            self._buckets = buckets
+        else:
+            self.remove_categories(category_ids)
+            self._buckets.update(buckets)
+        return sum(len(ids) for ids in buckets.values())
+
+    async def build(self) -> int:
+        async with SessionLocal() as db:
+            return await self.load(db)
+
+
+question_sampler = QuestionSampler()
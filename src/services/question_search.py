@@ -0,0 +1,81 @@
+# Standard library imports
+from typing import List, Optional
+
+# Third-party imports
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.models.questions import FTS_CONFIG, Question, question_tsvector
+from src.utils.enums import DifficultyLevel
+
+
+questions_fts = table('questions_fts', column('rowid'))
+
+# databases with a full-text index, see _search_query
+SEARCH_DIALECTS = ('postgresql', 'sqlite')
+
+
+def check_search_support(dialect_name: str) -> None:
+    """ called at startup, next to check_upsert_support
+    """
+    if dialect_name not in SEARCH_DIALECTS:
+        raise NotImplementedError(f'Full-text search is not supported on {dialect_name}')
+
+
+def _fts5_query(text: str) -> str:
+    """ quote every term so user input can't hit fts5 query syntax,
+        terms are AND-ed like plainto_tsquery does
+    """
+    return ' '.join('"%s"' % term.replace('"', '""') for term in text.split())
+
+
+def _search_query(dialect_name: str, text: str):
+    columns = (
+        Question.id, Question.category_id, Question.question_text,
+        Question.difficulty_level, Question.is_active,
+    )
+    if dialect_name == 'postgresql':
+        tsquery = func.plainto_tsquery(FTS_CONFIG, text)
+        rank = func.ts_rank(question_tsvector, tsquery)
+        return select(*columns, rank.label('rank')).filter(
+            question_tsvector.op('@@')(tsquery)
+        ).order_by(rank.desc())
+
+    if dialect_name == 'sqlite':
+        # bm25() is lower for better matches
+        rank = func.bm25(literal_column('questions_fts'))
+        return select(*columns, (-rank).label('rank')).join(
+            questions_fts, questions_fts.c.rowid == Question.id
+        ).filter(
+            literal_column('questions_fts').op('MATCH')(_fts5_query(text))
+        ).order_by(rank)
+
+    raise NotImplementedError(f'Full-text search is not supported on {dialect_name}')
+
+
+async def search_questions(
+        db: AsyncSession, text: str, category_id: Optional[int] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        is_active: Optional[bool] = None, limit: int = 20) -> List[dict]:
+    """ questions matching `text`, best ranked first
+    """
+    query = _search_query(db.bind.dialect.name, text)
+    if category_id is not None:
+        query = query.filter(Question.category_id == category_id)
+    if difficulty_level is not None:
+        query = query.filter(Question.difficulty_level == difficulty_level)
+    if is_active is not None:
+        query = query.filter(Question.is_active == is_active)
+
+    result = await db.execute(query.limit(limit))
+    return [
+        {
+            'id': row.id,
+            'category_id': row.category_id,
+            'question_text': row.question_text,
+            'difficulty_level': row.difficulty_level.value,
+            'is_active': row.is_active,
+            'rank': row.rank,
+        } for row in result
+    ]
@@ -0,0 +1,305 @@
+# Standard library imports
+import sys
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.questions import Category, Question
+from src.utils.enums import AnswerOption, DifficultyLevel
+
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_CODES = {level: code for code, level in enumerate(DifficultyLevel)}
+DIFFICULTY_LEVELS = list(DifficultyLevel)
+ANSWER_OPTIONS = list(AnswerOption)
+NO_ANSWER = 255
+# rows per fetch during a rebuild; each fetch is processed on the event
+# loop, so smaller partitions mean shorter stalls
+BUILD_PARTITION_SIZE = 1000
+
+
+def answer_code(correct_answer: str, options: Tuple[str, str, str, str]) -> int:
+    """ index (0-3) of the correct option; correct_answer may be the
+        option letter or the option text
+    """
+    answer = correct_answer.strip()
+    if answer.upper() in ('A', 'B', 'C', 'D'):
+        return 'ABCD'.index(answer.upper())
+
+    answer = answer.casefold()
+    for index, option in enumerate(options):
+        if option.strip().casefold() == answer:
+            return index
+    return NO_ANSWER
+
+
+class QuestionBankSnapshot:
+    """ columnar copy of the active question bank
+
+    row i of every column belongs to the question ids[i]; ids are sorted
+    so lookups are a binary search. answers are option codes (0-3) and
+    options are indexes into one pool of interned strings, which
+    collapses the many repeated option values (True/False, years, ...)
+    to a single object each.
+
+    the columns are append-only and shared with the snapshots extended
+    from this one, which append past `count`. a snapshot only reads its
+    first `count` rows, so it never changes once made.
+    """
+
+    __slots__ = (
+        'ids', 'category_ids', 'difficulty', 'answers', 'texts', 'option_refs',
+        'strings', 'pool', 'count', 'category_multipliers',
+    )
+
+    def __init__(
+            self, ids: array, category_ids: array, difficulty: bytearray, answers: bytearray,
+            texts: List[str], option_refs: array, strings: List[str],
+            pool: Dict[str, int], count: int, category_multipliers: Dict[int, float]):
+        self.ids = ids
+        self.category_ids = category_ids
+        self.difficulty = difficulty
+        self.answers = answers
+        self.texts = texts
+        self.option_refs = option_refs
+        self.strings = strings
+        self.pool = pool
+        self.count = count
+        self.category_multipliers = category_multipliers
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last_id(self) -> int:
+        return self.ids[self.count - 1] if self.count else 0
+
+    def position(self, question_id: int) -> Optional[int]:
+        index = bisect_left(self.ids, question_id, 0, self.count)
+        if index < self.count and self.ids[index] == question_id:
+            return index
+        return None
+
+    def options(self, position: int) -> Tuple[str, str, str, str]:
+        refs = self.option_refs[position * 4:position * 4 + 4]
+        return tuple(self.strings[ref] for ref in refs)
+
+    def metadata(self, position: int) -> dict:
+        """ public fields of a question, without the answer
+        """
+        option_a, option_b, option_c, option_d = self.options(position)
+        return {
+            'id': self.ids[position],
+            'category_id': self.category_ids[position],
+            'question_text': self.texts[position],
+            'difficulty_level': DIFFICULTY_LEVELS[self.difficulty[position]].value,
+            'option_a': option_a,
+            'option_b': option_b,
+            'option_c': option_c,
+            'option_d': option_d,
+        }
+
+    def correct_option(self, position: int) -> Optional[AnswerOption]:
+        code = self.answers[position]
+        return None if code == NO_ANSWER else ANSWER_OPTIONS[code]
+
+    def get(self, question_id: int) -> Optional[dict]:
+        position = self.position(question_id)
+        return None if position is None else self.metadata(position)
+
+    def extended(self, rows: Iterable) -> 'QuestionBankSnapshot':
+        """ new snapshot with `rows` appended, rows must be ordered by id
+            and come after every id already here
+
+        the rows are appended to the shared columns, so an append costs
+        the appended rows only and strings are pooled with the existing
+        ones. the columns are copied first only when another snapshot was
+        already extended from this one.
+        """
+        builder = SnapshotBuilder.continuing(self)
+        builder.add_many(rows)
+        if len(builder.ids) == self.count:
+            return self
+        return builder.finish(self.category_multipliers)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, category_multipliers: Dict[int, float]) -> 'QuestionBankSnapshot':
+        """ build from rows ordered by id
+        """
+        builder = SnapshotBuilder()
+        builder.add_many(rows)
+        return builder.finish(category_multipliers)
+
+
+class SnapshotBuilder:
+    """ appends rows as they are streamed, so no list of rows is ever
+        held
+    """
+
+    def __init__(self):
+        self.ids, self.category_ids = array('i'), array('i')
+        self.difficulty, self.answers = bytearray(), bytearray()
+        self.texts: List[str] = []
+        self.option_refs = array('I')
+        self.strings: List[str] = []
+        self.pool: Dict[str, int] = {}
+
+    @classmethod
+    def continuing(cls, snapshot: QuestionBankSnapshot) -> 'SnapshotBuilder':
+        """ builder appending to the columns of `snapshot`
+        """
+        builder = cls.__new__(cls)
+        count = snapshot.count
+        if len(snapshot.ids) == count:
+            columns = (
+                snapshot.ids, snapshot.category_ids, snapshot.difficulty, snapshot.answers,
+                snapshot.texts, snapshot.option_refs, snapshot.strings, snapshot.pool)
+        else:
+            # rows past `count` belong to another snapshot; the strings
+            # they added are only unused entries of the pool
+            columns = (
+                snapshot.ids[:count], snapshot.category_ids[:count], snapshot.difficulty[:count],
+                snapshot.answers[:count], snapshot.texts[:count], snapshot.option_refs[:count * 4],
+                list(snapshot.strings), dict(snapshot.pool))
+        (builder.ids, builder.category_ids, builder.difficulty, builder.answers, builder.texts,
+         builder.option_refs, builder.strings, builder.pool) = columns
+        return builder
+
+    def _ref(self, value: str) -> int:
+        index = self.pool.get(value)
+        if index is None:
+            index = self.pool[value] = len(self.strings)
+            self.strings.append(sys.intern(value))
+        return index
+
+    def add(self, row) -> None:
+        options = (row.option_a, row.option_b, row.option_c, row.option_d)
+        self.ids.append(row.id)
+        self.category_ids.append(row.category_id)
+        self.difficulty.append(DIFFICULTY_CODES[row.difficulty_level])
+        self.answers.append(answer_code(row.correct_answer, options))
+        self.texts.append(row.question_text)
+        self.option_refs.extend(self._ref(option) for option in options)
+
+    def add_many(self, rows: Iterable) -> None:
+        for row in rows:
+            self.add(row)
+
+    def finish(self, category_multipliers: Dict[int, float]) -> QuestionBankSnapshot:
+        return QuestionBankSnapshot(
+            self.ids, self.category_ids, self.difficulty, self.answers, self.texts,
+            self.option_refs, self.strings, self.pool, len(self.ids),
+            category_multipliers)
+
+
+class _Row:
+    """ attribute access to an inserted row dict, like a result row
+    """
+
+    __slots__ = (
+        'id', 'category_id', 'question_text', 'difficulty_level', 'correct_answer',
+        'option_a', 'option_b', 'option_c', 'option_d',
+    )
+
+    def __init__(self, row: dict):
+        for name in self.__slots__:
+            setattr(self, name, row[name])
+
+
+class QuestionSnapshotStore:
+    """ holds the current snapshot and swaps in a rebuilt one on change
+
+    readers take `store.current` once and keep using that object, so a
+    swap never shows them a half built bank. inserted questions are
+    appended with add_rows; other changes (categories, edits) schedule a
+    full rebuild, debounced so many writes within `delay` seconds cause
+    one. a rebuild streams rows on the event loop but runs the builder
+    in a worker thread.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.current = QuestionBankSnapshot.from_rows((), {})
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        # rows appended while a rebuild is streaming, None when idle
+        self._appended: Optional[list] = None
+
+    async def build(self) -> QuestionBankSnapshot:
+        async with SessionLocal() as db:
+            multipliers = dict((await db.execute(
+                select(Category.id, Category.difficulty_multiplier).filter(Category.is_active)
+            )).all())
+            result = await db.stream(select(
+                Question.id, Question.category_id, Question.question_text,
+                Question.difficulty_level, Question.correct_answer,
+                Question.option_a, Question.option_b, Question.option_c, Question.option_d,
+            ).filter(
+                Question.is_active, Question.category_id.in_(list(multipliers))
+            ).order_by(Question.id).execution_options(yield_per=BUILD_PARTITION_SIZE))
+
+            builder = SnapshotBuilder()
+            self._appended = []
+            try:
+                async for rows in result.partitions():
+                    await asyncio.to_thread(builder.add_many, rows)
+                snapshot = await asyncio.to_thread(builder.finish, multipliers)
+                # inserts committed after the query started
+                last_id = snapshot.last_id
+                snapshot = snapshot.extended(row for row in self._appended if row.id > last_id)
+            finally:
+                self._appended = None
+
+        self.current = snapshot
+        return self.current
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        """ append freshly inserted question rows (dicts as returned by
+            insert_question_rows), falls back to a rebuild when they
+            don't come after the current ids or belong to a category
+            the snapshot doesn't know yet
+        """
+        snapshot = self.current
+        rows = sorted((_Row(row) for row in rows if row['is_active']), key=lambda row: row.id)
+        if not rows:
+            return
+        if (rows[0].id <= snapshot.last_id
+                or any(row.category_id not in snapshot.category_multipliers for row in rows)):
+            self.schedule_rebuild()
+            return
+
+        self.current = snapshot.extended(rows)
+        if self._appended is not None:
+            self._appended.extend(rows)
+
+    def schedule_rebuild(self) -> None:
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._rebuild_later())
+
+    async def _rebuild_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            self._dirty = False
+            try:
+                await self.build()
+            except Exception:
+                logger.exception('Question snapshot rebuild failed')
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+question_snapshot = QuestionSnapshotStore(delay=settings.SNAPSHOT_REBUILD_DELAY)
@@ -0,0 +1,490 @@
+# Standard library imports
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+# Third-party imports
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.analytics import QuestionHistory
+from src.models.questions import Category, Question
+from src.models.user_data import QuizSession
+from src.services.daily_challenge import daily_challenge
+from src.services.catalog_watcher import bump_catalog_version
+from src.services.leaderboard import LEADERBOARDS, leaderboard_watcher, leaderboards
+from src.services.user_stats import user_stats
+from src.services.question_snapshot import (
+    ANSWER_OPTIONS, NO_ANSWER, answer_code, question_snapshot
+)
+from src.utils.enums import AnswerOption, SessionStatus, SessionType
+from src.utils.iterables import chunked
+from src.utils.upsert import dialect_insert
+
+
+logger = logging.getLogger(__name__)
+
+TRANSITIONS = {
+    SessionStatus.STARTED: {SessionStatus.IN_PROGRESS, SessionStatus.ABANDONED, SessionStatus.EXPIRED},
+    SessionStatus.IN_PROGRESS: {SessionStatus.COMPLETED, SessionStatus.ABANDONED, SessionStatus.EXPIRED},
+    SessionStatus.COMPLETED: set(),
+    SessionStatus.EXPIRED: set(),
+    SessionStatus.ABANDONED: set(),
+}
+
+FINISHED = {SessionStatus.COMPLETED, SessionStatus.EXPIRED, SessionStatus.ABANDONED}
+LIVE = [SessionStatus.STARTED, SessionStatus.IN_PROGRESS]
+
+# sessions per multi-row upsert, keeps bind parameters under driver limits
+FLUSH_BATCH_SIZE = 500
+
+
+class InvalidTransition(Exception):
+    """ raised when a session can't move to the requested status
+    """
+
+
+class QuizSessionError(Exception):
+    """ raised for answers that don't fit the session
+    """
+
+
+class SessionOwnedElsewhere(Exception):
+    """ raised when another worker holds an unexpired lease on the session
+    """
+
+
+class LiveSession:
+    __slots__ = (
+        'id', 'user_id', 'session_type', 'category_id', 'question_ids', 'key',
+        'answers', 'status', 'correct_count', 'score', 'started_at',
+        'last_activity_at', 'completed_at',
+    )
+
+    def __init__(
+            self, id: str, user_id: int, session_type: SessionType, category_id: Optional[int],
+            question_ids: List[int], key: Dict[int, Tuple[int, float, int]]):
+        now = datetime.now(timezone.utc)
+        self.id = id
+        self.user_id = user_id
+        self.session_type = session_type
+        self.category_id = category_id
+        self.question_ids = question_ids
+        # question id -> (correct option code, points for a correct answer, category id)
+        self.key = key
+        self.answers: Dict[int, AnswerOption] = {}
+        self.status = SessionStatus.STARTED
+        self.correct_count = 0
+        self.score = 0.0
+        self.started_at = now
+        self.last_activity_at = now
+        self.completed_at: Optional[datetime] = None
+
+    def transition(self, status: SessionStatus) -> None:
+        if status not in TRANSITIONS[self.status]:
+            raise InvalidTransition(f'Cannot move session from {self.status.value} to {status.value}')
+        self.status = status
+        if status in FINISHED:
+            self.completed_at = datetime.now(timezone.utc)
+
+    def to_row(self) -> dict:
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'session_type': self.session_type,
+            'category_id': self.category_id,
+            'status': self.status,
+            'question_ids': self.question_ids,
+            'answered_count': len(self.answers),
+            'correct_count': self.correct_count,
+            'score': self.score,
+            'started_at': self.started_at,
+            'last_activity_at': self.last_activity_at,
+            'completed_at': self.completed_at,
+        }
+
+    def to_dict(self) -> dict:
+        row = self.to_row()
+        row['session_type'] = self.session_type.value
+        row['status'] = self.status.value
+        row['remaining_question_ids'] = [
+            question_id for question_id in self.question_ids if question_id not in self.answers
+        ]
+        return row
+
+
+class TimerWheel:
+    """ hashed timer wheel with one slot per second of idle timeout
+
+    every session has the same timeout, so a touch just moves the
+    session to the slot `timeout` ticks ahead of the cursor. each tick
+    hands back the sessions of one slot: O(1) per touch and per expiry.
+    """
+
+    def __init__(self, timeout: int):
+        self.size = max(timeout, 1) + 1
+        self.timeout = max(timeout, 1)
+        self.cursor = 0
+        self._slots: List[Set[str]] = [set() for _ in range(self.size)]
+        self._slot_of: Dict[str, int] = {}
+
+    def schedule(self, key: str) -> None:
+        self.cancel(key)
+        slot = (self.cursor + self.timeout) % self.size
+        self._slots[slot].add(key)
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> None:
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            self._slots[slot].discard(key)
+
+    def tick(self) -> Set[str]:
+        self.cursor = (self.cursor + 1) % self.size
+        expired, self._slots[self.cursor] = self._slots[self.cursor], set()
+        for key in expired:
+            del self._slot_of[key]
+        return expired
+
+
+async def resolve_answer_key(
+        db: AsyncSession, question_ids: List[int]) -> Dict[int, Tuple[int, float, int]]:
+    """ correct option, points and category of each question, from the snapshot with
+        one query for questions it doesn't have yet
+    """
+    snapshot = question_snapshot.current
+    key = {}
+    for question_id in question_ids:
+        position = snapshot.position(question_id)
+        if position is not None:
+            category_id = snapshot.category_ids[position]
+            multiplier = snapshot.category_multipliers.get(category_id, 1.0)
+            key[question_id] = (snapshot.answers[position], multiplier, category_id)
+
+    missing = [question_id for question_id in question_ids if question_id not in key]
+    if missing:
+        result = await db.execute(select(
+            Question.id, Question.category_id, Question.correct_answer, Question.option_a,
+            Question.option_b, Question.option_c, Question.option_d, Category.difficulty_multiplier
+        ).join(Category, Question.category_id == Category.id).filter(Question.id.in_(missing)))
+        for row in result:
+            options = (row.option_a, row.option_b, row.option_c, row.option_d)
+            key[row.id] = (
+                answer_code(row.correct_answer, options), row.difficulty_multiplier, row.category_id)
+    return key
+
+
+class QuizSessionEngine:
+    """ live quiz sessions held in memory with write-behind persistence
+
+    answers and status changes only touch memory; dirty sessions and
+    their answers are written in batches every `flush_interval` seconds.
+    finished sessions are written right away and dropped from memory,
+    everything left is written on shutdown.
+
+    a live session belongs to one worker: its row carries the owner and a
+    lease renewed every lease / 3 seconds. another worker only restores
+    the session once the lease has lapsed (or was released on shutdown),
+    and writes are guarded so a worker that lost its lease can't
+    overwrite the new owner's progress.
+    """
+
+    def __init__(self, idle_timeout: int, flush_interval: float, lease: int):
+        self.idle_timeout = idle_timeout
+        self.flush_interval = flush_interval
+        self.lease = lease
+        self.worker_id = uuid.uuid4().hex
+        self.sessions: Dict[str, LiveSession] = {}
+        self.wheel = TimerWheel(idle_timeout)
+        self._dirty: Set[str] = set()
+        self._history: List[dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    # === lifecycle ===
+
+    async def start(
+            self, db: AsyncSession, user_id: int, session_type: SessionType,
+            category_id: Optional[int], question_ids: List[int]) -> LiveSession:
+        session = LiveSession(
+            str(uuid.uuid4()), user_id, session_type, category_id, question_ids,
+            await resolve_answer_key(db, question_ids))
+        self.sessions[session.id] = session
+        self._dirty.add(session.id)
+        self.wheel.schedule(session.id)
+        return session
+
+    async def get(self, session_id: str) -> Optional[LiveSession]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = await self._restore(session_id)
+        return session
+
+    async def answer(self, session: LiveSession, question_id: int, answer: AnswerOption) -> dict:
+        if session.status in FINISHED:
+            raise InvalidTransition(f'Session is {session.status.value}')
+        if question_id not in session.key:
+            raise QuizSessionError('Question is not part of this session')
+        if question_id in session.answers:
+            raise QuizSessionError('Question already answered')
+
+        if session.status == SessionStatus.STARTED:
+            session.transition(SessionStatus.IN_PROGRESS)
+
+        code, multiplier, category_id = session.key[question_id]
+        is_correct = code != NO_ANSWER and ANSWER_OPTIONS[code] == answer
+        points = multiplier if is_correct else 0.0
+
+        session.answers[question_id] = answer
+        session.correct_count += is_correct
+        session.score += points
+        session.last_activity_at = datetime.now(timezone.utc)
+        self._history.append({
+            'user_id': session.user_id,
+            'session_id': session.id,
+            'question_id': question_id,
+            'answer': answer.value,
+            'is_correct': is_correct,
+            'points': points,
+            'answered_at': session.last_activity_at,
+        })
+        self._dirty.add(session.id)
+        self.wheel.schedule(session.id)
+
+        result = {
+            'question_id': question_id,
+            'correct': is_correct,
+            'correct_answer': ANSWER_OPTIONS[code].value if code != NO_ANSWER else None,
+            'points': points,
+        }
+        if session.session_type == SessionType.DAILY_CHALLENGE:
+            completed = daily_challenge.record(
+                session.user_id, session.started_at.date(), is_correct, points)
+            result['challenges_completed'] = [challenge.value for challenge in completed]
+
+        if len(session.answers) == len(session.question_ids):
+            await self.finish(session, SessionStatus.COMPLETED)
+
+        # the answer is already counted, a statistics failure must not fail it
+        try:
+            await user_stats.record(session.user_id, category_id, is_correct)
+        except Exception:
+            logger.exception('Statistics of an answer in quiz session %s were not recorded', session.id)
+        return result
+
+    async def finish(self, session: LiveSession, status: SessionStatus) -> None:
+        """ move to a final status and write the session through at once,
+            a failed write stays queued for the background flush
+        """
+        session.transition(status)
+        self.wheel.cancel(session.id)
+        if status == SessionStatus.COMPLETED:
+            leaderboards.record(session.user_id, session.category_id, session.score)
+        self._dirty.add(session.id)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception('Quiz session %s write-through failed, retrying in background', session.id)
+
+    # === persistence ===
+
+    async def flush(self) -> int:
+        """ write dirty sessions and buffered answers in two batched
+            statements, returns the number of sessions written
+        """
+        async with self._flush_lock:
+            if not self._dirty and not self._history:
+                return 0
+
+            dirty, self._dirty = self._dirty, set()
+            history, self._history = self._history, []
+            sessions = [self.sessions[session_id] for session_id in dirty if session_id in self.sessions]
+            lease = datetime.now(timezone.utc) + timedelta(seconds=self.lease)
+            written = set()
+            try:
+                async with SessionLocal() as db:
+                    for batch in chunked(sessions, FLUSH_BATCH_SIZE):
+                        statement = dialect_insert(db, QuizSession).values([
+                            {**session.to_row(), 'owner': self._owner(session), 'lease_expires_at': lease}
+                            for session in batch
+                        ])
+                        statement = statement.on_conflict_do_update(
+                            index_elements=[QuizSession.id],
+                            set_={
+                                column: statement.excluded[column] for column in (
+                                    'status', 'answered_count', 'correct_count', 'score',
+                                    'last_activity_at', 'completed_at', 'owner', 'lease_expires_at')
+                            },
+                            # rows another worker has claimed or finished are left alone
+                            where=QuizSession.status.in_(LIVE) & or_(
+                                QuizSession.owner.is_(None), QuizSession.owner == self.worker_id)
+                        ).returning(QuizSession.id)
+                        written.update(await db.scalars(statement))
+                    # sessions first, answers reference them
+                    lost = {session.id for session in sessions} - written
+                    answers = [row for row in history if row['session_id'] not in lost]
+                    if answers:
+                        await db.execute(insert(QuestionHistory), answers)
+                    version = None
+                    if any(session.status == SessionStatus.COMPLETED and session.id in written
+                           for session in sessions):
+                        # other workers rebuild their leaderboards from the new results
+                        version = await bump_catalog_version(db, LEADERBOARDS)
+                    await db.commit()
+                if version is not None:
+                    leaderboard_watcher.applied(version)
+            except Exception:
+                # keep the writes for the next attempt
+                self._dirty |= dirty
+                self._history = history + self._history
+                raise
+
+            for session in sessions:
+                if session.id not in written:
+                    logger.warning('Quiz session %s was taken over by another worker', session.id)
+                    self._drop(session.id)
+                elif session.status in FINISHED and session.id not in self._dirty:
+                    self.sessions.pop(session.id, None)
+            return len(written)
+
+    def _owner(self, session: LiveSession) -> Optional[str]:
+        # finished sessions are released so nothing waits on their lease
+        return None if session.status in FINISHED else self.worker_id
+
+    def _drop(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+        self._dirty.discard(session_id)
+        self.wheel.cancel(session_id)
+
+    async def renew_leases(self) -> None:
+        """ extend the lease of every live session this worker holds
+        """
+        async with SessionLocal() as db:
+            await db.execute(update(QuizSession).filter(
+                QuizSession.owner == self.worker_id, QuizSession.status.in_(LIVE)
+            ).values(lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.lease)))
+            await db.commit()
+
+    async def release_leases(self) -> None:
+        async with SessionLocal() as db:
+            await db.execute(update(QuizSession).filter(
+                QuizSession.owner == self.worker_id
+            ).values(owner=None, lease_expires_at=None))
+            await db.commit()
+
+    async def _claim(self, db: AsyncSession, session_id: str) -> bool:
+        """ take the lease on a live session unless another worker holds it
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(update(QuizSession).filter(
+            QuizSession.id == session_id, QuizSession.status.in_(LIVE),
+            or_(
+                QuizSession.owner.is_(None), QuizSession.owner == self.worker_id,
+                QuizSession.lease_expires_at < now)
+        ).values(
+            owner=self.worker_id, lease_expires_at=now + timedelta(seconds=self.lease)
+        ).execution_options(synchronize_session=False))
+        await db.commit()
+        return result.rowcount == 1
+
+    async def _restore(self, session_id: str) -> Optional[LiveSession]:
+        """ reload an unfinished session written before a restart or by
+            a worker whose lease has lapsed; one left idle past the
+            timeout meanwhile comes back expired
+        """
+        async with SessionLocal() as db:
+            row = await db.get(QuizSession, session_id)
+            if row is None or row.status in FINISHED:
+                return None
+            if not await self._claim(db, session_id):
+                raise SessionOwnedElsewhere('Quiz session is active on another server')
+
+            answered = (await db.execute(
+                select(QuestionHistory.question_id, QuestionHistory.answer)
+                .filter(QuestionHistory.session_id == session_id))).all()
+            session = LiveSession(
+                row.id, row.user_id, row.session_type, row.category_id, list(row.question_ids),
+                await resolve_answer_key(db, list(row.question_ids)))
+
+        session.status = row.status
+        session.answers = {question_id: AnswerOption(answer) for question_id, answer in answered}
+        session.correct_count = row.correct_count
+        session.score = row.score
+        session.started_at = _aware(row.started_at)
+        session.last_activity_at = _aware(row.last_activity_at)
+
+        # a concurrent request restored it first
+        if session_id in self.sessions:
+            return self.sessions[session_id]
+
+        self.sessions[session.id] = session
+        idle = (datetime.now(timezone.utc) - session.last_activity_at).total_seconds()
+        if idle >= self.idle_timeout:
+            await self.finish(session, SessionStatus.EXPIRED)
+        else:
+            self.wheel.schedule(session.id)
+        return session
+
+    # === background tasks ===
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception('Quiz session flush failed')
+
+    async def _lease_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await self.renew_leases()
+            except Exception:
+                logger.exception('Quiz session lease renewal failed')
+
+    async def _expiry_loop(self) -> None:
+        while True:
+            await asyncio.sleep(1)
+            for session_id in self.wheel.tick():
+                session = self.sessions.get(session_id)
+                if session is not None and session.status not in FINISHED:
+                    session.transition(SessionStatus.EXPIRED)
+                    self._dirty.add(session_id)
+
+    def start_background(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._expiry_loop()),
+            asyncio.create_task(self._lease_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.flush()
+        await self.release_leases()
+
+    def stats(self) -> dict:
+        return {
+            'live_sessions': len(self.sessions),
+            'dirty_sessions': len(self._dirty),
+            'buffered_answers': len(self._history),
+        }
+
+
+def _aware(value: datetime) -> datetime:
+    # sqlite hands timestamps back without a timezone
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+quiz_engine = QuizSessionEngine(
+    idle_timeout=settings.QUIZ_IDLE_TIMEOUT, flush_interval=settings.QUIZ_FLUSH_INTERVAL,
+    lease=settings.QUIZ_SESSION_LEASE)
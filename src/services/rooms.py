@@ -0,0 +1,401 @@
+# Standard library imports
+import json
+import uuid
+import asyncio
+import logging
+import secrets
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Third-party imports
+from fastapi import WebSocket
+
+# Local imports
+from src.core.config import settings
+from src.services.question_snapshot import ANSWER_OPTIONS, NO_ANSWER
+from src.services.user_stats import user_stats
+from src.utils.enums import AnswerOption, RoomStatus, RoomType
+
+
+TRANSITIONS = {
+    RoomStatus.WAITING: {RoomStatus.STARTING, RoomStatus.CANCELLED},
+    RoomStatus.STARTING: {RoomStatus.ACTIVE, RoomStatus.CANCELLED},
+    RoomStatus.ACTIVE: {RoomStatus.FINISHED, RoomStatus.CANCELLED},
+    RoomStatus.FINISHED: set(),
+    RoomStatus.CANCELLED: set(),
+}
+
+FINISHED = {RoomStatus.FINISHED, RoomStatus.CANCELLED}
+
+# close code for members dropped because their send queue filled up
+SLOW_CONSUMER = 1013
+
+logger = logging.getLogger(__name__)
+
+
+class RoomError(Exception):
+    """ raised for joins, starts and answers the room can't accept
+    """
+
+
+class Connection:
+    """ one websocket with its own bounded send queue
+
+    the room only ever calls send(), which never waits: a member whose
+    queue is full is too slow to keep up and gets disconnected instead
+    of holding back everyone else.
+    """
+
+    __slots__ = ('user_id', 'websocket', 'queue', 'sender')
+
+    def __init__(self, user_id: int, websocket: WebSocket, queue_size: int):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.sender = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self) -> None:
+        # a failed send means the socket is gone, the receive side
+        # notices and removes the connection
+        with suppress(Exception):
+            while True:
+                await self.websocket.send_text(await self.queue.get())
+
+    def send(self, message: str) -> bool:
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def send_json(self, payload: dict) -> bool:
+        return self.send(json.dumps(payload, default=str))
+
+    async def close(self, code: int = 1000) -> None:
+        if self.sender is not None:
+            self.sender.cancel()
+            await asyncio.gather(self.sender, return_exceptions=True)
+        with suppress(Exception):
+            await self.websocket.close(code)
+
+
+class Player:
+    __slots__ = ('user_id', 'username', 'score', 'correct')
+
+    def __init__(self, user_id: int, username: str):
+        self.user_id = user_id
+        self.username = username
+        self.score = 0.0
+        self.correct = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'user_id': self.user_id,
+            'username': self.username,
+            'score': round(self.score, 3),
+            'correct': self.correct,
+        }
+
+
+class Room:
+    """ one multiplayer quiz, WAITING -> STARTING -> ACTIVE -> FINISHED
+        or CANCELLED
+
+    every message is serialized once and the same string is queued on
+    each connection. answer times are measured on the server, from the
+    moment a question is broadcast to the moment its answer arrives.
+    """
+
+    def __init__(
+            self, room_type: RoomType, host_id: int, category_id: Optional[int],
+            questions: List[dict], key: Dict[int, Tuple[int, float, int]], max_players: int):
+        self.id = str(uuid.uuid4())
+        self.room_type = room_type
+        self.host_id = host_id
+        self.category_id = category_id
+        self.join_code = secrets.token_urlsafe(6) if room_type == RoomType.PRIVATE else None
+        self.questions = questions
+        # question id -> (correct option code, points for a correct answer, category id)
+        self.key = key
+        self.max_players = max_players
+        self.status = RoomStatus.WAITING
+        self.players: Dict[int, Player] = {}
+        self.connections: Dict[int, Connection] = {}
+        self.created_at = datetime.now(timezone.utc)
+        self.dropped = 0
+
+        self._index: Optional[int] = None
+        self._question_started = 0.0
+        self._answers: Dict[int, Tuple[AnswerOption, float]] = {}
+        self._all_answered = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def transition(self, status: RoomStatus) -> None:
+        if status not in TRANSITIONS[self.status]:
+            raise RoomError(f'Cannot move room from {self.status.value} to {status.value}')
+        self.status = status
+
+    def summary(self) -> dict:
+        return {
+            'id': self.id,
+            'room_type': self.room_type.value,
+            'status': self.status.value,
+            'host_id': self.host_id,
+            'category_id': self.category_id,
+            'question_count': len(self.questions),
+            'players': len(self.players),
+            'max_players': self.max_players,
+            'created_at': self.created_at,
+        }
+
+    def standings(self) -> List[dict]:
+        players = sorted(self.players.values(), key=lambda player: (-player.score, player.user_id))
+        return [player.to_dict() for player in players]
+
+    # === membership ===
+
+    def join(self, user_id: int, username: str, connection: Connection) -> None:
+        if self.status in FINISHED:
+            raise RoomError('Room is closed')
+        if user_id not in self.players:
+            if self.status != RoomStatus.WAITING:
+                raise RoomError('Game already started')
+            if len(self.players) >= self.max_players:
+                raise RoomError('Room is full')
+            self.players[user_id] = Player(user_id, username)
+
+        # a second connection of the same user replaces the first
+        previous = self.connections.get(user_id)
+        if previous is not None:
+            asyncio.create_task(previous.close())
+        self.connections[user_id] = connection
+        connection.start()
+        self.broadcast({'type': 'players', 'players': self.standings(), 'host_id': self.host_id})
+
+    def leave(self, user_id: int, connection: Connection) -> None:
+        if self.connections.get(user_id) is not connection:
+            return
+        del self.connections[user_id]
+
+        if self.status == RoomStatus.WAITING:
+            # players can walk out of the lobby, once the game has
+            # started they keep their score and may reconnect
+            self.players.pop(user_id, None)
+            if user_id == self.host_id and self.players:
+                self.host_id = next(iter(self.players))
+        if not self.connections and self.status not in FINISHED:
+            self.cancel()
+        elif self.status == RoomStatus.WAITING:
+            self.broadcast({'type': 'players', 'players': self.standings(), 'host_id': self.host_id})
+        elif self._waiting_for_nobody():
+            self._all_answered.set()
+
+    def broadcast(self, payload: dict) -> None:
+        message = json.dumps(payload, default=str)
+        slow = [
+            connection for connection in self.connections.values()
+            if not connection.send(message)
+        ]
+        for connection in slow:
+            del self.connections[connection.user_id]
+            self.dropped += 1
+            asyncio.create_task(connection.close(SLOW_CONSUMER))
+        if slow and not self.connections:
+            self.cancel()
+
+    # === game ===
+
+    def start(self, user_id: int, on_done) -> None:
+        if user_id != self.host_id:
+            raise RoomError('Only the host can start the game')
+        self.transition(RoomStatus.STARTING)
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(lambda task: on_done(self, task))
+
+    def cancel(self) -> None:
+        if self.status in FINISHED:
+            return
+        self.transition(RoomStatus.CANCELLED)
+        self.broadcast({'type': 'cancelled'})
+        if self._task is not None:
+            self._task.cancel()
+
+    def answer(self, user_id: int, answer: AnswerOption) -> float:
+        """ record an answer to the current question, returns the
+            server-measured answer time in seconds
+        """
+        if self.status != RoomStatus.ACTIVE or self._index is None:
+            raise RoomError('No question is open')
+        if user_id not in self.players:
+            raise RoomError('Not a player in this room')
+        if user_id in self._answers:
+            raise RoomError('Question already answered')
+
+        elapsed = asyncio.get_running_loop().time() - self._question_started
+        if elapsed > settings.ROOM_QUESTION_TIME:
+            raise RoomError('Time is up')
+
+        self._answers[user_id] = (answer, elapsed)
+        if self._waiting_for_nobody():
+            self._all_answered.set()
+        return elapsed
+
+    def _waiting_for_nobody(self) -> bool:
+        return all(user_id in self._answers for user_id in self.connections)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.broadcast({'type': 'starting', 'delay': settings.ROOM_START_DELAY})
+        await asyncio.sleep(settings.ROOM_START_DELAY)
+        self.transition(RoomStatus.ACTIVE)
+
+        for index, question in enumerate(self.questions):
+            self._answers = {}
+            self._all_answered.clear()
+            self._index = index
+            self._question_started = loop.time()
+            self.broadcast({
+                'type': 'question',
+                'index': index,
+                'total': len(self.questions),
+                'time_limit': settings.ROOM_QUESTION_TIME,
+                'question': question,
+            })
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._all_answered.wait(), settings.ROOM_QUESTION_TIME)
+            self._index = None
+
+            results = await self._score(question['id'])
+            code = self.key[question['id']][0] if question['id'] in self.key else NO_ANSWER
+            self.broadcast({
+                'type': 'reveal',
+                'index': index,
+                'question_id': question['id'],
+                'correct_answer': ANSWER_OPTIONS[code].value if code != NO_ANSWER else None,
+                'results': results,
+                'standings': self.standings(),
+            })
+            await asyncio.sleep(settings.ROOM_REVEAL_TIME)
+
+        self.transition(RoomStatus.FINISHED)
+        self.broadcast({'type': 'finished', 'standings': self.standings()})
+
+    async def _score(self, question_id: int) -> Dict[int, float]:
+        """ points per answering player: a correct answer earns the
+            category multiplier, scaled down to half for the slowest
+        """
+        code, multiplier, category_id = self.key.get(question_id, (NO_ANSWER, 1.0, None))
+        results = {}
+        outcomes = []
+        for user_id, (answer, elapsed) in self._answers.items():
+            is_correct = code != NO_ANSWER and ANSWER_OPTIONS[code] == answer
+            outcomes.append((user_id, is_correct))
+            points = 0.0
+            if is_correct:
+                points = multiplier * (1 - 0.5 * elapsed / settings.ROOM_QUESTION_TIME)
+                player = self.players[user_id]
+                player.score += points
+                player.correct += 1
+            results[user_id] = round(points, 3)
+
+        # the scores stand even when the statistics can't be recorded
+        try:
+            for user_id, is_correct in outcomes:
+                await user_stats.record(user_id, category_id, is_correct)
+        except Exception:
+            logger.exception('Statistics of room %s were not recorded', self.id)
+        return results
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        connections, self.connections = list(self.connections.values()), {}
+        await asyncio.gather(*(connection.close() for connection in connections))
+
+
+class RoomManager:
+    """ rooms of this process; finished and cancelled rooms are closed
+        and forgotten once their game task ends
+
+    rooms are not shared between workers: a room only exists on the
+    worker that created it. deploy with a single worker, or route every
+    /rooms request of a room (create, detail, websocket) to the same
+    worker, e.g. sticky routing on the room id.
+    """
+
+    def __init__(self):
+        self.rooms: Dict[str, Room] = {}
+        self.finished = 0
+
+    def add(self, room: Room) -> Room:
+        self.prune()
+        self.rooms[room.id] = room
+        return room
+
+    def prune(self) -> int:
+        """ drop lobbies nobody joined within ROOM_LOBBY_TIMEOUT
+        """
+        now = datetime.now(timezone.utc)
+        stale = [
+            room for room in self.rooms.values()
+            if room.status == RoomStatus.WAITING and not room.connections
+            and (now - room.created_at).total_seconds() > settings.ROOM_LOBBY_TIMEOUT
+        ]
+        for room in stale:
+            self.discard(room)
+        return len(stale)
+
+    def get(self, room_id: str) -> Optional[Room]:
+        return self.rooms.get(room_id)
+
+    def open_rooms(self) -> List[Room]:
+        return [
+            room for room in self.rooms.values()
+            if room.status == RoomStatus.WAITING and room.room_type != RoomType.PRIVATE
+        ]
+
+    def start(self, room: Room, user_id: int) -> None:
+        room.start(user_id, self._done)
+
+    def discard(self, room: Room) -> None:
+        """ forget a room nobody is connected to anymore
+        """
+        if not room.connections and self.rooms.pop(room.id, None) is not None:
+            room.cancel()
+            self.finished += 1
+
+    def _done(self, room: Room, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            # tell the players instead of leaving the room active forever
+            logger.error('Game of room %s failed', room.id, exc_info=task.exception())
+            room.cancel()
+        if self.rooms.pop(room.id, None) is not None:
+            self.finished += 1
+        asyncio.create_task(room.close())
+
+    async def stop(self) -> None:
+        rooms, self.rooms = list(self.rooms.values()), {}
+        for room in rooms:
+            room.cancel()
+        await asyncio.gather(*(room.close() for room in rooms), return_exceptions=True)
+
+    def stats(self) -> dict:
+        statuses: Dict[str, int] = {}
+        for room in self.rooms.values():
+            statuses[room.status.value] = statuses.get(room.status.value, 0) + 1
+        return {
+            'rooms': len(self.rooms),
+            'by_status': statuses,
+            'connections': sum(len(room.connections) for room in self.rooms.values()),
+            'dropped_slow_connections': sum(room.dropped for room in self.rooms.values()),
+            'finished': self.finished,
+        }
+
+
+room_manager = RoomManager()
@@ -0,0 +1,78 @@
+# Standard library imports
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+# Third-party imports
+from sqlalchemy import delete, or_, select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.authentication import EmailVerification, UserSession
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _purge(db, model, condition, batch_size: int) -> int:
+    """ delete expired rows in batches of `batch_size`, returns rows deleted
+
+    batches are picked with FOR UPDATE SKIP LOCKED (postgres), so several
+    workers sweeping at the same time split the work instead of blocking.
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size)
+        if db.bind.dialect.name == 'postgresql':
+            batch = batch.with_for_update(skip_locked=True)
+
+        ids = (await db.scalars(batch)).all()
+        if not ids:
+            break
+
+        await db.execute(delete(model).where(model.id.in_(ids)))
+        await db.commit()
+        total += len(ids)
+
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+async def sweep_expired(batch_size: int) -> dict:
+    """ one cleanup cycle over expired sessions and stale otp rows
+    """
+    now = datetime.now(timezone.utc)
+    async with SessionLocal() as db:
+        sessions = await _purge(
+            db, UserSession, UserSession.expires_at < now, batch_size)
+
+        # expires_at is cleared once an otp is used or given up on
+        verifications = await _purge(
+            db, EmailVerification,
+            or_(EmailVerification.expires_at < now,
+                EmailVerification.expires_at.is_(None)),
+            batch_size)
+
+    return {'user_sessions': sessions, 'email_verification': verifications}
+
+
+async def run_sweeper(interval: float, batch_size: int) -> None:
+    while True:
+        try:
+            purged = await sweep_expired(batch_size)
+            logger.info(
+                'Purged %d expired sessions and %d stale otp rows',
+                purged['user_sessions'], purged['email_verification'])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception('Session sweep failed')
+
+        await asyncio.sleep(interval)
+
+
+def start_sweeper() -> asyncio.Task:
+    return asyncio.create_task(run_sweeper(
+        settings.SWEEPER_INTERVAL, settings.SWEEPER_BATCH_SIZE))
@@ -0,0 +1,281 @@
+# Standard library imports
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+# Third-party imports
+from sqlalchemy import case, select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.analytics import UserStatistics
+from src.utils.iterables import chunked
+from src.utils.upsert import dialect_insert
+
+
+logger = logging.getLogger(__name__)
+
+# category_id of the row with a user's totals
+OVERALL = 0
+
+# rows per multi-row upsert, keeps bind parameters under driver limits
+FLUSH_BATCH_SIZE = 1000
+
+StatsKey = Tuple[int, int]
+
+
+class Counters:
+    __slots__ = ('answered', 'correct', 'current_streak', 'best_streak')
+
+    def __init__(self, answered: int = 0, correct: int = 0,
+                 current_streak: int = 0, best_streak: int = 0):
+        self.answered = answered
+        self.correct = correct
+        self.current_streak = current_streak
+        self.best_streak = best_streak
+
+    def add(self, is_correct: bool) -> None:
+        self.answered += 1
+        if is_correct:
+            self.correct += 1
+            self.current_streak += 1
+            self.best_streak = max(self.best_streak, self.current_streak)
+        else:
+            self.current_streak = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'answered': self.answered,
+            'correct': self.correct,
+            'accuracy': round(self.correct / self.answered, 4) if self.answered else 0.0,
+            'current_streak': self.current_streak,
+            'best_streak': self.best_streak,
+        }
+
+
+class Delta:
+    """ answers recorded since the last flush; `streak` counts the
+        correct answers after the last miss, `reset` whether there was one
+    """
+    __slots__ = ('answered', 'correct', 'streak', 'best_streak', 'reset')
+
+    def __init__(self):
+        self.answered = 0
+        self.correct = 0
+        self.streak = 0
+        self.best_streak = 0
+        self.reset = False
+
+    def add(self, is_correct: bool, best_streak: int) -> None:
+        self.answered += 1
+        if is_correct:
+            self.correct += 1
+            self.streak += 1
+        else:
+            self.streak = 0
+            self.reset = True
+        self.best_streak = best_streak
+
+    def merge(self, newer: 'Delta') -> 'Delta':
+        """ fold a delta recorded after this one into it
+        """
+        self.answered += newer.answered
+        self.correct += newer.correct
+        self.streak = newer.streak if newer.reset else self.streak + newer.streak
+        self.reset = self.reset or newer.reset
+        self.best_streak = max(self.best_streak, newer.best_streak)
+        return self
+
+
+def _greatest(*values):
+    # GREATEST() is spelled max() on sqlite, a CASE works everywhere
+    result = values[0]
+    for value in values[1:]:
+        result = case((value > result, value), else_=result)
+    return result
+
+
+class UserStatsService:
+    """ per-user answer counters, overall and per category
+
+    a user's rows are loaded once on first use, after that every graded
+    answer updates two counters and a read costs a dict lookup. changed
+    counters are written back in batched upserts every `interval`
+    seconds and on shutdown.
+
+    the upserts add what was answered since the last flush to the stored
+    row instead of overwriting it, so several workers can update the same
+    user without losing each other's answers.
+
+    after a flush, the least recently used users beyond `max_users`
+    whose answers are all written are dropped and loaded again on their
+    next use.
+    """
+
+    def __init__(self, interval: float, max_users: int):
+        self.interval = interval
+        self.max_users = max_users
+        self.flushed = 0
+        self._counters: Dict[StatsKey, Counters] = {}
+        # loaded users in least recently used order
+        self._categories: OrderedDict[int, Set[int]] = OrderedDict()
+        self._pending: Dict[StatsKey, Delta] = {}
+        self._task = None
+
+    async def load(self, user_id: int) -> None:
+        if user_id in self._categories:
+            self._categories.move_to_end(user_id)
+            return
+
+        async with SessionLocal() as db:
+            rows = (await db.execute(
+                select(UserStatistics).filter(UserStatistics.user_id == user_id))).scalars().all()
+
+        # another request may have loaded the user while we waited
+        if user_id in self._categories:
+            return
+        categories = self._categories[user_id] = set()
+        for row in rows:
+            self._counters[(user_id, row.category_id)] = Counters(
+                row.answered, row.correct, row.current_streak, row.best_streak)
+            if row.category_id != OVERALL:
+                categories.add(row.category_id)
+
+    async def record(self, user_id: int, category_id: Optional[int], is_correct: bool) -> None:
+        await self.load(user_id)
+
+        keys = [(user_id, OVERALL)]
+        if category_id is not None:
+            keys.append((user_id, category_id))
+            self._categories[user_id].add(category_id)
+        for key in keys:
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = Counters()
+            counters.add(is_correct)
+            delta = self._pending.get(key)
+            if delta is None:
+                delta = self._pending[key] = Delta()
+            delta.add(is_correct, counters.best_streak)
+
+    async def get(self, user_id: int, category_id: Optional[int] = None) -> dict:
+        await self.load(user_id)
+        if category_id is not None:
+            counters = self._counters.get((user_id, category_id)) or Counters()
+            return {'category_id': category_id, **counters.to_dict()}
+
+        overall = self._counters.get((user_id, OVERALL)) or Counters()
+        return {
+            **overall.to_dict(),
+            'categories': {
+                category: self._counters[(user_id, category)].to_dict()
+                for category in sorted(self._categories[user_id])
+            },
+        }
+
+    async def flush(self) -> int:
+        if not self._pending:
+            self._evict()
+            return 0
+
+        # swap the deltas first so answers during the flush stay pending
+        pending, self._pending = self._pending, {}
+        now = datetime.now(timezone.utc)
+        rows = {True: [], False: []}
+        for (user_id, category_id), delta in pending.items():
+            rows[delta.reset].append({
+                'user_id': user_id,
+                'category_id': category_id,
+                'answered': delta.answered,
+                'correct': delta.correct,
+                'current_streak': delta.streak,
+                'best_streak': delta.best_streak,
+                'updated_at': now,
+            })
+
+        try:
+            async with SessionLocal() as db:
+                for reset, batch_rows in rows.items():
+                    for batch in chunked(batch_rows, FLUSH_BATCH_SIZE):
+                        await db.execute(self._upsert(db, batch, reset))
+                await db.commit()
+        except Exception:
+            for key, delta in pending.items():
+                newer = self._pending.get(key)
+                self._pending[key] = delta.merge(newer) if newer is not None else delta
+            raise
+
+        self.flushed += len(pending)
+        self._evict()
+        return len(pending)
+
+    def _evict(self) -> None:
+        excess = len(self._categories) - self.max_users
+        if excess <= 0:
+            return
+
+        # every answer adds to the overall counters, so a user without
+        # a pending overall delta has nothing left to write
+        evicted = []
+        for user_id in self._categories:
+            if len(evicted) == excess:
+                break
+            if (user_id, OVERALL) not in self._pending:
+                evicted.append(user_id)
+        for user_id in evicted:
+            for category_id in self._categories.pop(user_id):
+                self._counters.pop((user_id, category_id), None)
+            self._counters.pop((user_id, OVERALL), None)
+
+    @staticmethod
+    def _upsert(db, batch: list, reset: bool):
+        """ add a batch of deltas to the stored counters; after a miss
+            the current streak restarts from the delta's
+        """
+        statement = dialect_insert(db, UserStatistics).values(batch)
+        excluded = statement.excluded
+        current_streak = excluded.current_streak if reset else (
+            UserStatistics.current_streak + excluded.current_streak)
+        return statement.on_conflict_do_update(
+            index_elements=[UserStatistics.user_id, UserStatistics.category_id],
+            set_={
+                'answered': UserStatistics.answered + excluded.answered,
+                'correct': UserStatistics.correct + excluded.correct,
+                'current_streak': current_streak,
+                'best_streak': _greatest(
+                    UserStatistics.best_streak, excluded.best_streak, current_streak),
+                'updated_at': excluded.updated_at,
+            })
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception('User statistics flush failed')
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            'users': len(self._categories),
+            'counters': len(self._counters),
+            'dirty': len(self._pending),
+            'flushed': self.flushed,
+        }
+
+
+user_stats = UserStatsService(
+    interval=settings.STATS_FLUSH_INTERVAL, max_users=settings.STATS_CACHE_USERS)
@@ -1,11 +1,16 @@
+# Standard library imports
+import time
+
 # Local imports
 from src.core.database import SessionLocal
+from src.core.pool_metrics import pool_metrics
 
 
 # Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
+        # check out the connection up front so pool wait time is measured
+        started = time.perf_counter()
+        await db.connection()
+        pool_metrics.record_wait(time.perf_counter() - started)
         yield db
-    finally:
-        db.close()
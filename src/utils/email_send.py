@@ -7,27 +7,43 @@ from email.message import EmailMessage
 from src.core.config import settings
 
 
-def send_email(email_receiver: str, otp: int) -> bool:
+def build_otp_message(email_receiver: str, otp: int) -> EmailMessage:
     html_content = f'get {otp}'
     em = EmailMessage()
     em['From'] = settings.SENDER_EMAIL
     em['To'] = email_receiver
     em['Subject'] = 'Verify Email'
     em.set_content(html_content, subtype='html')
+    return em
+
+
+def open_smtp_connection() -> smtplib.SMTP:
+    """ connect and log in to the configured smtp server
+    """
+    host = settings.EMAIL_HOST.get_secret_value()
+    if settings.EMAIL_USE_SSL:
+        # establish tls/ssl connection
+        context = ssl.create_default_context()
+        smtp = smtplib.SMTP_SSL(host, settings.EMAIL_PORT, context=context)
+    else:
+        smtp = smtplib.SMTP(host, settings.EMAIL_PORT)
 
-    # establish tls/ssl connection
-    context = ssl.create_default_context()
+    # local stand-in servers usually don't offer auth
+    smtp.ehlo()
+    if smtp.has_extn('auth'):
+        smtp.login(
+            settings.SENDER_EMAIL,
+            settings.SENDER_PASSWORD.get_secret_value())
+    return smtp
+
+
+def send_email(email_receiver: str, otp: int) -> bool:
+    em = build_otp_message(email_receiver, otp)
 
     try:
         # with help to properly close connection
-        with smtplib.SMTP_SSL(
-                settings.EMAIL_HOST.get_secret_value(),
-                settings.EMAIL_PORT, context=context) as smtp:
-            smtp.login(
-                settings.SENDER_EMAIL,
-                settings.SENDER_PASSWORD.get_secret_value())
-            smtp.sendmail(
-                settings.SENDER_EMAIL, email_receiver, em.as_string())
+        with open_smtp_connection() as smtp:
+            smtp.send_message(em)
         return True
     except smtplib.SMTPRecipientsRefused:
         return False    # Email not Valid
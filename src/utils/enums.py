@@ -29,6 +29,12 @@ class ChallengeType(str, Enum):
     PERFECT_QUIZ = "perfect_quiz"
 
 
+class DedupMode(str, Enum):
+    OFF = 'off'
+    FLAG = 'flag'
+    REJECT = 'reject'
+
+
 class UserSessionStatus(str, Enum):
     ACTIVE = "active"
     EXPIRED = "expired"
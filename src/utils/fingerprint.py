@@ -0,0 +1,92 @@
+# Standard library imports
+import re
+import random
+import hashlib
+import unicodedata
+from array import array
+from typing import Iterable, List, NamedTuple, Sequence
+
+
+# MinHash with 64 permutations split into 16 LSH bands of 4 rows: pairs
+# with a Jaccard similarity of 0.7 share a band with ~98% probability.
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+NUM_BANDS = NUM_PERMUTATIONS // BAND_ROWS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # fixed seed, signatures must be stable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+_SPACES = re.compile(r'\s+')
+
+
+class Fingerprint(NamedTuple):
+    exact_hash: str
+    # array('Q') of NUM_PERMUTATIONS minhash values, empty when near
+    # duplicate detection was off
+    signature: array
+
+    def band_keys(self) -> List[str]:
+        return band_keys(self.signature) if self.signature else []
+
+
+def normalize(text: str) -> str:
+    """ case, punctuation and whitespace insensitive form of `text`
+    """
+    text = unicodedata.normalize('NFKC', text).casefold()
+    text = _NON_WORD.sub(' ', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'little')
+
+
+def _shingles(question_text: str, options: Iterable[str]) -> set:
+    words = question_text.split()
+    shingles = set(words)
+    shingles.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+    shingles.update(f'option:{option}' for option in options)
+    return shingles or {''}
+
+
+def minhash(shingles: Iterable[str]) -> array:
+    hashes = [_hash64(shingle) for shingle in shingles]
+    return array('Q', (
+        min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS
+    ))
+
+
+def band_keys(signature: Sequence[int]) -> List[str]:
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = array('Q', signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]).tobytes()
+        keys.append(f'{band:02d}{hashlib.blake2b(rows, digest_size=8).hexdigest()}')
+    return keys
+
+
+def similarity(signature_a: Sequence[int], signature_b: Sequence[int]) -> float:
+    """ estimated Jaccard similarity of two minhash signatures
+    """
+    same = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return same / NUM_PERMUTATIONS
+
+
+def question_fingerprint(question_text: str, options: Iterable[str], near: bool = True) -> Fingerprint:
+    """ exact hash and, with `near`, minhash signature of a question;
+        option order doesn't matter
+    """
+    text = normalize(question_text)
+    options = sorted(normalize(option) for option in options)
+    exact = hashlib.sha1('\x1f'.join([text, *options]).encode()).hexdigest()
+    return Fingerprint(exact, minhash(_shingles(text, options)) if near else array('Q'))
+
+
+def signature_from_bytes(data: bytes) -> array:
+    signature = array('Q')
+    signature.frombytes(data)
+    return signature
@@ -1,17 +1,56 @@
-from fastapi import Request, Depends, HTTPException
-from src.utils.db import get_db
-from sqlalchemy.orm import Session
-from src.models.authentication import UserSession, User
+from fastapi import Request, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.authentication import UserSession
+from src.utils.session_cache import CurrentUser, session_cache
+from src.utils.session_token import decode_session_token, user_from_claims
+from src.utils.revocation import revocation_list
+from src.services.activity_tracker import activity_tracker
 from datetime import datetime, timezone
+from typing import Optional
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    session_id = request.cookies.get('session_id')
+# A database session is only opened on a cache miss, so cached
+# requests don't check out a pooled connection at all.
+async def get_current_user(request: Request) -> CurrentUser:
+    return await authenticate(request.cookies.get('session_id'))
+
+
+# Shared with websocket endpoints, which read the cookie themselves.
+async def authenticate(session_id: Optional[str]) -> CurrentUser:
     if not session_id:
         raise HTTPException(status_code=404, detail='Invalid session')
 
-    session = db.query(UserSession).filter(UserSession.session_token == session_id).first()
+    if settings.SESSION_MODE == 'token':
+        return await _user_from_token(session_id)
+
+    cached = session_cache.get(session_id)
+    if cached:
+        activity_tracker.touch(session_id)
+        return cached[0]
+
+    # load session and user in a single round trip
+    async with SessionLocal() as db:
+        session = await db.scalar(
+            select(UserSession).options(joinedload(UserSession.user))
+            .filter(UserSession.session_token == session_id))
     if not session or (session.expires_at < datetime.now(timezone.utc)):
         raise HTTPException(status_code=401, detail='Invalid session')
 
-    return session.user
+    user = CurrentUser.from_model(session.user)
+    session_cache.set(session_id, user, session.expires_at)
+    activity_tracker.touch(session_id)
+    return user
+
+
+# The user is built from the signed claims, so only a revocation
+# list hit (a rare bloom filter positive) reaches the database.
+async def _user_from_token(token: str) -> CurrentUser:
+    claims = decode_session_token(token)
+    if not claims or await revocation_list.is_revoked(claims['sid']):
+        raise HTTPException(status_code=401, detail='Invalid session')
+
+    activity_tracker.touch(claims['sid'])
+    return user_from_claims(claims)
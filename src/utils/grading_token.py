@@ -0,0 +1,44 @@
+# Standard library imports
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+# Third-party imports
+from jose import JWTError, jwt
+
+# Local imports
+from src.core.config import settings
+
+TOKEN_TYPE = 'grade'
+
+
+def create_grading_token(user_id: int, question_ids: List[int]) -> str:
+    """ signed list of the questions served to a user, the only ones
+        /quiz/grade grades for them
+    """
+    claims = {
+        'typ': TOKEN_TYPE,
+        'sub': str(user_id),
+        'jti': uuid.uuid4().hex,
+        'qid': list(question_ids),
+        'exp': datetime.now(timezone.utc) + timedelta(seconds=settings.QUIZ_GRADING_TOKEN_EXPIRE),
+    }
+    return jwt.encode(
+        claims, settings.SECRET_KEY.get_secret_value(),
+        algorithm=settings.SESSION_TOKEN_ALGORITHM)
+
+
+def decode_grading_token(token: str, user_id: int) -> Optional[dict]:
+    """ claims of a valid, unexpired token issued to `user_id`
+    """
+    try:
+        claims = jwt.decode(
+            token, settings.SECRET_KEY.get_secret_value(),
+            algorithms=[settings.SESSION_TOKEN_ALGORITHM])
+    except JWTError:
+        return None
+
+    if claims.get('typ') != TOKEN_TYPE or claims.get('sub') != str(user_id):
+        return None
+    claims['expires_at'] = datetime.fromtimestamp(claims['exp'], timezone.utc)
+    return claims
@@ -1,14 +1,87 @@
+# Standard library imports
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 # Third-party imports
 from passlib.context import CryptContext
 
+# Local imports
+from src.core.config import settings
 
-pwd_context: CryptContext = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+pwd_context: CryptContext = CryptContext(
+    schemes=['bcrypt'], deprecated='auto',
+    bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
-# Encrypt password
-def hash_password(password: str) -> str:
+
+class HashingBusyError(Exception):
+    """ raised when the hashing queue is full
+    """
+
+
+# Run inside the worker processes
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingService:
+    """ process pool for bcrypt, keeps hashing off the request threads
+
+    at most `max_pending` jobs may be queued or running; extra callers get
+    HashingBusyError instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: Optional[int], max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    async def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError('Too many pending password hashing jobs')
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+hashing_service = HashingService(
+    workers=settings.HASH_WORKERS or None,
+    max_pending=settings.HASH_MAX_PENDING)
+
+
+# Encrypt password
+async def hash_password(password: str) -> str:
+    return await hashing_service.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_service.verify(plain_password, hashed_password)
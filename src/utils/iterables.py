@@ -0,0 +1,9 @@
+# Standard library imports
+from itertools import islice
+from typing import Iterable, Iterator
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
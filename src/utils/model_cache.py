@@ -0,0 +1,84 @@
+# Standard library imports
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Local imports
+from src.core.config import settings
+
+
+_MISSING = object()
+
+
+class ModelCache:
+    """ size bounded LRU cache for model reads, versioned per table
+
+    every cache key embeds the table's version as it was when the read
+    started. writes bump the version, so entries loaded before a write
+    can no longer be reached and simply age out of the LRU. versions are
+    per process, so other workers' writes are only picked up once an
+    entry's `ttl` runs out: a read can be up to `ttl` seconds stale
+    after a write on another worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._versions: Dict[str, int] = {}
+        self._entries: OrderedDict = OrderedDict()
+
+    def version(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def bump(self, *tables: str) -> None:
+        for table in tables:
+            self._versions[table] = self.version(table) + 1
+
+    def get(self, table: str, key: Hashable, default: Any = None) -> Any:
+        full_key = (table, self.version(table), key)
+        entry = self._entries.get(full_key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[full_key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(full_key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, table: str, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        full_key = (table, self.version(table) if version is None else version, key)
+        self._entries[full_key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, table: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        version = self.version(table)
+        value = self.get(table, key, _MISSING)
+        if value is _MISSING:
+            value = await loader()
+            # stored under the version seen before loading, a write
+            # during the load leaves this entry unreachable
+            self.set(table, key, value, version)
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'versions': dict(self._versions),
+        }
+
+
+model_cache = ModelCache(maxsize=settings.MODEL_CACHE_SIZE, ttl=settings.MODEL_CACHE_TTL)
@@ -0,0 +1,44 @@
+# Standard library imports
+import hashlib
+from typing import Optional
+
+# Third-party imports
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def keyset_page(model, filters: list, after_id: Optional[int], limit: int):
+    """ rows after `after_id` in id order, seeks on the primary key
+        instead of OFFSET so deep pages cost the same as the first
+    """
+    query = select(model).filter(*filters).order_by(model.id).limit(limit)
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    return query
+
+
+async def page_etag(db: AsyncSession, model, filters: list, after_id: Optional[int], limit: int, params: str) -> str:
+    """ weak etag of one page, from row count, last id and newest updated_at
+
+    only the page's own index range is aggregated, so a repeat poll that
+    gets a 304 never loads or serializes the rows.
+    """
+    page = select(model.id, model.updated_at).filter(*filters).order_by(model.id).limit(limit)
+    if after_id is not None:
+        page = page.filter(model.id > after_id)
+    page = page.subquery()
+
+    count, last_id, last_updated = (await db.execute(
+        select(func.count(), func.max(page.c.id), func.max(page.c.updated_at))
+    )).one()
+
+    version = f'{params}|{count}|{last_id}|{last_updated}'
+    return 'W/"%s"' % hashlib.sha1(version.encode()).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
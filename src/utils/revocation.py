@@ -0,0 +1,117 @@
+# Standard library imports
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+# Third-party imports
+from sqlalchemy import select
+
+# Local imports
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models.authentication import UserSession
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key))
+
+
+class RevocationList:
+    """ revoked session ids for stateless session tokens
+
+    a bloom filter answers "definitely not revoked" without touching the
+    database; the rare positive is confirmed against user_sessions, where
+    a revoked session is kept with is_active=False until it expires.
+    the filter is rebuilt from the database at startup and then every
+    `interval` seconds, so a logout on another worker is enforced here
+    within one interval.
+    """
+
+    def __init__(self, bits: int, hashes: int, interval: float):
+        self.bits = bits
+        self.hashes = hashes
+        self.interval = interval
+        self._bloom = BloomFilter(bits, hashes)
+        # ids added locally while a rebuild is streaming
+        self._added: list = []
+        self._task = None
+
+    def add(self, session_id: str) -> None:
+        self._bloom.add(session_id)
+        self._added.append(session_id)
+
+    async def is_revoked(self, session_id: str) -> bool:
+        if session_id not in self._bloom:
+            return False
+
+        async with SessionLocal() as db:
+            is_active = await db.scalar(
+                select(UserSession.is_active)
+                .filter(UserSession.session_token == session_id))
+        return not is_active
+
+    async def rebuild(self) -> int:
+        # fill a new filter and swap it in, the old one keeps answering
+        # until then
+        bloom = BloomFilter(self.bits, self.hashes)
+        self._added = []
+        async with SessionLocal() as db:
+            result = await db.stream_scalars(
+                select(UserSession.session_token).filter(
+                    UserSession.is_active.is_(False),
+                    UserSession.expires_at > datetime.now(timezone.utc)))
+            count = 0
+            async for session_id in result:
+                bloom.add(session_id)
+                count += 1
+
+        # local revocations not yet committed when the query ran
+        for session_id in self._added:
+            bloom.add(session_id)
+        self._bloom, self._added = bloom, []
+        return count
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception('Revocation list refresh failed')
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+revocation_list = RevocationList(
+    bits=settings.REVOCATION_BLOOM_BITS, hashes=settings.REVOCATION_BLOOM_HASHES,
+    interval=settings.REVOCATION_REFRESH_INTERVAL)
@@ -0,0 +1,101 @@
+# Standard library imports
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+# Local imports
+from src.core.config import settings
+from src.models.authentication import User
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """ read-only copy of the user fields requests need, safe to share
+        between concurrent requests unlike a detached ORM instance
+    """
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    is_verified: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> 'CurrentUser':
+        return cls(user.id, user.email, user.username, user.is_active, user.is_verified)
+
+
+class SessionCache:
+    """ bounded LRU cache of session token -> (user, session expiry)
+
+    entries live for at most `ttl` seconds and never past the session's own
+    expiry, so a cached user is never returned for an expired session.
+    the cache is per process: a logout on another worker is only seen
+    here once the entry's ttl runs out, so keep the ttl short.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Tuple[CurrentUser, datetime, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_token: str) -> Optional[Tuple[CurrentUser, datetime]]:
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, expires_at, deadline = entry
+            if time.monotonic() >= deadline or expires_at < datetime.now(timezone.utc):
+                del self._entries[session_token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(session_token)
+            self.hits += 1
+            return user, expires_at
+
+    def set(self, session_token: str, user: CurrentUser, expires_at: datetime) -> None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0 or self.maxsize <= 0:
+            return
+
+        deadline = time.monotonic() + min(self.ttl, remaining)
+        with self._lock:
+            self._entries[session_token] = (user, expires_at, deadline)
+            self._entries.move_to_end(session_token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_token: str) -> None:
+        with self._lock:
+            self._entries.pop(session_token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+session_cache = SessionCache(
+    maxsize=settings.SESSION_CACHE_SIZE, ttl=settings.SESSION_CACHE_TTL)
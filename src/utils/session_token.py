@@ -0,0 +1,52 @@
+# Standard library imports
+from datetime import datetime, timezone
+from typing import Optional
+
+# Third-party imports
+from jose import JWTError, jwt
+
+# Local imports
+from src.core.config import settings
+from src.utils.session_cache import CurrentUser
+
+# claims every token must carry, enough to build the CurrentUser
+REQUIRED_CLAIMS = ('sub', 'sid', 'usr', 'eml', 'act', 'ver')
+
+
+def create_session_token(user: CurrentUser, session_id: str, expires_at: datetime) -> str:
+    """ signed token carrying the user fields, session id and expiry
+    """
+    claims = {
+        'sub': str(user.id),
+        'sid': session_id,
+        'usr': user.username,
+        'eml': user.email,
+        'act': user.is_active,
+        'ver': user.is_verified,
+        'exp': expires_at,
+    }
+    return jwt.encode(
+        claims, settings.SECRET_KEY.get_secret_value(),
+        algorithm=settings.SESSION_TOKEN_ALGORITHM)
+
+
+def decode_session_token(token: str, verify_exp: bool = True) -> Optional[dict]:
+    """ claims of a valid token, None when the signature or expiry is bad
+    """
+    try:
+        claims = jwt.decode(
+            token, settings.SECRET_KEY.get_secret_value(),
+            algorithms=[settings.SESSION_TOKEN_ALGORITHM],
+            options={'verify_exp': verify_exp})
+    except JWTError:
+        return None
+
+    if any(claim not in claims for claim in REQUIRED_CLAIMS):
+        return None
+    claims['expires_at'] = datetime.fromtimestamp(claims['exp'], timezone.utc)
+    return claims
+
+
+def user_from_claims(claims: dict) -> CurrentUser:
+    return CurrentUser(
+        int(claims['sub']), claims['eml'], claims['usr'], claims['act'], claims['ver'])
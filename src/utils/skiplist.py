@@ -0,0 +1,130 @@
+# Standard library imports
+import random
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+MAX_LEVEL = 16
+# each level holds about a quarter of the nodes of the one below
+LEVEL_PROBABILITY = 0.25
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.next: List[Optional['_Node']] = [None] * level
+        # positions skipped by next[i]; the end of the list counts as
+        # position len + 1, so widths stay valid when next[i] is None
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """ sorted list of unique keys with O(log n) insert, remove, rank
+        and positional access
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._head = _Node(None, MAX_LEVEL)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._rng.random() < LEVEL_PROBABILITY:
+            level += 1
+        return level
+
+    def _path(self, key: Any):
+        """ last node before `key` on every level and its position
+        """
+        update = [self._head] * MAX_LEVEL
+        positions = [0] * MAX_LEVEL
+        node, position = self._head, 0
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            positions[level] = position
+        return update, positions
+
+    def insert(self, key: Any) -> None:
+        update, positions = self._path(key)
+        position = positions[0] + 1
+        node = _Node(key, self._random_level())
+
+        for level in range(len(node.next)):
+            previous = update[level]
+            skipped = position - positions[level]
+            node.next[level] = previous.next[level]
+            node.width[level] = previous.width[level] - skipped + 1
+            previous.next[level] = node
+            previous.width[level] = skipped
+        for level in range(len(node.next), MAX_LEVEL):
+            update[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> bool:
+        update, _ = self._path(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+
+        for level in range(len(node.next)):
+            update[level].width[level] += node.width[level] - 1
+            update[level].next[level] = node.next[level]
+        for level in range(len(node.next), MAX_LEVEL):
+            update[level].width[level] -= 1
+        self._size -= 1
+        return True
+
+    def rank(self, key: Any) -> Optional[int]:
+        """ 1-based position of `key`, None when it isn't in the list
+        """
+        update, positions = self._path(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return None
+        return positions[0] + 1
+
+    def slice(self, start: int, count: int) -> Iterator[Any]:
+        """ up to `count` keys starting at 0-based index `start`
+        """
+        if start < 0 or start >= self._size:
+            return
+
+        node, position = self._head, 0
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and position + node.width[level] <= start + 1:
+                position += node.width[level]
+                node = node.next[level]
+        while node is not None and count > 0:
+            yield node.key
+            node = node.next[0]
+            count -= 1
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any], rng: Optional[random.Random] = None) -> 'IndexableSkipList':
+        """ build from keys already in ascending order in O(n)
+        """
+        skiplist = cls(rng)
+        tails = [skiplist._head] * MAX_LEVEL
+        tail_positions = [0] * MAX_LEVEL
+
+        position = 0
+        for position, key in enumerate(keys, 1):
+            node = _Node(key, skiplist._random_level())
+            for level in range(len(node.next)):
+                tails[level].next[level] = node
+                tails[level].width[level] = position - tail_positions[level]
+                tails[level] = node
+                tail_positions[level] = position
+
+        for level in range(MAX_LEVEL):
+            tails[level].width[level] = position + 1 - tail_positions[level]
+        skiplist._size = position
+        return skiplist
@@ -0,0 +1,25 @@
+# Third-party imports
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# INSERT constructs that support ON CONFLICT
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def check_upsert_support(dialect_name: str) -> None:
+    """ called at startup so an unsupported database fails there
+        instead of on the first upsert
+    """
+    if dialect_name not in DIALECT_INSERTS:
+        raise NotImplementedError(f'Upsert is not supported on {dialect_name}')
+
+
+def dialect_insert(db: AsyncSession, table):
+    """ dialect specific insert() for the session's database,
+        needed for on_conflict_do_update / on_conflict_do_nothing
+    """
+    return DIALECT_INSERTS[db.bind.dialect.name](table)
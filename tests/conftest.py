@@ -0,0 +1,46 @@
+# Standard library imports
+import asyncio
+import os
+import tempfile
+
+# settings are read when src.core.config is imported, so the test
+# database and required values are set before any src import
+_directory = tempfile.mkdtemp(prefix='quiz-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{_directory}/test.db'
+for name, value in {
+    'SECRET_KEY': 'test-secret', 'HOST': '127.0.0.1', 'PORT': '8000', 'DEBUG': 'false',
+    'OTP_EXPIRE': '300', 'SENDER_EMAIL': 'test@example.com', 'SENDER_PASSWORD': 'x',
+    'EMAIL_HOST': 'localhost', 'EMAIL_PORT': '25', 'SWEEPER_INTERVAL': '0', 'BCRYPT_ROUNDS': '4',
+}.items():
+    os.environ.setdefault(name, value)
+
+# Third-party imports
+import pytest
+
+# Local imports
+import src.main  # noqa: F401  registers every model on Base.metadata
+from src.core.database import Base, create_tables, engine
+
+
+def run(coroutine):
+    """ run a test coroutine on a fresh loop, pooled connections belong
+        to the loop so they are dropped afterwards
+    """
+    async def wrapper():
+        try:
+            return await coroutine
+        finally:
+            await engine.dispose()
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture
+def database():
+    """ empty tables for every test
+    """
+    async def reset():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await create_tables()
+    run(reset())
+    yield
@@ -0,0 +1,77 @@
+# Third-party imports
+from sqlalchemy import select
+
+# Local imports
+from src.core.database import SessionLocal
+from src.models.questions import Category
+from src.services.catalog_watcher import bump_catalog_version, catalog_watcher
+from src.services.question_ingest import insert_question_rows
+from src.services.question_sampler import question_sampler
+from src.services.question_snapshot import question_snapshot
+from src.utils.enums import DifficultyLevel
+from tests.conftest import run
+
+
+def question(category_id: int, text: str) -> dict:
+    return {
+        'category_id': category_id, 'question_text': text,
+        'difficulty_level': DifficultyLevel.EASY, 'correct_answer': 'A',
+        'option_a': 'a', 'option_b': 'b', 'option_c': 'c', 'option_d': 'd', 'is_active': True,
+    }
+
+
+async def write_elsewhere(texts) -> tuple:
+    """ insert questions the way another worker's API would: in the
+        database only, with the catalog version bumped
+    """
+    async with SessionLocal() as db:
+        category = await db.scalar(select(Category.id).filter(Category.name == 'general'))
+        if category is None:
+            category = Category(name='general', description='d')
+            db.add(category)
+            await db.flush()
+            category = category.id
+        rows = await insert_question_rows(db, [question(category, text) for text in texts])
+        version = await bump_catalog_version(db)
+        await db.commit()
+    return [row['id'] for row in rows], version
+
+
+def test_other_worker_write_is_picked_up(database):
+    async def scenario():
+        await question_sampler.build()
+        await question_snapshot.build()
+        await catalog_watcher.start()
+        try:
+            assert not await catalog_watcher.check()
+
+            ids, _ = await write_elsewhere(['Which river is longest?', 'Which peak is highest?'])
+            assert question_snapshot.current.position(ids[0]) is None
+
+            assert await catalog_watcher.check()
+            assert all(question_snapshot.current.position(i) is not None for i in ids)
+            assert set(ids) <= set(question_sampler.sample(10))
+            assert not await catalog_watcher.check()
+        finally:
+            await catalog_watcher.stop()
+
+    run(scenario())
+
+
+def test_own_write_is_not_reloaded(database):
+    async def scenario():
+        await catalog_watcher.start()
+        try:
+            _, version = await write_elsewhere(['Which lake is deepest?'])
+            catalog_watcher.applied(version)
+            assert not await catalog_watcher.check()
+
+            # a change from another worker in between still reloads
+            await write_elsewhere(['Which desert is largest?'])
+            _, version = await write_elsewhere(['Which ocean is widest?'])
+            catalog_watcher.applied(version)
+            assert await catalog_watcher.check()
+        finally:
+            await catalog_watcher.stop()
+
+    run(scenario())
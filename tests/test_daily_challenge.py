@@ -0,0 +1,43 @@
+# Third-party imports
+from fastapi.testclient import TestClient
+
+# Local imports
+from src.main import app
+from src.services.daily_challenge import daily_challenge
+from src.services.question_snapshot import question_snapshot
+from src.services.quiz_sessions import quiz_engine
+from src.utils.get_current_user import get_current_user
+from src.utils.session_cache import CurrentUser
+
+PREFIX = '/api/v1'
+
+
+def test_failed_start_does_not_use_up_the_day(database, monkeypatch):
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        1, 'user1@example.com', 'user1', True, True)
+    try:
+        with TestClient(app, raise_server_exceptions=False) as client:
+            client.post(f'{PREFIX}/question/categories', json={'name': 'general', 'description': 'd'})
+            client.post(f'{PREFIX}/question/categories/1/questions/bulk', json=[
+                {'question_text': f'Question {n}?', 'difficulty_level': 'easy', 'correct_answer': 'B',
+                 'option_a': '1', 'option_b': '2', 'option_c': '3', 'option_d': '4'}
+                for n in range(3)
+            ])
+            client.portal.call(question_snapshot.build)
+            # drop a set cached by an earlier test over other questions
+            daily_challenge._set = None
+            start = {'session_type': 'daily_challenge', 'question_count': 3}
+
+            async def failing_start(*args):
+                raise RuntimeError('start failed')
+
+            with monkeypatch.context() as patch:
+                patch.setattr(quiz_engine, 'start', failing_start)
+                assert client.post(f'{PREFIX}/quiz/sessions', json=start).status_code == 500
+            assert not client.portal.call(daily_challenge.has_started, 1)
+
+            assert client.post(f'{PREFIX}/quiz/sessions', json=start).status_code == 200
+            assert client.portal.call(daily_challenge.has_started, 1)
+            assert client.post(f'{PREFIX}/quiz/sessions', json=start).status_code == 409
+    finally:
+        app.dependency_overrides.clear()
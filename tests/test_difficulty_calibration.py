@@ -0,0 +1,79 @@
+# Standard library imports
+import random
+
+# Third-party imports
+import numpy as np
+from sqlalchemy import insert, select
+
+# Local imports
+from src.core.database import SessionLocal
+from src.models.analytics import QuestionHistory
+from src.models.questions import CatalogVersion, Category, Question
+from src.services.catalog_watcher import CATALOG
+from src.services.difficulty_calibration import calibrate, category_multipliers
+from src.utils.enums import DifficultyLevel
+from tests.conftest import run
+
+# correct share of the answers to each category's questions
+CATEGORY_RATES = {'easy': 0.9, 'mixed': 0.6, 'hard': 0.3}
+
+
+def test_multipliers_keep_the_weighted_mean():
+    category_ids = np.array([1, 1, 2, 3])
+    correct = np.array([90, 80, 50, 10])
+    answered = np.array([100, 100, 100, 50])
+    current = {1: 1.5, 2: 1.5, 3: 1.5}
+
+    values = category_multipliers(category_ids, correct, answered, current)
+    weights = {1: 200, 2: 100, 3: 50}
+    mean = sum(values[category] * weight for category, weight in weights.items()) / sum(weights.values())
+    assert abs(mean - 1.5) < 0.01
+    assert values[1] < values[2] < values[3]
+
+
+async def seed() -> None:
+    rng = random.Random(0)
+    async with SessionLocal() as db:
+        history = []
+        for name, rate in CATEGORY_RATES.items():
+            category = Category(name=name, description='d')
+            db.add(category)
+            await db.flush()
+            for number in range(4):
+                question = Question(
+                    category_id=category.id, question_text=f'{name} question {number}?',
+                    difficulty_level=DifficultyLevel.MEDIUM, correct_answer='A',
+                    option_a='a', option_b='b', option_c='c', option_d='d')
+                db.add(question)
+                await db.flush()
+                history += [
+                    {'user_id': user_id, 'session_id': 'seed', 'question_id': question.id,
+                     'answer': 'A', 'is_correct': rng.random() < rate}
+                    for user_id in range(1, 41)
+                ]
+        await db.execute(insert(QuestionHistory), history)
+        await db.commit()
+
+
+async def catalog_version() -> int:
+    async with SessionLocal() as db:
+        return await db.scalar(select(CatalogVersion.version).filter(CatalogVersion.name == CATALOG)) or 0
+
+
+def test_second_run_changes_nothing(database):
+    async def scenario():
+        await seed()
+        first = await calibrate(min_answers=10)
+        assert first['category_multipliers']
+        version = await catalog_version()
+
+        second = await calibrate(min_answers=10)
+        assert second['category_multipliers'] == {}
+        assert not any(second['levels_changed'].values())
+        assert await catalog_version() == version
+
+        async with SessionLocal() as db:
+            stored = (await db.scalars(select(Category.difficulty_multiplier))).all()
+        assert abs(sum(stored) / len(stored) - 1.0) < 0.01
+
+    run(scenario())
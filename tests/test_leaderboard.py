@@ -0,0 +1,70 @@
+# Standard library imports
+import uuid
+
+# Local imports
+from src.core.database import SessionLocal
+from src.models.questions import Category, Question
+from src.models.user_data import QuizSession
+from src.services.catalog_watcher import bump_catalog_version
+from src.services.leaderboard import LEADERBOARDS, leaderboard_watcher, leaderboards
+from src.services.question_snapshot import question_snapshot
+from src.services.quiz_sessions import quiz_engine
+from src.utils.enums import AnswerOption, DifficultyLevel, SessionStatus, SessionType
+from tests.conftest import run
+
+
+async def complete_elsewhere(user_id: int, score: float) -> None:
+    """ write a completed session the way another worker's flush would
+    """
+    async with SessionLocal() as db:
+        db.add(QuizSession(
+            id=str(uuid.uuid4()), user_id=user_id, session_type=SessionType.RANDOM,
+            status=SessionStatus.COMPLETED, question_ids=[], score=score))
+        await bump_catalog_version(db, LEADERBOARDS)
+        await db.commit()
+
+
+def test_other_worker_results_are_picked_up(database):
+    async def scenario():
+        await leaderboards.rebuild()
+        await leaderboard_watcher.start()
+        try:
+            await complete_elsewhere(7, 5.0)
+            assert leaderboards.board().rank(7) is None
+
+            assert await leaderboard_watcher.check()
+            assert leaderboards.board().rank(7) == (1, 5.0)
+        finally:
+            await leaderboard_watcher.stop()
+
+    run(scenario())
+
+
+def test_own_results_are_not_reloaded(database):
+    async def scenario():
+        async with SessionLocal() as db:
+            category = Category(name='general', description='d')
+            db.add(category)
+            await db.flush()
+            question = Question(
+                category_id=category.id, question_text='Which planet is largest?',
+                difficulty_level=DifficultyLevel.EASY, correct_answer='A',
+                option_a='Jupiter', option_b='Mars', option_c='Venus', option_d='Earth')
+            db.add(question)
+            await db.commit()
+
+        await question_snapshot.build()
+        await leaderboards.rebuild()
+        await leaderboard_watcher.start()
+        try:
+            async with SessionLocal() as db:
+                session = await quiz_engine.start(db, 8, SessionType.RANDOM, None, [question.id])
+            await quiz_engine.answer(session, question.id, AnswerOption.A)
+            assert session.status == SessionStatus.COMPLETED
+
+            assert not await leaderboard_watcher.check()
+            assert leaderboards.board().rank(8) == (1, 1.0)
+        finally:
+            await leaderboard_watcher.stop()
+
+    run(scenario())
@@ -0,0 +1,57 @@
+# Standard library imports
+from types import SimpleNamespace
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from src.services.grading import AnswerKey, answer_key
+from src.services.question_snapshot import QuestionBankSnapshot
+from src.utils.enums import DifficultyLevel
+
+
+MULTIPLIERS = {1: 1.0, 2: 2.0}
+
+
+def row(question_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=question_id, category_id=question_id % 2 + 1, question_text=f'q{question_id}',
+        difficulty_level=DifficultyLevel.EASY, correct_answer='ABCD'[question_id % 4],
+        option_a='yes', option_b='no', option_c=f'c{question_id}', option_d='d')
+
+
+def test_extended_shares_columns_and_keeps_older_snapshots():
+    base = QuestionBankSnapshot.from_rows([row(i) for i in range(1, 4)], MULTIPLIERS)
+    first = base.extended([row(4), row(5)])
+    second = first.extended([row(6)])
+
+    assert second.ids is base.ids
+    assert (len(base), len(first), len(second)) == (3, 5, 6)
+    assert base.position(4) is None and first.position(6) is None
+    assert second.get(6)['option_c'] == 'c6'
+    # options repeated by the appended rows reuse the existing strings
+    assert second.strings.count('yes') == 1
+
+    # extending an older snapshot again leaves the newer ones alone
+    branch = first.extended([row(7)])
+    assert branch.ids is not base.ids
+    assert branch.position(6) is None and branch.get(7)['option_c'] == 'c7'
+    assert second.get(6)['option_c'] == 'c6' and second.position(7) is None
+
+
+def test_answer_key_follows_appends():
+    snapshot = QuestionBankSnapshot.from_rows([row(i) for i in range(1, 4)], MULTIPLIERS)
+    key = answer_key(snapshot)
+    for question_id in range(4, 40):
+        snapshot = snapshot.extended([row(question_id)])
+        key = answer_key(snapshot)
+
+    full = AnswerKey(snapshot)
+    assert np.array_equal(key.ids, full.ids)
+    assert np.array_equal(key.answers, full.answers)
+    assert np.array_equal(key.multipliers, full.multipliers)
+
+    answers = np.array([question_id % 4 for question_id in range(1, 40)], dtype=np.uint8)
+    result = key.grade(np.arange(1, 40, dtype=np.int32), answers)
+    assert result['correct_count'] == 39
+    assert result['score'] == sum(MULTIPLIERS[question_id % 2 + 1] for question_id in range(1, 40))
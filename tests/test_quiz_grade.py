@@ -0,0 +1,54 @@
+# Third-party imports
+from fastapi.testclient import TestClient
+
+# Local imports
+from src.main import app
+from src.services.question_snapshot import question_snapshot
+from src.utils.get_current_user import get_current_user
+from src.utils.session_cache import CurrentUser
+
+PREFIX = '/api/v1'
+
+
+def as_user(user_id: int) -> None:
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        user_id, f'user{user_id}@example.com', f'user{user_id}', True, True)
+
+
+def test_grade_only_served_questions_once(database):
+    try:
+        with TestClient(app) as client:
+            as_user(1)
+            client.post(f'{PREFIX}/question/categories', json={'name': 'general', 'description': 'd'})
+            client.post(f'{PREFIX}/question/categories/1/questions/bulk', json=[
+                {'question_text': f'Question {n}?', 'difficulty_level': 'easy', 'correct_answer': 'B',
+                 'option_a': '1', 'option_b': '2', 'option_c': '3', 'option_d': '4'}
+                for n in range(6)
+            ])
+            # the new category reaches the snapshot with the debounced rebuild
+            client.portal.call(question_snapshot.build)
+
+            drawn = client.get(f'{PREFIX}/quiz/questions', params={'count': 3}).json()
+            served = [question['id'] for question in drawn['questions']]
+            unserved = next(n for n in range(1, 7) if n not in served)
+            answers = [{'question_id': n, 'answer': 'B'} for n in served + [unserved]]
+            batch = {'token': drawn['grading_token'], 'answers': answers}
+
+            as_user(2)
+            assert client.post(f'{PREFIX}/quiz/grade', json=batch).status_code == 403
+
+            as_user(1)
+            response = client.post(f'{PREFIX}/quiz/grade', params={'details': True}, json=batch)
+            assert response.status_code == 200
+            result = response.json()
+            assert (result['answered'], result['correct']) == (3, 3)
+            assert result['results'][-1] == {'question_id': unserved, 'correct': False, 'valid': False}
+
+            assert client.post(f'{PREFIX}/quiz/grade', json=batch).status_code == 409
+
+            detail = client.get(f'{PREFIX}/question/questions/{served[0]}').json()
+            listed = client.get(f'{PREFIX}/question/questions').json()['questions']
+            assert 'correct_answer' not in detail
+            assert all('correct_answer' not in question for question in listed)
+    finally:
+        app.dependency_overrides.clear()
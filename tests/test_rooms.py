@@ -0,0 +1,63 @@
+# Standard library imports
+import asyncio
+import json
+
+# Local imports
+from src.core.config import settings
+from src.services.rooms import Connection, Room, RoomManager
+from src.services.user_stats import user_stats
+from src.utils.enums import AnswerOption, RoomStatus, RoomType
+from tests.conftest import run
+
+
+class Socket:
+    """ answers every question with A as soon as it arrives
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.room = None
+        self.received = []
+
+    async def send_text(self, text: str) -> None:
+        message = json.loads(text)
+        self.received.append(message['type'])
+        if message['type'] == 'question':
+            self.room.answer(self.user_id, AnswerOption.A)
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+async def play(key: dict, monkeypatch) -> tuple:
+    monkeypatch.setattr(settings, 'ROOM_START_DELAY', 0)
+    monkeypatch.setattr(settings, 'ROOM_REVEAL_TIME', 0)
+    manager = RoomManager()
+    questions = [{'id': 1, 'question_text': 'q', 'option_a': 'a', 'option_b': 'b',
+                  'option_c': 'c', 'option_d': 'd'}]
+    room = manager.add(Room(RoomType.USER_CREATED, 1, None, questions, key, 2))
+    sockets = [Socket(user_id) for user_id in (1, 2)]
+    for socket in sockets:
+        socket.room = room
+        room.join(socket.user_id, f'user{socket.user_id}', Connection(socket.user_id, socket, 32))
+
+    manager.start(room, 1)
+    while manager.rooms:
+        await asyncio.sleep(0.01)
+    return room, sockets
+
+
+def test_statistics_failure_does_not_stop_the_game(monkeypatch):
+    async def failing_record(*args):
+        raise RuntimeError('statistics unavailable')
+
+    monkeypatch.setattr(user_stats, 'record', failing_record)
+    room, sockets = run(play({1: (0, 1.0, None)}, monkeypatch))
+    assert room.status == RoomStatus.FINISHED
+    assert all(player.correct == 1 for player in room.players.values())
+
+
+def test_failed_game_cancels_the_room(monkeypatch):
+    # a key entry that can't be unpacked makes scoring fail
+    room, sockets = run(play({1: None}, monkeypatch))
+    assert room.status == RoomStatus.CANCELLED
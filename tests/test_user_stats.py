@@ -0,0 +1,58 @@
+# Local imports
+from src.core.database import SessionLocal
+from src.models.questions import Category, Question
+from src.services.question_snapshot import question_snapshot
+from src.services.quiz_sessions import quiz_engine
+from src.services.user_stats import UserStatsService, user_stats
+from src.utils.enums import AnswerOption, DifficultyLevel, SessionStatus, SessionType
+from tests.conftest import run
+
+
+def test_flushed_users_are_evicted_and_reloaded(database):
+    async def scenario():
+        stats = UserStatsService(interval=60, max_users=1)
+        await stats.record(1, 5, True)
+        await stats.record(1, 5, False)
+        await stats.record(2, 5, True)
+        await stats.flush()
+
+        assert stats.stats()['users'] == 1
+        assert stats.stats()['counters'] == 2
+        reloaded = await stats.get(1)
+        assert (reloaded['answered'], reloaded['correct'], reloaded['current_streak']) == (2, 1, 0)
+        assert reloaded['categories'][5]['answered'] == 2
+
+        # evicted again after the next flush, the reload includes it
+        await stats.record(1, 5, True)
+        await stats.get(2)
+        await stats.flush()
+        assert (await stats.get(1))['current_streak'] == 1
+
+    run(scenario())
+
+
+def test_statistics_failure_does_not_fail_the_answer(database, monkeypatch):
+    async def failing_record(*args):
+        raise RuntimeError('statistics unavailable')
+
+    async def scenario():
+        async with SessionLocal() as db:
+            category = Category(name='general', description='d')
+            db.add(category)
+            await db.flush()
+            question = Question(
+                category_id=category.id, question_text='Which metal is liquid?',
+                difficulty_level=DifficultyLevel.EASY, correct_answer='A',
+                option_a='Mercury', option_b='Iron', option_c='Tin', option_d='Lead')
+            db.add(question)
+            await db.commit()
+        await question_snapshot.build()
+
+        async with SessionLocal() as db:
+            session = await quiz_engine.start(db, 3, SessionType.RANDOM, None, [question.id])
+        monkeypatch.setattr(user_stats, 'record', failing_record)
+        result = await quiz_engine.answer(session, question.id, AnswerOption.A)
+        assert result['correct']
+        assert session.status == SessionStatus.COMPLETED
+
+    run(scenario())